@@ -13,7 +13,12 @@ class ErrorMessages:
     IMPORT_FIRST = "No image loaded. Please import an image first."
     INVALID_BAND_NUMBER = "Invalid band number. Please check the entered values are within range."
     BAND_NUMBER_TYPE = "Band number must be an integer value."
+    INVALID_BAND_SELECTION = "Invalid band selection. Please check the band numbers are within range and the wavelength range contains at least one band."
+    INVALID_WINDOW = "Invalid window. Please check the row and column bounds are within the image and the stride is positive."
     
     # RGB simulation errors
     INVALID_RGB_VALUES = "Invalid RGB values. Please enter valid band numbers."
-    ENTER_ALL_RGB_VALUES = "Please specify values for all RGB bands."
\ No newline at end of file
+    ENTER_ALL_RGB_VALUES = "Please specify values for all RGB bands."
+    
+    # Background operations
+    OPERATION_CANCELLED = "Operation cancelled."
@@ -0,0 +1,14 @@
+from Exceptions.BaseException import BaseException
+
+class OperationCancelledException(BaseException): 
+    """
+    Exception which is raised when a background operation is cancelled before it completes
+    """
+
+    def __init__(self, message : str) : 
+        """
+        Natural constructor of OperationCancelledException class
+        Parameters : 
+            - message : a string of the error message 
+        """
+        super().__init__(message)
@@ -6,7 +6,14 @@ import os
 
 from Storage.FileManager import FileManager
 from LogicLayer.Factory.SimulatorFactory import SimulatorFactory
+from LogicLayer.Factory.Simulating.SimulationBuffer import SimulationBuffer
+from LogicLayer.Factory.Simulating.TileExecutor import TileExecutor
+from LogicLayer.Factory.Simulating.SimulatingMethod import SimulateMethod
+from LogicLayer.Factory.Simulating.SimulationPipeline import SimulationPipeline
+from LogicLayer.Factory.Simulating.ResultCache import ResultCache
+from LogicLayer.ImagePyramid import ImagePyramid
 from Exceptions.ErrorMessages import ErrorMessages
+from Exceptions.OperationCancelledException import OperationCancelledException
 from ResourceManager import ResourceManager
 
 class MainController:
@@ -38,6 +45,20 @@ class MainController:
         self._last_rgb_bands = None
         self._last_directory = ResourceManager.DEFAULT_IMAGE_DIRECTORY
         self._simulation_history = []  # Liste pour stocker l'historique
+        # Float32 output memory reused by every simulation, the simulated image lives in it
+        self._simulation_buffer = SimulationBuffer(np.float32)
+        self._executor = TileExecutor(ResourceManager.SIMULATION_WORKERS)
+        # Stages of the simulations of the loaded image and of its pyramid levels, with their cached band responses
+        self._pipeline = None
+        # RGB bands simulators kept between simulations, one per simulated image or pyramid level with its own
+        # buffer, only the channels whose band changed are computed again
+        self._band_choice_simulators = {}
+        # Finished simulations, so that running one again only looks it up
+        self._result_cache = ResultCache(ResourceManager.RESULT_CACHE_BYTES)
+        self._result_key = None
+        # Image the simulated image was computed on, the current image or a pyramid level for a preview
+        self._simulated_level = None
+        self._simulation_params = None
         
     def load_image(self):
         """
@@ -45,35 +66,68 @@ class MainController:
         Returns:
             bool: True if loading successful
         """
-        try:
-            image_path = QFileDialog.getOpenFileName(
-                None,
-                "Select Image File",
-                self._last_directory,
-                "Image Files (*.tif *.tiff)"
-            )[0]
-            
-            if image_path:
-                # Met à jour le dernier répertoire utilisé
-                self._last_directory = os.path.dirname(image_path)
-                
-                metadata_path = QFileDialog.getOpenFileName(
-                    None,
-                    "Select Metadata File",
-                    self._last_directory,
-                    "Text Files (*.txt)"
-                )[0]
-                
-                if metadata_path:
-                    self._image_ms = FileManager.Load(image_path, metadata_path)
-                    return True
-                else:
-                    raise ValueError(ErrorMessages.METADATA_REQUIRED)
-            else:
-                raise ValueError(ErrorMessages.IMAGE_REQUIRED)
-                    
-        except Exception as e:
-            raise e
+        image_path, metadata_path = self.select_image_files()
+        return self.load_image_files(image_path, metadata_path)
+
+    def select_image_files(self):
+        """
+        Opens file dialogs to select image and metadata files
+        Returns:
+            tuple: (image path, metadata path)
+        """
+        image_path = QFileDialog.getOpenFileName(
+            None,
+            "Select Image File",
+            self._last_directory,
+            "Image Files (*.tif *.tiff)"
+        )[0]
+        
+        if not image_path:
+            raise ValueError(ErrorMessages.IMAGE_REQUIRED)
+        # Met à jour le dernier répertoire utilisé
+        self._last_directory = os.path.dirname(image_path)
+        
+        metadata_path = QFileDialog.getOpenFileName(
+            None,
+            "Select Metadata File",
+            self._last_directory,
+            "Text Files (*.txt)"
+        )[0]
+        
+        if not metadata_path:
+            raise ValueError(ErrorMessages.METADATA_REQUIRED)
+        return image_path, metadata_path
+
+    def load_image_files(self, image_path, metadata_path, progress=None):
+        """
+        Loads an image, without any dialog so that it can run off the GUI thread
+        Args:
+            image_path: path of the image file
+            metadata_path: path of the metadata file
+            progress: callable receiving the number of loaded bands and the total number of bands,
+                      it may raise to cancel the load
+        Returns:
+            bool: True if loading successful
+        """
+        image_ms = FileManager.Load(
+            image_path,
+            metadata_path,
+            ResourceManager.DEFAULT_LOAD_MODE,
+            cache=ResourceManager.USE_CUBE_CACHE,
+            cache_dir=ResourceManager.CUBE_CACHE_DIRECTORY,
+            progress=progress
+        )
+        # The replaced image releases its file handles, its bands reopen the file if they are still displayed
+        if self._image_ms is not None:
+            self._image_ms.close()
+        self._image_ms = image_ms
+        self._simulated_image = None
+        self._simulation_buffer.release()
+        self._pipeline = None
+        self._band_choice_simulators.clear()
+        self._result_cache.clear()
+        self._result_key = None
+        return True
     
     def get_image_data(self):
         """
@@ -89,52 +143,34 @@ class MainController:
             'wavelength': f"{self._image_ms.get_start_wavelength():.2f}-{self._image_ms.get_end_wavelength():.2f} nm"
         }
     
-    def simulate(self, simulation_type, params=None):
+    def simulate(self, simulation_type, params=None, preview_size=None, record_history=True, progress=None):
         """
         Executes the selected simulation
+        Args:
+            simulation_type: the type of simulation
+            params: the bands of an RGB simulation or the type of color blindness
+            preview_size: (width, height) of the display area to simulate the pyramid level matching it,
+                          the full resolution simulation is then only computed on save. None to simulate
+                          the full resolution image
+            record_history: False for the refinements of a simulation already in the history
+            progress: callable receiving the number of projected blocks and their total number while the bands
+                      are projected, it may raise OperationCancelledException to stop the simulation
+        Raises:
+            OperationCancelledException: If progress cancelled the simulation, the simulated image is unchanged
         """
         if not self._image_ms:
             return False, ErrorMessages.IMPORT_FIRST
         
         try:
-            if simulation_type == ResourceManager.DALTONIAN:
-                print(f"Starting daltonism simulation with type: {params}")
-                
-                # For color blindness, we first need to simulate human vision
-                human_simulator = self._factory.create(ResourceManager.TRUE_COLOR, self._image_ms, ())
-                true_color_image = human_simulator.simulate()
-                
-                # On crée le simulateur de daltonisme
-                simulator = self._factory.create(simulation_type, self._image_ms, (), daltonian_type=params)
-                self._simulated_image = simulator.simulate()
-                
-                if self._simulated_image is None:
-                    return False, "Simulation failed to produce an image"
-                
-                print(f"Final simulated image shape: {self._simulated_image.shape}")  # Debug
-                
-                # Vérification que le filtre a bien été appliqué
-                if np.array_equal(self._simulated_image, true_color_image):
-                    return False, "Daltonism filter was not properly applied"
-                    
-                self._current_simulation = simulation_type
-                
-                # Add to history
-                from datetime import datetime
-                history_entry = {
-                    'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'image_name': self._image_ms.get_name(),
-                    'simulation_type': simulation_type,
-                    'parameters': params,
-                    'image': self._get_qimage_from_array(self._simulated_image)
-                }
-                self._simulation_history.append(history_entry)
-                
-                return True, None
-                
-            else:
-                simulator = self._factory.create(simulation_type, self._image_ms, params)
-                self._simulated_image = simulator.simulate()
+            image_ms = self._image_ms
+            if preview_size is not None:
+                image_ms = self._image_ms.get_pyramid().get_level_for_size(preview_size)
+            key, self._simulated_image = self._compute_simulation(image_ms, simulation_type, params, progress)
+            if self._simulated_image is None:
+                return False, "Simulation failed to produce an image"
+            self._result_key = key
+            self._simulated_level = image_ms
+            self._simulation_params = params
             
             self._current_simulation = simulation_type
             
@@ -143,19 +179,186 @@ class MainController:
                 self._last_rgb_bands = params
             
             # Add to history
-            from datetime import datetime
-            history_entry = {
-                'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'image_name': self._image_ms.get_name(),
-                'simulation_type': simulation_type,
-                'parameters': params,
-                'image': self._get_qimage_from_array(self._simulated_image)  # Convertir l'image pour l'historique
-            }
-            self._simulation_history.append(history_entry)
+            if record_history:
+                self._add_to_history(simulation_type, params, self._simulated_image)
+            
+            return True, None
+        except OperationCancelledException:
+            raise
+        except Exception as e:
+            return False, str(e)
+
+    def get_refinement_stages(self, size):
+        """
+        Get the stages of a progressive simulation displayed in an area: a coarse preview,
+        the preview matching the area, then the full resolution image
+        Args:
+            size: (width, height) of the display area
+        Returns:
+            list: the preview_size argument of simulate for each stage, from the coarsest, None for
+                  the full resolution. Stages simulating the same pyramid level are only listed once,
+                  and a stage of the full resolution level is always None
+        """
+        if not self._image_ms:
+            return []
+        divisor = ResourceManager.REFINEMENT_COARSE_DIVISOR
+        stages = []
+        levels = []
+        for stage in ((max(1, size[0] // divisor), max(1, size[1] // divisor)), size, None):
+            level = 0 if stage is None else ImagePyramid.get_level_index(self._image_ms.get_size(), stage)
+            if level not in levels:
+                levels.append(level)
+                stages.append(stage if level else None)
+        return stages
+
+    def simulate_many(self, simulations):
+        """
+        Executes several simulations of the current image with a single read of its bands
+        Args:
+            simulations: list of (simulation_type, params) tuples, as given to simulate
+        Returns:
+            tuple: (success, error message), the last simulation becomes the simulated image
+        """
+        if not self._image_ms:
+            return False, ErrorMessages.IMPORT_FIRST
+        
+        try:
+            # Every result is kept, so they do not share the output buffer
+            simulators = [self._create_simulator(simulation_type, params) for simulation_type, params in simulations]
+            
+            images = SimulateMethod.simulate_many(simulators)
+            for (simulation_type, params), image in zip(simulations, images):
+                if simulation_type == ResourceManager.RGB_BANDS:
+                    self._last_rgb_bands = params
+                self._add_to_history(simulation_type, params, image)
+                self._result_key = self._get_result_key(simulation_type, params)
+                self._result_cache.store(self._result_key, self._image_ms, image)
             
+            self._simulated_image = images[-1]
+            self._simulated_level = self._image_ms
+            self._simulation_params = simulations[-1][1]
+            self._current_simulation = simulations[-1][0]
             return True, None
         except Exception as e:
             return False, str(e)
+
+    def _compute_simulation(self, image_ms, simulation_type, params, progress=None):
+        """
+        Get a simulation of the current image or of one of its pyramid levels, from the result cache
+        or by running the simulator, progress receives the projected blocks of the bands
+        Returns:
+            tuple: (key in the result cache, read-only simulated image or None)
+        """
+        if image_ms is not self._image_ms and simulation_type == ResourceManager.RGB_BANDS:
+            # Bands of the same numbers in the level
+            params = tuple(image_ms.get_band_by_number(band.get_number()) for band in params)
+        key = self._get_result_key(simulation_type, params, image_ms)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return key, cached
+        
+        if simulation_type == ResourceManager.RGB_BANDS:
+            simulator = self._get_band_choice_simulator(params, image_ms)
+        else:
+            simulator = self._create_simulator(simulation_type, params, image_ms)
+            simulator.set_output_buffer(self._simulation_buffer)
+        if simulator.get_projection() is None:
+            image = simulator.simulate()
+        else:
+            # Only the final stages run when the band responses are already cached
+            image = self._get_pipeline().run(simulator, self._get_companions(simulation_type, image_ms), progress)
+        
+        if image is None:
+            return key, None
+        # The output buffer is overwritten by the next simulation, the cache keeps a copy
+        return key, self._result_cache.store(key, image_ms, image.copy())
+
+    def _create_simulator(self, simulation_type, params, image_ms=None):
+        """
+        Create a simulator of the current image, or of one of its pyramid levels,
+        running on the executor of the controller
+        """
+        image_ms = image_ms if image_ms is not None else self._image_ms
+        if simulation_type == ResourceManager.DALTONIAN:
+            simulator = self._factory.create(simulation_type, image_ms, (), daltonian_type=params,
+                                             transform_mode=ResourceManager.DALTONIAN_TRANSFORM_MODE)
+        else:
+            simulator = self._factory.create(simulation_type, image_ms, params)
+        simulator.set_executor(self._executor)
+        return simulator
+
+    def _get_band_choice_simulator(self, params, image_ms):
+        """
+        Get the incremental RGB bands simulator of the current image or of one of its pyramid levels,
+        merging the given bands. The refinement stages of a simulation each keep their simulator
+        """
+        # The simulator keeps its image alive, so the identity of the image is not reused while it is stored
+        simulator = self._band_choice_simulators.get(id(image_ms))
+        if simulator is None:
+            simulator = self._create_simulator(ResourceManager.RGB_BANDS, params, image_ms)
+            # Its own buffer, so the previous channels are not overwritten by other simulations
+            simulator.set_output_buffer(SimulationBuffer(np.float32))
+            simulator.set_incremental(True)
+            self._band_choice_simulators[id(image_ms)] = simulator
+        else:
+            simulator.set_bands(params)
+        return simulator
+
+    def _get_result_key(self, simulation_type, params, image_ms=None):
+        """
+        Get the key of a simulation of the current image, or of one of its pyramid levels,
+        in the result cache, the bands of an RGB simulation are identified by their numbers
+        """
+        if simulation_type == ResourceManager.RGB_BANDS:
+            params = tuple(band.get_number() for band in params)
+        elif isinstance(params, list):
+            params = tuple(params)
+        return ResultCache.make_key(image_ms if image_ms is not None else self._image_ms, simulation_type, params)
+
+    def get_cache_statistics(self):
+        """
+        Get the hits, misses, entries and bytes of the result cache
+        """
+        return self._result_cache.get_statistics()
+
+    def _get_pipeline(self):
+        """
+        Get the simulation pipeline of the current image, which also runs the simulations of its pyramid levels,
+        so that the responses of every level share the memory budget of the pipeline
+        """
+        if self._pipeline is None or self._pipeline.get_image() is not self._image_ms:
+            self._pipeline = SimulationPipeline(self._image_ms)
+        return self._pipeline
+
+    def _get_companions(self, simulation_type, image_ms=None):
+        """
+        Get the simulators whose band responses are computed with those of a simulation,
+        so that switching between human vision and the types of color blindness only runs the final stages
+        """
+        if not ResourceManager.PREFETCH_COLOR_BLINDNESS or \
+                simulation_type not in (ResourceManager.TRUE_COLOR, ResourceManager.DALTONIAN):
+            return ()
+        companions = [self._create_simulator(ResourceManager.TRUE_COLOR, (), image_ms)]
+        for daltonian_type in ResourceManager.DALTONIAN_TYPES:
+            companions.append(self._create_simulator(ResourceManager.DALTONIAN, daltonian_type, image_ms))
+        # Companions project in the type of the simulation
+        for companion in companions:
+            companion.set_output_buffer(self._simulation_buffer)
+        return tuple(companions)
+
+    def _add_to_history(self, simulation_type, params, image_array):
+        """
+        Add a simulated image to the simulation history
+        """
+        from datetime import datetime
+        history_entry = {
+            'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'image_name': self._image_ms.get_name(),
+            'simulation_type': simulation_type,
+            'parameters': params,
+            'image': self._get_qimage_from_array(image_array)  # Convertir l'image pour l'historique
+        }
+        self._simulation_history.append(history_entry)
     
     def _convert_to_uint8(self, image_array):
         """
@@ -172,11 +375,22 @@ class MainController:
 
     def save_simulation(self):
         """
-        Saves the current simulation result
+        Saves the current simulation result, after asking where on the calling thread
+        """
+        save_path = self.select_save_path()
+        if not save_path:
+            return False, "Save cancelled"
+        return self.save_simulation_to(save_path)
+
+    def select_save_path(self):
+        """
+        Opens a file dialog to select where the current simulation is saved
+        Returns:
+            str: the selected path, None if there is no simulation or the dialog was cancelled
         """
         # Check if simulated image exists using numpy's size check
         if self._simulated_image is None or self._simulated_image.size == 0:
-            return False, "No simulation to save"
+            return None
         
         # Create default filename based on original image name and simulation type
         original_name = self._image_ms.get_name().split('.')[0]  # Remove extension
@@ -200,28 +414,61 @@ class MainController:
             default_filename,
             "PNG Files (*.png);;JPEG Files (*.jpg);;TIFF Files (*.tif)"
         )[0]
-        
-        if save_path:
-            try:
-                # Convert to uint8
-                save_data = self._convert_to_uint8(self._simulated_image)
-                
-                # Convert numpy array to PIL Image
-                from PIL import Image
-                if len(save_data.shape) == 3:  # RGB image
-                    image = Image.fromarray(save_data, 'RGB')
-                else:  # Grayscale image
-                    image = Image.fromarray(save_data, 'L')
-                
-                # Save the image
-                image.save(save_path)
-                return True, None
-                
-            except Exception as e:
-                return False, str(e)
-                
-        return False, "Save cancelled"
+        return save_path or None
+
+    def save_simulation_to(self, save_path, progress=None):
+        """
+        Saves the current simulation result, without any dialog so that it can run off the GUI thread
+        Args:
+            save_path: path of the saved image, its extension gives the format
+            progress: callable receiving the number of projected blocks and their total number while a preview
+                      is simulated again at full resolution, it may raise OperationCancelledException
+        Returns:
+            tuple: (success, error message)
+        Raises:
+            OperationCancelledException: If progress cancelled the save, no file is written
+        """
+        if self._simulated_image is None or self._simulated_image.size == 0:
+            return False, "No simulation to save"
+        try:
+            # A preview is simulated again on the full resolution image, as without preview
+            full_image = self._get_full_resolution_image(progress)
+            if full_image is None:
+                return False, "Simulation failed to produce an image"
+            
+            # Convert to uint8
+            save_data = self._convert_to_uint8(full_image)
+            
+            # Convert numpy array to PIL Image
+            from PIL import Image
+            if len(save_data.shape) == 3:  # RGB image
+                image = Image.fromarray(save_data, 'RGB')
+            else:  # Grayscale image
+                image = Image.fromarray(save_data, 'L')
+            
+            # Save the image
+            image.save(save_path)
+            return True, None
+        except OperationCancelledException:
+            raise
+        except Exception as e:
+            return False, str(e)
     
+    def _get_full_resolution_image(self, progress=None):
+        """
+        Get the current simulation at the full resolution of the image, simulating it when
+        the simulated image is a preview computed on a pyramid level
+        """
+        if self._simulated_level is None or self._simulated_level is self._image_ms:
+            return self._simulated_image
+        _, image = self._compute_simulation(self._image_ms, self._current_simulation, self._simulation_params,
+                                            progress)
+        return image
+
+    def has_simulation(self):
+        """Check if a simulated image can be saved"""
+        return self._simulated_image is not None
+
     def has_image(self):
         """Check if an image is loaded"""
         return self._image_ms is not None
@@ -265,17 +512,25 @@ class MainController:
         if self._image_ms:
             self._image_ms.previous_band()
             
-    def get_current_band_pixmap(self):
-        """Get the current band as a QPixmap"""
+    def get_current_band_pixmap(self, size=ResourceManager.DEFAULT_IMAGE_SIZE):
+        """
+        Get the current band as a QPixmap fitting in a (width, height) display area,
+        read from the level of the image pyramid matching the area
+        """
         if self._image_ms:
             # Get band data and normalize it to 0-255 range
-            band_data = self._image_ms.get_actualband().get_shade_of_grey()
+            level = self._image_ms.get_pyramid().get_level_for_size(size)
+            band = level.get_band_by_number(self._image_ms.get_actualband().get_number())
+            band_data = band.get_shade_of_grey()
             
             # Make sure the data is in the correct format
-            if band_data.dtype != np.uint8:
-                # Normalize to 0-255 range
-                band_data = ((band_data - np.min(band_data)) / 
-                            (np.max(band_data) - np.min(band_data)) * 255).astype(np.uint8)
+            if band_data.dtype != np.uint8 or ResourceManager.DISPLAY_CLIP_PERCENT > 0:
+                # Normalize to 0-255 range, with the extrema or percentiles of the statistics index of the band
+                statistics = level.get_band_statistics(band)
+                low = statistics.get_percentile(ResourceManager.DISPLAY_CLIP_PERCENT)
+                high = statistics.get_percentile(100 - ResourceManager.DISPLAY_CLIP_PERCENT)
+                band_data = (np.clip((band_data - low) / max(high - low, np.finfo(np.float64).tiny), 0, 1)
+                             * 255).astype(np.uint8)
             
             height, width = band_data.shape
             
@@ -289,20 +544,32 @@ class MainController:
             
             # Convert to QPixmap and scale to fit
             pixmap = QPixmap.fromImage(image)
-            return pixmap.scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio, 
+            return pixmap.scaled(size[0], size[1], Qt.AspectRatioMode.KeepAspectRatio, 
                                Qt.TransformationMode.SmoothTransformation)
             
         return None 
     
-    def get_simulated_image_pixmap(self):
-        """Get the simulated image as a QPixmap"""
+    def get_simulated_image_pixmap(self, size=ResourceManager.DEFAULT_IMAGE_SIZE):
+        """
+        Get the simulated image as a QPixmap fitting in a (width, height) display area,
+        averaged down to the pyramid level matching the area before being converted
+        """
         if self._simulated_image is not None:
+            view_name = f"pixmap_{size[0]}x{size[1]}"
+            pixmap = self._result_cache.get_view(self._result_key, view_name)
+            if pixmap is not None:
+                return pixmap
+            
+            height, width, _ = self._simulated_image.shape
+            level = ImagePyramid.get_level_index((width, height), size)
+            display_image = ImagePyramid.area_average(self._simulated_image, ImagePyramid.get_factor(level))
+            
             # Convert numpy array to QImage
-            height, width, channels = self._simulated_image.shape
+            height, width, channels = display_image.shape
             bytes_per_line = channels * width
             
             # Convert to uint8
-            image_data = self._convert_to_uint8(self._simulated_image)
+            image_data = self._convert_to_uint8(display_image)
             
             # Ensure data is contiguous
             image_data = np.ascontiguousarray(image_data)
@@ -313,8 +580,12 @@ class MainController:
             
             # Convert to QPixmap and scale
             pixmap = QPixmap.fromImage(image)
-            return pixmap.scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio,
-                               Qt.TransformationMode.SmoothTransformation)
+            pixmap = pixmap.scaled(size[0], size[1], Qt.AspectRatioMode.KeepAspectRatio,
+                                   Qt.TransformationMode.SmoothTransformation)
+            # Kept with the cached result, showing the simulation again does not convert it
+            self._result_cache.store_view(self._result_key, view_name, pixmap,
+                                          pixmap.width() * pixmap.height() * 4)
+            return pixmap
         return None 
     
     def get_bands_for_rgb(self, band_numbers):
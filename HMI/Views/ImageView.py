@@ -1,11 +1,14 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QSpinBox
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap
 
 class ImageView(QWidget):
     """
     Widget pour l'affichage des images originales et simulées
     """
+    # The save button only asks the main window to save, it runs the save off the event loop
+    save_requested = pyqtSignal()
+    
     def __init__(self, controller):
         super().__init__()
         self.controller = controller
@@ -119,7 +122,7 @@ class ImageView(QWidget):
         # Save button
         self.save_button = QPushButton("Save Simulation")
         self.save_button.setEnabled(False)
-        self.save_button.clicked.connect(self._save_simulation)
+        self.save_button.clicked.connect(self.save_requested.emit)
         self.save_button.setStyleSheet("""
             QPushButton {
                 padding: 8px;
@@ -145,12 +148,11 @@ class ImageView(QWidget):
         
     def _previous_band(self):
         self.controller.previous_band()
-        self.controller.get_current_band_pixmap()
+        # The band is displayed by _on_band_selected when the spinbox value changes
         self._update_band_info()
         
     def _next_band(self):
         self.controller.next_band()
-        self.controller.get_current_band_pixmap()
         self._update_band_info()
         
     def _update_band_info(self):
@@ -159,19 +161,14 @@ class ImageView(QWidget):
         total = self.controller.get_total_bands()
         self.band_spinbox.setValue(current)  # Met à jour la valeur du spinbox
         
-    def _save_simulation(self):
-        """Save the current simulation using the controller"""
-        success, error = self.controller.save_simulation()
-        if not success and error:
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.warning(self, "Save Error", error)
-        
     def _on_band_selected(self, value):
         """Handle direct band selection"""
         if self.controller.has_image():
             if self.controller.set_current_band(value):
                 # Mettre à jour l'affichage
-                pixmap = self.controller.get_current_band_pixmap()
+                # Read from the pyramid level matching the size of the label
+                pixmap = self.controller.get_current_band_pixmap(
+                    (self.original_image.width(), self.original_image.height()))
                 if pixmap:
                     self.original_image.setPixmap(pixmap)
 
@@ -1,14 +1,15 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QLabel, QPushButton, QComboBox, QSpinBox, QMenuBar,
                             QMenu, QMessageBox, QDialog, QTableWidget, QTableWidgetItem,
-                            QFrame, QHeaderView, QScrollArea, QGridLayout)
-from PyQt6.QtCore import Qt, QSize
+                            QFrame, QHeaderView, QScrollArea, QGridLayout, QProgressBar)
+from PyQt6.QtCore import Qt, QSize, QThreadPool
 from PyQt6.QtGui import QImage, QPixmap, QAction, QIcon
 
 from HMI.Views.ImageView import ImageView
 from HMI.Views.SimulationPanel import SimulationPanel
 from HMI.Views.DataPanel import DataPanel
 from HMI.Controllers.MainController import MainController
+from HMI.Workers.Worker import Worker
 from ResourceManager import ResourceManager
 
 class MainWindow(QMainWindow):
@@ -22,9 +23,16 @@ class MainWindow(QMainWindow):
         # Initialisation du contrôleur principal
         self.controller = MainController()
         
+        # Loads and simulations run one at a time off the event loop, in submission order
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self._workers = []
+        self._blocking_workers = []
+        
         # Configuration de l'interface
         self._setup_menu()
         self._setup_ui()
+        self._setup_status_bar()
         
         # Load and apply styles
         with open("HMI/Resources/styles.qss", "r") as f:
@@ -38,10 +46,10 @@ class MainWindow(QMainWindow):
         file_menu = menubar.addMenu("File")
         
         # Import action
-        import_action = QAction("Import Image", self)
-        import_action.setShortcut("Ctrl+O")
-        import_action.triggered.connect(self._import_image)
-        file_menu.addAction(import_action)
+        self.import_action = QAction("Import Image", self)
+        self.import_action.setShortcut("Ctrl+O")
+        self.import_action.triggered.connect(self._import_image)
+        file_menu.addAction(self.import_action)
         
         # Save action
         self.save_action = QAction("Save Simulation", self)
@@ -66,24 +74,116 @@ class MainWindow(QMainWindow):
         authors_action.triggered.connect(self._show_about)
         about_menu.addAction(authors_action)
         
+    def _setup_status_bar(self):
+        """Setup the progress of the background operations in the status bar"""
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedWidth(200)
+        self.progress_bar.setVisible(False)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self.cancel_workers)
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        self.statusBar().addPermanentWidget(self.cancel_button)
+        
+    def start_worker(self, worker, message, blocking=True):
+        """
+        Run a worker off the event loop, showing its progress and disabling the actions
+        starting other operations until every pending blocking worker is done
+        Args:
+            worker: the Worker to run
+            message: description of the operation shown in the status bar
+            blocking: False for a worker which does not disable the actions, e.g. a refinement
+        """
+        self._workers.append(worker)
+        if blocking:
+            self._blocking_workers.append(worker)
+        worker.signals.progress.connect(self._on_worker_progress)
+        for signal in (worker.signals.finished, worker.signals.error, worker.signals.cancelled):
+            signal.connect(lambda *_, worker=worker: self._on_worker_done(worker))
+        self.statusBar().showMessage(message)
+        # Busy indicator until the first progress report
+        self.progress_bar.setRange(0, 0)
+        self._set_busy(bool(self._blocking_workers))
+        self.thread_pool.start(worker)
+        
+    def cancel_workers(self):
+        """Ask every pending worker to stop"""
+        for worker in self._workers:
+            worker.cancel()
+        
+    def _on_worker_progress(self, done, total):
+        """Show the progress of the running worker"""
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        
+    def _on_worker_done(self, worker):
+        """Forget a finished worker, the actions are enabled again once no worker is pending"""
+        if worker in self._workers:
+            self._workers.remove(worker)
+        if worker in self._blocking_workers:
+            self._blocking_workers.remove(worker)
+        if not self._workers:
+            self.statusBar().clearMessage()
+        self._set_busy(bool(self._blocking_workers))
+        
+    def _set_busy(self, busy):
+        """Disable the actions starting an operation while blocking workers are pending"""
+        self.progress_bar.setVisible(bool(self._workers))
+        self.cancel_button.setVisible(bool(self._workers))
+        self.import_action.setEnabled(not busy)
+        self.simulation_panel.simulate_button.setEnabled(not busy)
+        # Saving simulates the full resolution image, it waits for every pending operation
+        can_save = not self._workers and self.controller.has_simulation()
+        self.save_action.setEnabled(can_save)
+        self.image_view.save_button.setEnabled(can_save)
+        
+    def closeEvent(self, event):
+        """Stop the background operations before the window is destroyed"""
+        self.simulation_panel.cancel_refinement()
+        self.cancel_workers()
+        self.thread_pool.waitForDone()
+        super().closeEvent(event)
+        
     def _import_image(self):
-        """Handle image import"""
+        """Handle image import, the image is loaded off the event loop"""
         try:
-            if self.controller.load_image():
-                self._update_image_data()
-                self._update_image_display()
-                # Enable navigation buttons
-                self.image_view.prev_button.setEnabled(True)
-                self.image_view.next_button.setEnabled(True)
-                # Update band spinbox limits
-                total_bands = self.controller.get_total_bands()
-                self.image_view.update_band_limits(total_bands)
+            image_path, metadata_path = self.controller.select_image_files()
         except Exception as e:
             QMessageBox.warning(self, "Import Error", str(e))
+            return
+        
+        # Refinements of the previous image are not displayed anymore
+        self.simulation_panel.cancel_refinement()
+        worker = Worker(lambda progress: self.controller.load_image_files(image_path, metadata_path, progress))
+        worker.signals.finished.connect(self._on_image_loaded)
+        worker.signals.error.connect(lambda message: QMessageBox.warning(self, "Import Error", message))
+        self.start_worker(worker, "Loading bands...")
+        
+    def _on_image_loaded(self, _):
+        """Display a loaded image"""
+        self._update_image_data()
+        self._update_image_display()
+        # Enable navigation buttons
+        self.image_view.prev_button.setEnabled(True)
+        self.image_view.next_button.setEnabled(True)
+        # Update band spinbox limits
+        total_bands = self.controller.get_total_bands()
+        self.image_view.update_band_limits(total_bands)
             
     def _save_simulation(self):
-        """Handle simulation save"""
-        success, error = self.controller.save_simulation()
+        """Handle simulation save, a preview is simulated again at full resolution off the event loop"""
+        save_path = self.controller.select_save_path()
+        if not save_path:
+            return
+        
+        worker = Worker(lambda progress: self.controller.save_simulation_to(save_path, progress))
+        worker.signals.finished.connect(self._on_simulation_saved)
+        worker.signals.error.connect(lambda message: QMessageBox.warning(self, "Save Error", message))
+        self.start_worker(worker, "Saving simulation...")
+        
+    def _on_simulation_saved(self, result):
+        """Report a failed save"""
+        success, error = result
         if not success:
             QMessageBox.warning(self, "Save Error", error)
             
@@ -99,7 +199,8 @@ class MainWindow(QMainWindow):
     def _update_image_display(self):
         """Update the image display"""
         if self.controller.has_image():
-            pixmap = self.controller.get_current_band_pixmap()
+            original_image = self.image_view.original_image
+            pixmap = self.controller.get_current_band_pixmap((original_image.width(), original_image.height()))
             if pixmap:
                 self.image_view.original_image.setPixmap(pixmap)
                 # Update band information
@@ -137,6 +238,7 @@ class MainWindow(QMainWindow):
         
         # Panneau central (visualisation des images)
         self.image_view = ImageView(self.controller)
+        self.image_view.save_requested.connect(self._save_simulation)
         
         # Ajout des panneaux au layout supérieur
         top_layout.addWidget(left_panel, 1)     # Ratio 1
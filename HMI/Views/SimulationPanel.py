@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
                             QComboBox, QSpinBox, QGridLayout, QMessageBox, QHBoxLayout)
 from PyQt6.QtCore import Qt
 from ResourceManager import ResourceManager
+from HMI.Workers.Worker import Worker
 
 class SimulationPanel(QWidget):
     """
@@ -11,6 +12,9 @@ class SimulationPanel(QWidget):
         super().__init__()
         self.controller = controller
         self.main_window = main_window
+        # Incremented by every simulation, pending refinements of an older one are dropped
+        self._generation = 0
+        self._worker = None
         self._setup_ui()
         
     def _setup_ui(self):
@@ -182,21 +186,58 @@ class SimulationPanel(QWidget):
         elif simulation_type == ResourceManager.DALTONIAN:
             params = self.daltonian_type.currentText()
             
-        success, error = self.controller.simulate(simulation_type, params)
-        
-        if success:
-            # Enable save action in main window
-            self.main_window.save_action.setEnabled(True)
-            self.main_window.image_view.save_button.setEnabled(True)
-            # Update simulated image display
-            self._update_simulated_image()
-            # Update history
-            self.main_window._update_history()
+        # Preview on the pyramid level matching the label, the full resolution is simulated on save
+        simulated_image = self.main_window.image_view.simulated_image
+        size = (simulated_image.width(), simulated_image.height())
+        if ResourceManager.PROGRESSIVE_REFINEMENT:
+            # Coarse preview first, the next stages are computed once it is displayed
+            stages = self.controller.get_refinement_stages(size)
         else:
+            stages = [size if ResourceManager.PREVIEW_SIMULATION else None]
+        self.cancel_refinement()
+        self._run_stage(self._generation, simulation_type, params, stages, 0)
+        
+    def cancel_refinement(self):
+        """Drop the pending stages of the displayed simulation"""
+        self._generation += 1
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        
+    def _run_stage(self, generation, simulation_type, params, stages, index):
+        """Compute a stage of a simulation off the event loop, the first one is added to the history"""
+        def operation(progress):
+            # The projection of the bands reports its blocks, a cancelled stage stops at the next one
+            return self.controller.simulate(simulation_type, params, stages[index], record_history=index == 0,
+                                            progress=progress)
+        
+        self._worker = Worker(operation)
+        self._worker.signals.finished.connect(
+            lambda result: self._on_stage_finished(generation, simulation_type, params, stages, index, result))
+        # Refinements do not block the simulate button, a new simulation cancels them
+        self.main_window.start_worker(self._worker, f"Simulating {simulation_type}...", blocking=index == 0)
+        
+    def _on_stage_finished(self, generation, simulation_type, params, stages, index, result):
+        """Display a computed stage and start the next one, unless a newer simulation replaced it"""
+        if generation != self._generation:
+            return
+        self._worker = None
+        success, error = result
+        if not success:
             QMessageBox.warning(self, "Simulation Error", error)
+            return
+        
+        # Update simulated image display, the save action is enabled once no stage is pending
+        self._update_simulated_image()
+        if index == 0:
+            # Update history
+            self.main_window._update_history()
+        if index + 1 < len(stages):
+            self._run_stage(generation, simulation_type, params, stages, index + 1)
         
     def _update_simulated_image(self):
         """Update the simulated image display"""
-        pixmap = self.controller.get_simulated_image_pixmap()
+        simulated_image = self.main_window.image_view.simulated_image
+        pixmap = self.controller.get_simulated_image_pixmap((simulated_image.width(), simulated_image.height()))
         if pixmap:
             self.main_window.image_view.simulated_image.setPixmap(pixmap) 
\ No newline at end of file
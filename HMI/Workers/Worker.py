@@ -0,0 +1,73 @@
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from Exceptions.ErrorMessages import ErrorMessages
+from Exceptions.OperationCancelledException import OperationCancelledException
+
+class WorkerSignals(QObject):
+    """
+    Signals of a worker, delivered to the GUI thread by the event loop
+    """
+    progress = pyqtSignal(int, int)  # Number of steps done, total number of steps
+    finished = pyqtSignal(object)  # Result of the operation
+    error = pyqtSignal(str)  # Message of the exception raised by the operation
+    cancelled = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """
+    Operation run by a QThreadPool, off the event loop.
+
+    The operation receives the progress callback of the worker. Cancellation is cooperative:
+    once cancel() is called, the next progress report raises OperationCancelledException,
+    and the result of an operation completing anyway is reported as cancelled.
+    """
+    def __init__(self, operation):
+        """
+        Constructor of the worker
+        Args:
+            operation: callable taking the progress callback, progress(done, total), and returning the result
+        """
+        super().__init__()
+        self.signals = WorkerSignals()
+        self.__operation = operation
+        self.__cancelled = threading.Event()
+
+    def cancel(self):
+        """Ask the operation to stop at its next progress report"""
+        self.__cancelled.set()
+
+    def is_cancelled(self):
+        """Check if the worker was cancelled"""
+        return self.__cancelled.is_set()
+
+    def report_progress(self, done, total):
+        """
+        Progress callback given to the operation, callable from any thread
+        Raises:
+            OperationCancelledException: If the worker was cancelled
+        """
+        if self.is_cancelled():
+            raise OperationCancelledException(ErrorMessages.OPERATION_CANCELLED)
+        self.signals.progress.emit(done, total)
+
+    def run(self):
+        """Run the operation and emit finished, error or cancelled"""
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+            return
+        try:
+            result = self.__operation(self.report_progress)
+        except OperationCancelledException:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.error.emit(str(e))
+        else:
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
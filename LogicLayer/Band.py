@@ -7,12 +7,14 @@ class Band:
     Author : Lakhdar Gibril
     """
 
-    def __init__(self, number : int, shade_of_grey : np.ndarray, wave_length : tuple) : 
+    def __init__(self, number : int, shade_of_grey : np.ndarray, wave_length : tuple, scale : float = 1.0) : 
         """
         Natural constructor of the class Band
         args: 
-            - shade_of_length: an integer which represents the shade of grey, value between 0 and 255
+            - shade_of_length: an integer which represents the shade of grey, value between 0 and 255.
+              None for a band whose pixels are provided on demand by a subclass
             - wave_length: represents the wave_length of the band as a tuple of int
+            - scale: factor converting the stored values to shades of grey between 0 and 255
         
         Author : Lakhdar Gibril
         """
@@ -21,7 +23,7 @@ class Band:
             raise ValueError("Band number must be positive")
             
         # Validate shade_of_grey
-        if shade_of_grey.size == 0:
+        if shade_of_grey is not None and shade_of_grey.size == 0:
             raise ValueError("Shade of grey array cannot be empty")
             
         # Validate wavelength
@@ -33,18 +35,39 @@ class Band:
             raise ValueError("Min wavelength cannot be greater than max wavelength")
 
         self.__number = number
-        # Create a copy of the array to ensure immutability
-        self.__shade_of_grey = shade_of_grey.copy()
+        # Keep a read-only view of the array to ensure immutability without copying the pixels
+        self.__shade_of_grey = None
+        if shade_of_grey is not None:
+            self.__shade_of_grey = shade_of_grey.view()
+            self.__shade_of_grey.flags.writeable = False
         self.__wave_length = wave_length
+        self.__scale = scale
 
     def get_shade_of_grey (self) -> np.ndarray :
         """
         Getter which allow getting the value of the shade of grey 
-        @return : the shade of grey as an integer
+        @return : the shade of grey as a read-only array
 
         Author : Lakhdar Gibril
         """ 
-        return self.__shade_of_grey.copy()
+        shade_of_grey = self.get_raw_shade_of_grey()
+        if self.__scale == 1:
+            return shade_of_grey
+        return shade_of_grey * self.__scale
+
+    def get_raw_shade_of_grey(self) -> np.ndarray :
+        """
+        Getter which allow getting the values of the band as stored, before the scale is applied
+        @return : the stored values as a read-only array
+        """
+        return self.__shade_of_grey
+
+    def get_scale(self) -> float :
+        """
+        Getter which allows getting the factor converting the stored values to shades of grey
+        @return: the scale as a float
+        """
+        return self.__scale
 
 
     def get_wavelength (self) -> tuple : 
@@ -0,0 +1,76 @@
+import numpy as np
+
+class BandStatistics:
+    """
+    Class BandStatistics which represents the statistics of the shades of grey of a band,
+    computed once so that display stretching and normalizations do not scan the pixels again
+    """
+    BINS : int = 256 # Number of bins of the histogram, between the minimum and the maximum
+
+    def __init__(self, shade_of_grey : np.ndarray) :
+        """
+        Natural constructor of the class BandStatistics, scanning the pixels of the band
+        args:
+            - shade_of_grey: the shades of grey of the band
+        """
+        values = np.asarray(shade_of_grey)
+        self.__min = float(values.min())
+        self.__max = float(values.max())
+        self.__mean = float(values.mean(dtype=np.float64))
+        self.__std = float(values.std(dtype=np.float64))
+        self.__histogram, self.__bin_edges = np.histogram(values, bins=BandStatistics.BINS,
+                                                          range=(self.__min, self.__max))
+
+    def get_min(self) -> float :
+        """
+        Getter which allow getting the minimum of the band
+        @return : the minimum as a float
+        """
+        return self.__min
+
+    def get_max(self) -> float :
+        """
+        Getter which allow getting the maximum of the band
+        @return : the maximum as a float
+        """
+        return self.__max
+
+    def get_mean(self) -> float :
+        """
+        Getter which allow getting the mean of the band
+        @return : the mean as a float
+        """
+        return self.__mean
+
+    def get_std(self) -> float :
+        """
+        Getter which allow getting the standard deviation of the band
+        @return : the standard deviation as a float
+        """
+        return self.__std
+
+    def get_histogram(self) -> tuple :
+        """
+        Getter which allow getting the histogram of the band
+        @return : the counts of the BINS bins and the BINS + 1 edges of the bins, as arrays
+        """
+        return self.__histogram, self.__bin_edges
+
+    def get_percentile(self, percent : float) -> float :
+        """
+        Method which allow estimating a percentile of the band from its histogram,
+        interpolating linearly inside the bin which contains it
+        args:
+            - percent: the percentile, between 0 and 100
+        @return : the value under which percent % of the pixels are
+        """
+        if percent <= 0:
+            return self.__min
+        if percent >= 100:
+            return self.__max
+        cumulative = np.cumsum(self.__histogram)
+        rank = percent / 100 * cumulative[-1]
+        index = int(np.searchsorted(cumulative, rank))
+        before = cumulative[index - 1] if index > 0 else 0
+        fraction = (rank - before) / self.__histogram[index] if self.__histogram[index] > 0 else 0
+        return float(self.__bin_edges[index] + fraction * (self.__bin_edges[index + 1] - self.__bin_edges[index]))
@@ -14,6 +14,35 @@ class BandChoiceSimulating(SimulateMethod):
         """
         super().__init__(image_ms)
         self.__bands = bands_number
+        # Previous result and the bands normalized into its channels, for the incremental mode
+        self.__incremental = False
+        self.__image = None
+        self.__channel_bands = (None, None, None)
+        self.__channel_dtypes = [None, None, None]
+
+    def set_incremental(self, incremental : bool) -> None:
+        """
+        Enable the incremental mode: the simulator keeps its previous result, and the next
+        simulation only normalizes again the channels whose band changed, in place.
+        The result is the same as a full simulation, as each channel is normalized on its own.
+        The output buffer of the simulator must not be shared with other simulators.
+
+        Args:
+            incremental (bool): True to keep the previous result
+        """
+        self.__incremental = incremental
+        self.__image = None
+        self.__channel_bands = (None, None, None)
+        self.__channel_dtypes = [None, None, None]
+
+    def set_bands(self, bands_number : tuple) -> None:
+        """
+        Change the bands merged by the next simulation.
+
+        Args:
+            bands_number (tuple) : the bands number as a tuple of Band object for the simulation.
+        """
+        self.__bands = bands_number
 
     def simulate(self) -> np.ndarray:
         """
@@ -24,20 +53,67 @@ class BandChoiceSimulating(SimulateMethod):
 
         Author :  Lakhdar Gibril, Camille Maslin
         """
-        # Retrieving the data of each band
-        red_band_data = self.__bands[0].get_shade_of_grey()
-        green_band_data = self.__bands[1].get_shade_of_grey()
-        blue_band_data = self.__bands[2].get_shade_of_grey()
+        # Only the channels whose band changed are computed again, the others keep their pixels
+        previous = self.__image
+        if previous is not None:
+            channels = [channel for channel, band in enumerate(self.__bands) if band is not self.__channel_bands[channel]]
+        else:
+            channels = [0, 1, 2]
+        
+        # Retrieving the data of the bands of these channels only, bands decoded on demand are not read again
+        bands_data = {channel: self.__bands[channel].get_shade_of_grey() for channel in channels}
+        dtype = self.__get_result_dtype(bands_data)
+        shape = bands_data[channels[0]].shape if channels else previous.shape[:2]
+        if previous is None or previous.shape[:2] != shape or previous.dtype != dtype:
+            # The previous result cannot be reused, every channel is computed
+            channels = [0, 1, 2]
+            bands_data = {channel: bands_data[channel] if channel in bands_data else band.get_shade_of_grey()
+                          for channel, band in enumerate(self.__bands)}
+            dtype = self.__get_result_dtype(bands_data)
+            # Creating the RGB image by stacking the three channels
+            rgb_image = self._get_output(shape, dtype)
+        else:
+            rgb_image = previous
         
-        # Normalization of the data for each channel (0-1)
-        red_normalized = (red_band_data - np.min(red_band_data)) / (np.max(red_band_data) - np.min(red_band_data))
-        green_normalized = (green_band_data - np.min(green_band_data)) / (np.max(green_band_data) - np.min(green_band_data))
-        blue_normalized = (blue_band_data - np.min(blue_band_data)) / (np.max(blue_band_data) - np.min(blue_band_data))
+        for channel in channels:
+            rgb_image[:, :, channel] = bands_data[channel]
         
-        # Creating the RGB image by stacking the three channels
-        rgb_image = np.dstack((red_normalized, green_normalized, blue_normalized))
+        # Normalization of the data of each computed channel (0-1), from the extrema of the statistics index of the bands
+        statistics = [self._image_ms.get_band_statistics(self.__bands[channel]) for channel in channels]
+        offsets, divisors = self._normalization.statistics_from_extrema(
+            [band_statistics.get_min() for band_statistics in statistics],
+            [band_statistics.get_max() for band_statistics in statistics], dtype)
+        if len(channels) == 3:
+            self._normalization.apply(rgb_image, (offsets, divisors), self._executor)
+        else:
+            for position, channel in enumerate(channels):
+                self._normalization.apply(rgb_image[:, :, channel:channel + 1],
+                                          (offsets[position:position + 1], divisors[position:position + 1]),
+                                          self._executor)
         
+        if self.__incremental:
+            self.__image = rgb_image
+            self.__channel_bands = tuple(self.__bands)
+            for channel in channels:
+                self.__channel_dtypes[channel] = bands_data[channel].dtype
         return rgb_image
+
+    def __get_result_dtype(self, bands_data : dict) -> np.dtype:
+        """
+        Get the floating point type of the result, from the data of the computed channels
+        and the type of the data of the other channels in the previous result.
+
+        Args:
+            bands_data (dict): The data of the bands of the computed channels, by channel
+
+        Returns:
+            np.dtype: The type of the result
+        """
+        dtype = np.result_type(*[bands_data[channel].dtype if channel in bands_data else self.__channel_dtypes[channel]
+                                 for channel in range(3)])
+        if not np.issubdtype(dtype, np.floating):
+            dtype = np.float64
+        return self._get_dtype(dtype)
     
     def calculate_sensitivity(self, wavelength : float) -> tuple :
         pass 
\ No newline at end of file
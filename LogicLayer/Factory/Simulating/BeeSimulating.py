@@ -35,6 +35,16 @@ class BeeSimulating(SimulateMethod):
             
         return UV, Blue, Green
 
+    def get_projection(self) -> tuple:
+        """
+        Projection of the photoreceptor responses: Green -> R, Blue -> G, UV -> B,
+        on the shades of grey, in double precision.
+        
+        Returns:
+            tuple: The (channel_order, scale, dtype) arguments of _project
+        """
+        return (2, 1, 0), 1.0, np.float64
+
     def simulate(self) -> np.ndarray:
         """
         Simulate the vision of bees by applying the sensitivity curves
@@ -43,39 +53,11 @@ class BeeSimulating(SimulateMethod):
         Returns:
             np.ndarray: Normalized RGB image representing the vision of bees
         """
-        height, width = self._image_ms.get_size()[::-1]
-        bee_image = np.zeros((height, width, 3))
-        
-        # Accumulators for normalization
-        max_values = np.zeros(3)
-        min_values = np.ones(3) * float('inf')
-        
-        # Processing each band
-        for band in self._image_ms.get_bands():
-            band_data = band.get_shade_of_grey().astype(float)
-            wavelength = band.get_wavelength()[0]
-            UV, Blue, Green = self.calculate_sensitivity(wavelength)
-            
-            # Representation in RGB:
-            # UV -> Blue channel (for visualization)
-            # Blue -> Green channel
-            # Green -> Red channel
-            bee_image[:,:,2] += band_data * UV     # UV represented in blue
-            bee_image[:,:,1] += band_data * Blue   # Blue represented in green
-            bee_image[:,:,0] += band_data * Green  # Green represented in red
-            
-            # Update min/max values
-            for i in range(3):
-                channel_data = bee_image[:,:,i]
-                max_values[i] = max(max_values[i], np.max(channel_data))
-                min_values[i] = min(min_values[i], np.min(channel_data))
-        
-        # Normalization and gamma correction
-        gamma = 1
-        for i in range(3):
-            if max_values[i] > min_values[i]:
-                bee_image[:,:,i] = ((bee_image[:,:,i] - min_values[i]) / 
-                                  (max_values[i] - min_values[i]))
-                bee_image[:,:,i] = np.power(bee_image[:,:,i], 1/gamma)
-        
-        return np.clip(bee_image, 0, 1)
+        # Representation in RGB:
+        # UV -> Blue channel (for visualization)
+        # Blue -> Green channel
+        # Green -> Red channel
+        bee_image = self._project(*self.get_projection())
+        
+        # Normalization by channel, from the minimum to the maximum of each channel
+        return self._normalize(bee_image)
@@ -18,7 +18,7 @@ class HumanConeSimulating(SimulateMethod):
     def __init__(self, image_ms):
         """
         Constructor for HumanConeSimulating which calls the constructor of SimulateMethod.
-        Loads the real spectral sensitivity data from a CSV file.
+        Gets the real spectral sensitivity data, the CSV file is only read by the first instance.
         """
         super().__init__(image_ms)
         self.spectral_sensitivity = FileManager.open_and_load_sensitivity_data()
@@ -40,37 +40,33 @@ class HumanConeSimulating(SimulateMethod):
         
         return L, M, S
 
+    def calculate_sensitivities(self, wavelengths: np.ndarray) -> np.ndarray:
+        """
+        Calculates the cone sensitivities of every wavelength in a single interpolation.
+        
+        Args:
+            wavelengths (np.ndarray): The wavelengths in nanometers
+        
+        Returns:
+            np.ndarray: A (wavelengths x 3) array of (L, M, S) cone sensitivity values
+        """
+        return self.spectral_sensitivity.evaluate(wavelengths)
+
+    def get_projection(self) -> tuple:
+        """
+        Projection of the cone responses: L-cone -> R, M-cone -> G, S-cone -> B,
+        on band values normalized to [0,1], in single precision.
+        """
+        return (0, 1, 2), 1 / 255.0, np.float32
+
     def simulate(self) -> np.ndarray:
         """
         Simulates human vision using Stiles & Burch cone fundamentals,
         with normalization similar to V1 for better consistency.
         """
-        # Get image dimensions from size tuple (width, height)
-        width, height = self._image_ms.get_size()
-        rgb_image = np.zeros((height, width, 3), dtype=np.float32)
-        
-        # Accumulate responses
-        for band in self._image_ms.get_bands():
-            wavelength = band.get_wavelength()[0]  # Get the minimum wavelength from the tuple
-            band_data = band.get_shade_of_grey().astype(np.float32) / 255.0  # Normalize to [0,1]
-            L, M, S = self.calculate_sensitivity(wavelength)
-            
-            # Accumulate responses
-            rgb_image[:,:,0] += band_data * L  # L-cone
-            rgb_image[:,:,1] += band_data * M  # M-cone
-            rgb_image[:,:,2] += band_data * S  # S-cone
-        
-        # Normalize each channel independently
-        for i in range(3):
-            channel = rgb_image[:,:,i]
-            if np.any(channel):  # Only normalize if channel has non-zero values
-                min_val = np.min(channel)
-                max_val = np.max(channel)
-                if max_val > min_val:
-                    # Normalize to [0,1]
-                    rgb_image[:,:,i] = (channel - min_val) / (max_val - min_val)
-        
-        # Ensure all values are in [0,1] range
-        rgb_image = np.clip(rgb_image, 0, 1)
+        # Accumulate responses of every band on normalized values [0,1]
+        # (L-cone -> R, M-cone -> G, S-cone -> B)
+        rgb_image = self._project(*self.get_projection())
         
-        return rgb_image 
\ No newline at end of file
+        # Normalize each channel independently to [0,1], null channels are left unchanged
+        return self._normalize(rgb_image) 
\ No newline at end of file
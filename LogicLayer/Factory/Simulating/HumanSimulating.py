@@ -48,35 +48,16 @@ class HumanSimulating(SimulateMethod):
             
         return S, M, L
 
+    def get_projection(self) -> tuple:
+        """
+        Projection of the cone responses: L -> R, M -> G, S -> B,
+        on the shades of grey, in double precision.
+        """
+        return (2, 1, 0), 1.0, np.float64
+
     def simulate(self) -> np.ndarray:
-        height, width = self._image_ms.get_size()[::-1]
-        rgb_image = np.zeros((height, width, 3))
-        
-        # Accumulators for normalization
-        max_values = np.zeros(3)
-        min_values = np.ones(3) * float('inf')
-        
-        # First pass: accumulation and search for min/max
-        for band in self._image_ms.get_bands():
-            band_data = band.get_shade_of_grey().astype(float)
-            wavelength = band.get_wavelength()[0]
-            S, M, L = self.calculate_sensitivity(wavelength)
-            
-            rgb_image[:,:,0] += band_data * L
-            rgb_image[:,:,1] += band_data * M
-            rgb_image[:,:,2] += band_data * S
-            
-            for i in range(3):
-                channel_data = rgb_image[:,:,i]
-                max_values[i] = max(max_values[i], np.max(channel_data))
-                min_values[i] = min(min_values[i], np.min(channel_data))
-        
-        # Normalization by channel with gamma correction
-        gamma = 1  # Adjustment of gamma to improve contrast
-        for i in range(3):
-            if max_values[i] > min_values[i]:
-                rgb_image[:,:,i] = ((rgb_image[:,:,i] - min_values[i]) / 
-                                  (max_values[i] - min_values[i]))
-                rgb_image[:,:,i] = np.power(rgb_image[:,:,i], 1/gamma)
+        # Accumulation of every band in one projection: L -> R, M -> G, S -> B
+        rgb_image = self._project(*self.get_projection())
         
-        return np.clip(rgb_image, 0, 1)
+        # Normalization by channel, from the minimum to the maximum of each channel
+        return self._normalize(rgb_image)
@@ -0,0 +1,115 @@
+import numpy as np
+
+from LogicLayer.Factory.Simulating.TileExecutor import TileExecutor
+
+class Normalization:
+    """
+    Post-processing stage shared by the vision simulators.
+
+    The statistics of the three channels are computed once, on the finished
+    accumulation, then scaling, gamma correction and clipping are applied in
+    place on the whole image. With an executor, the reductions and the scaling
+    run on tiles of rows concurrently, the statistics stay those of the whole
+    image so the result is the same.
+    """
+    MIN_MAX : str = "min_max" # Each channel is stretched from its minimum to its maximum
+    MAX : str = "max" # Each channel is divided by its maximum
+
+    def __init__(self, mode : str = MIN_MAX, gamma : float = 1.0):
+        """
+        Constructor of the normalization stage.
+
+        Args:
+            mode (str): Normalization.MIN_MAX or Normalization.MAX
+            gamma (float): Gamma correction, values are raised to the power 1/gamma
+        """
+        self.__mode = mode
+        self.__gamma = gamma
+
+    def compute_statistics(self, image : np.ndarray, executor : TileExecutor = None) -> tuple:
+        """
+        Compute the offset and divisor of each channel of an image.
+
+        A channel which cannot be stretched (constant channel, or null maximum in
+        Normalization.MAX mode) gets a null offset and a unit divisor, so it is left unchanged.
+
+        Args:
+            image (np.ndarray): A (height, width, 3) image
+            executor (TileExecutor): Executor reducing tiles of rows concurrently, None to reduce
+                                     on the calling thread
+
+        Returns:
+            tuple: The offsets and the divisors of the channels, as arrays of the type of the image
+        """
+        with_min = self.__mode != Normalization.MAX
+
+        def reduce_tile(start : int, stop : int) -> tuple:
+            tile = image[start:stop]
+            return tile.max(axis=(0, 1)), tile.min(axis=(0, 1)) if with_min else None
+
+        if executor is None:
+            max_values, min_values = reduce_tile(0, image.shape[0])
+        else:
+            # Minimums and maximums of the tiles combine exactly into those of the image
+            reductions = executor.run(reduce_tile, executor.split(image.shape[0]))
+            max_values = np.maximum.reduce([tile_max for tile_max, _ in reductions])
+            min_values = np.minimum.reduce([tile_min for _, tile_min in reductions]) if with_min else None
+
+        return self.statistics_from_extrema(min_values, max_values, image.dtype)
+
+    def statistics_from_extrema(self, min_values : np.ndarray, max_values : np.ndarray, dtype : type) -> tuple:
+        """
+        Compute the offset and divisor of each channel from known minimums and maximums,
+        e.g. those of the statistics index of the bands, instead of scanning the image.
+
+        Args:
+            min_values (np.ndarray): The minimum of each channel, ignored in Normalization.MAX mode
+            max_values (np.ndarray): The maximum of each channel
+            dtype (type): Floating point type of the normalized image
+
+        Returns:
+            tuple: The offsets and the divisors of the channels, as given by compute_statistics
+        """
+        # Extrema converted to the type of the image are those of the converted image
+        max_values = np.asarray(max_values).astype(dtype)
+        if self.__mode != Normalization.MAX:
+            offsets = np.asarray(min_values).astype(dtype)
+            stretched = max_values > offsets
+        else:
+            offsets = np.zeros_like(max_values)
+            stretched = max_values > 0
+        offsets = np.where(stretched, offsets, 0).astype(dtype)
+        divisors = np.where(stretched, max_values - offsets, 1).astype(dtype)
+        return offsets, divisors
+
+    def apply(self, image : np.ndarray, statistics : tuple = None, executor : TileExecutor = None) -> np.ndarray:
+        """
+        Normalize an image in place.
+
+        Args:
+            image (np.ndarray): A (height, width, 3) floating point image
+            statistics (tuple): Offsets and divisors given by compute_statistics,
+                                None to compute them on the image
+            executor (TileExecutor): Executor normalizing tiles of rows concurrently, None to normalize
+                                     on the calling thread
+
+        Returns:
+            np.ndarray: The image, with values in [0,1]
+        """
+        if statistics is None:
+            statistics = self.compute_statistics(image, executor)
+        offsets, divisors = statistics
+
+        def apply_tile(start : int, stop : int) -> None:
+            tile = image[start:stop]
+            tile -= offsets
+            tile /= divisors
+            if self.__gamma != 1:
+                np.power(tile, 1 / self.__gamma, out=tile)
+            np.clip(tile, 0, 1, out=tile)
+
+        if executor is None:
+            apply_tile(0, image.shape[0])
+        else:
+            executor.run(apply_tile, executor.split(image.shape[0]))
+        return image
@@ -0,0 +1,150 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from LogicLayer.ImageMS import ImageMS
+from ResourceManager import ResourceManager
+
+class ResultCache:
+    """
+    Cache of finished simulations, keyed by image, simulation type and parameters.
+
+    Running again a simulation already computed on the same image, such as toggling
+    back to a previous RGB triple, returns the cached result instead of simulating.
+    Views derived from a result (e.g. its display pixmap) are cached with it. The least
+    recently used results are released first when the memory budget is exceeded.
+    Hits and misses are counted for instrumentation.
+    """
+
+    def __init__(self, budget_bytes : int = ResourceManager.RESULT_CACHE_BYTES):
+        """
+        Constructor of the cache.
+
+        Args:
+            budget_bytes (int): Memory the cached results and views may use
+        """
+        self.__budget_bytes = budget_bytes
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    @staticmethod
+    def make_key(image_ms : ImageMS, simulation_type : str, params : tuple) -> tuple:
+        """
+        Build the identity of a simulation.
+
+        Args:
+            image_ms (ImageMS): The simulated image, identified by the object itself
+            simulation_type (str): The type of simulation
+            params (tuple): Hashable parameters of the simulation, e.g. band numbers
+
+        Returns:
+            tuple: The key of the simulation
+        """
+        return (id(image_ms), simulation_type, params)
+
+    def get(self, key : tuple) -> np.ndarray:
+        """
+        Get a cached result, counting a hit or a miss.
+
+        Args:
+            key (tuple): Key given by make_key
+
+        Returns:
+            np.ndarray: The read-only simulated image, None if it is not cached
+        """
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.__misses += 1
+            return None
+        self.__hits += 1
+        self.__entries.move_to_end(key)
+        return entry['result']
+
+    def store(self, key : tuple, image_ms : ImageMS, result : np.ndarray) -> np.ndarray:
+        """
+        Cache a result, releasing the least recently used ones over the budget.
+
+        Args:
+            key (tuple): Key given by make_key
+            image_ms (ImageMS): The simulated image, kept alive so that its identity is not reused
+            result (np.ndarray): The simulated image, it must not be modified afterwards
+
+        Returns:
+            np.ndarray: The cached result, read-only
+        """
+        result.flags.writeable = False
+        self.__entries[key] = {'image': image_ms, 'result': result, 'views': {}, 'nbytes': result.nbytes}
+        self.__entries.move_to_end(key)
+        self.__release()
+        return result
+
+    def get_view(self, key : tuple, name : str):
+        """
+        Get a view cached with a result.
+
+        Args:
+            key (tuple): Key of the result
+            name (str): Name of the view
+
+        Returns:
+            The view, None if it is not cached
+        """
+        entry = self.__entries.get(key)
+        if entry is None or name not in entry['views']:
+            return None
+        view, _ = entry['views'][name]
+        return view
+
+    def store_view(self, key : tuple, name : str, view, nbytes : int) -> None:
+        """
+        Cache a view of a cached result, it is released with the result.
+
+        Args:
+            key (tuple): Key of the result
+            name (str): Name of the view
+            view: The view
+            nbytes (int): Memory used by the view
+        """
+        entry = self.__entries.get(key)
+        if entry is None:
+            return
+        entry['views'][name] = (view, nbytes)
+        entry['nbytes'] = entry['result'].nbytes + sum(size for _, size in entry['views'].values())
+        self.__release()
+
+    def get_statistics(self) -> dict:
+        """
+        Get the instrumentation counters of the cache.
+
+        Returns:
+            dict: 'hits', 'misses', 'entries' and 'bytes' of the cache
+        """
+        return {
+            'hits': self.__hits,
+            'misses': self.__misses,
+            'entries': len(self.__entries),
+            'bytes': self.get_nbytes()
+        }
+
+    def get_nbytes(self) -> int:
+        """
+        Get the memory used by the cached results and views.
+
+        Returns:
+            int: The number of bytes
+        """
+        return sum(entry['nbytes'] for entry in self.__entries.values())
+
+    def clear(self) -> None:
+        """
+        Release every cached result, the counters are kept.
+        """
+        self.__entries.clear()
+
+    def __release(self) -> None:
+        """
+        Release the least recently used results over the budget, the most recent one is always kept.
+        """
+        while len(self.__entries) > 1 and self.get_nbytes() > self.__budget_bytes:
+            self.__entries.popitem(last=False)
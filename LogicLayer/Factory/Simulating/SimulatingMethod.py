@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 import numpy as np
 
 from LogicLayer import ImageMS
+from LogicLayer.Factory.Simulating.SpectralProjection import SpectralProjection
+from LogicLayer.Factory.Simulating.Normalization import Normalization
 
 class SimulateMethod(ABC):
     """
@@ -21,6 +23,10 @@ class SimulateMethod(ABC):
             'G': 1.0,
             'B': 1.0
         }
+        # Post-processing of the accumulated responses, simulators may replace it
+        self._normalization = Normalization(Normalization.MIN_MAX)
+        self._output_buffer = None
+        self._executor = None
 
     @abstractmethod
     def simulate(self) -> np.ndarray:
@@ -34,4 +40,225 @@ class SimulateMethod(ABC):
     
     @abstractmethod
     def calculate_sensitivity(self, wavelength : float) -> tuple :
-        pass  
\ No newline at end of file
+        pass
+
+    def calculate_sensitivities(self, wavelengths : np.ndarray) -> np.ndarray:
+        """
+        Calculate the sensitivities of the simulator for several wavelengths at once.
+        Simulators reading tabulated data override it to interpolate the whole vector in one call.
+
+        Args:
+            wavelengths (np.ndarray): The wavelengths in nanometers
+
+        Returns:
+            np.ndarray: A (wavelengths x 3) array, one row of calculate_sensitivity per wavelength
+        """
+        return np.array([self.calculate_sensitivity(wavelength) for wavelength in wavelengths], dtype=np.float64)
+
+    def set_output_buffer(self, buffer) -> None:
+        """
+        Give the simulator a reusable output buffer. Its kernels then run in the type of
+        the buffer and write their result into it, the result is overwritten by the next
+        simulation using the same buffer.
+
+        Args:
+            buffer (SimulationBuffer): The buffer, None to allocate a new result on every simulation
+        """
+        self._output_buffer = buffer
+
+    def set_executor(self, executor) -> None:
+        """
+        Give the simulator an executor running its kernels on tiles of rows concurrently.
+        The result is the same as on the calling thread.
+
+        Args:
+            executor (TileExecutor): The executor, None to run on the calling thread
+        """
+        self._executor = executor
+
+    def _normalize(self, image : np.ndarray) -> np.ndarray:
+        """
+        Normalize the accumulated responses in place with the normalization stage of the simulator.
+
+        Args:
+            image (np.ndarray): The (height, width, 3) accumulated responses
+
+        Returns:
+            np.ndarray: The image, with values in [0,1]
+        """
+        return self._normalization.apply(image, executor=self._executor)
+
+    def _get_output(self, shape : tuple, dtype : type) -> np.ndarray:
+        """
+        Get the array receiving the result of the simulation.
+
+        Args:
+            shape (tuple): The (height, width) of the result
+            dtype (type): Floating point type of the result when there is no output buffer
+
+        Returns:
+            np.ndarray: A (height, width, 3) array, its content is undefined
+        """
+        if self._output_buffer is None:
+            return np.empty(tuple(shape) + (3,), dtype=dtype)
+        return self._output_buffer.get(tuple(shape) + (3,))
+
+    def _get_dtype(self, dtype : type) -> np.dtype:
+        """
+        Get the floating point type the kernels of the simulator run in.
+
+        Args:
+            dtype (type): Type used when there is no output buffer
+
+        Returns:
+            np.dtype: The type of the buffer, or dtype
+        """
+        return np.dtype(dtype) if self._output_buffer is None else self._output_buffer.get_dtype()
+
+    def get_projection(self) -> tuple:
+        """
+        Describe the projection of the bands computed by the simulator, so that it can
+        be shared with other simulators by simulate_many.
+
+        Returns:
+            tuple: The (channel_order, scale, dtype) arguments of _project, None if the
+                   simulator does not project every band
+        """
+        return None
+
+    def get_response_key(self) -> tuple:
+        """
+        Identify the responses of the bands to the sensitivities of the simulator: simulators with
+        the same key project an image onto the same responses, which can be computed once.
+
+        Returns:
+            tuple: The floating point type, the class and the scale of the projection,
+                   simulators with parameters changing their sensitivities append them
+        """
+        _, scale, dtype = self.get_projection()
+        return (self._get_dtype(dtype).str, type(self).__name__, scale)
+
+    def transform(self, responses : np.ndarray, out : np.ndarray) -> np.ndarray:
+        """
+        Transform stage following the spectral projection: map the responses, in the order of
+        calculate_sensitivity, to the R, G and B channels of the simulated image.
+
+        Args:
+            responses (np.ndarray): The (height, width, 3) responses of the bands
+            out (np.ndarray): The (height, width, 3) array receiving the channels
+
+        Returns:
+            np.ndarray: The out array
+        """
+        channel_order, _, _ = self.get_projection()
+        for channel, response in enumerate(channel_order):
+            out[:, :, channel] = responses[:, :, response]
+        return out
+
+    @staticmethod
+    def simulate_many(simulators : list) -> list:
+        """
+        Run several simulators of the same image with a single read of its bands.
+
+        The sensitivity matrices of the simulators which project every band are stacked
+        side by side, the cube is projected onto all their channels at once, then each
+        simulator transforms and normalizes its own channels. The other simulators run on their own.
+
+        Args:
+            simulators (list): Simulators of the same image
+
+        Returns:
+            list: The simulated images, in the order of the simulators
+
+        Raises:
+            ValueError: If the simulators do not simulate the same image
+        """
+        if any(simulator._image_ms is not simulators[0]._image_ms for simulator in simulators):
+            raise ValueError("Simulators run together must simulate the same image")
+        results = [None] * len(simulators)
+        projecting = [index for index, simulator in enumerate(simulators) if simulator.get_projection() is not None]
+        for index, simulator in enumerate(simulators):
+            if index not in projecting:
+                results[index] = simulator.simulate()
+        if len(projecting) == 0:
+            return results
+
+        first = simulators[projecting[0]]
+        image_ms = first._image_ms
+        matrices = []
+        dtypes = []
+        for index in projecting:
+            _, scale, dtype = simulators[index].get_projection()
+            matrices.append(simulators[index]._get_sensitivity_matrix((0, 1, 2), scale))
+            dtypes.append(simulators[index]._get_dtype(dtype))
+        # The joint projection runs in the widest type requested
+        dtype = np.result_type(*dtypes)
+        projected = SimulateMethod._project_matrix(image_ms, np.hstack(matrices), dtype, None, first._executor)
+
+        width, height = image_ms.get_size()
+        for position, (index, simulator_dtype) in enumerate(zip(projecting, dtypes)):
+            simulator = simulators[index]
+            image = simulator._get_output((height, width), simulator_dtype)
+            simulator.transform(projected[:, :, 3 * position:3 * position + 3], image)
+            results[index] = simulator._normalize(image)
+        return results
+
+    @staticmethod
+    def _project_matrix(image_ms : ImageMS, matrix : np.ndarray, dtype : type, out : np.ndarray,
+                        executor, progress : callable = None) -> np.ndarray:
+        """
+        Project every band of an image with a sensitivity matrix.
+
+        Args:
+            image_ms (ImageMS): The multispectral image
+            matrix (np.ndarray): The (n_bands x channels) sensitivity matrix, scale included
+            dtype (type): Floating point type of the result
+            out (np.ndarray): (height, width, channels) array receiving the result, None to allocate it
+            executor (TileExecutor): Executor projecting tiles of rows concurrently, or None
+            progress (callable): Called with the number of projected blocks or bands and their total number,
+                                 None to skip. An exception it raises stops the projection
+
+        Returns:
+            np.ndarray: The (height, width, channels) accumulated responses
+        """
+        if not image_ms.has_cube():
+            # Bands decoded on demand are streamed instead of being held all at once
+            return SpectralProjection.project_bands(image_ms.get_bands(), matrix, dtype, out, progress)
+        cube = SpectralProjection.get_cube(image_ms)
+        return SpectralProjection.project(cube, matrix, dtype, out, executor, progress)
+
+    def _get_sensitivity_matrix(self, channel_order : tuple, scale : float = 1.0) -> np.ndarray:
+        """
+        Build the sensitivity matrix of the simulator for the bands of the image.
+
+        Args:
+            channel_order (tuple): Index in the tuple returned by calculate_sensitivity of the value
+                                   feeding the R, G and B channels
+            scale (float): Factor applied to the shades of grey (e.g. 1/255 to work in [0,1])
+
+        Returns:
+            np.ndarray: The (n_bands x 3) matrix, with the scale of the stored values folded in
+        """
+        matrix = SpectralProjection.build_sensitivity_matrix(self._image_ms, self.calculate_sensitivities,
+                                                             channel_order, vectorized=True)
+        # The scale of the stored values is folded into the matrix instead of converting the cube
+        return matrix * (scale * self._image_ms.get_scale())
+
+    def _project(self, channel_order : tuple, scale : float = 1.0, dtype : type = np.float64) -> np.ndarray:
+        """
+        Project every band of the image onto three channels using the sensitivities of the simulator.
+
+        Args:
+            channel_order (tuple): Index in the tuple returned by calculate_sensitivity of the value
+                                   feeding the R, G and B channels
+            scale (float): Factor applied to the shades of grey (e.g. 1/255 to work in [0,1])
+            dtype (type): Floating point type of the result when there is no output buffer
+
+        Returns:
+            np.ndarray: The (height, width, 3) accumulated responses
+        """
+        dtype = self._get_dtype(dtype)
+        width, height = self._image_ms.get_size()
+        out = self._get_output((height, width), dtype)
+        matrix = self._get_sensitivity_matrix(channel_order, scale)
+        return SimulateMethod._project_matrix(self._image_ms, matrix, dtype, out, self._executor)
\ No newline at end of file
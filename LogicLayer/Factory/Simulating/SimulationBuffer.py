@@ -0,0 +1,62 @@
+import numpy as np
+
+class SimulationBuffer:
+    """
+    Reusable output memory of the simulators.
+
+    A simulator given a buffer runs its kernels in the type of the buffer and
+    writes its result into memory allocated once, instead of allocating a new
+    image on every simulation. The result of a simulation is only valid until
+    the next simulation using the same buffer.
+    """
+
+    def __init__(self, dtype : type = np.float32):
+        """
+        Constructor of the buffer.
+
+        Args:
+            dtype (type): Floating point type of the kernels and of the results
+        """
+        self.__dtype = np.dtype(dtype)
+        self.__arrays = {}
+
+    def get(self, shape : tuple, name : str = "output") -> np.ndarray:
+        """
+        Get an array of the buffer, allocating it only when its shape changed.
+
+        Args:
+            shape (tuple): The shape of the array
+            name (str): Name of the array, arrays with different names never share memory
+
+        Returns:
+            np.ndarray: An array of the type of the buffer, its content is undefined
+        """
+        array = self.__arrays.get(name)
+        if array is None or array.shape != tuple(shape):
+            array = np.empty(shape, dtype=self.__dtype)
+            self.__arrays[name] = array
+        return array
+
+    def get_dtype(self) -> np.dtype:
+        """
+        Get the floating point type of the kernels using the buffer.
+
+        Returns:
+            np.dtype: The type of the arrays
+        """
+        return self.__dtype
+
+    def get_nbytes(self) -> int:
+        """
+        Get the memory held by the buffer.
+
+        Returns:
+            int: The number of bytes of every array
+        """
+        return sum(array.nbytes for array in self.__arrays.values())
+
+    def release(self) -> None:
+        """
+        Release every array, they are allocated again when they are next needed.
+        """
+        self.__arrays.clear()
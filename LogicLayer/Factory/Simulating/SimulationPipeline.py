@@ -0,0 +1,159 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.Factory.Simulating.SimulatingMethod import SimulateMethod
+from ResourceManager import ResourceManager
+
+class SimulationPipeline:
+    """
+    Stages of the simulations of one image and of its pyramid levels:
+    spectral projection -> LMS transform -> deficiency transform -> normalization.
+
+    The spectral projection is the only stage reading the bands. Its responses are
+    cached by image and simulator identity, within one memory budget shared by the
+    image and its levels, and reused by the next runs, so running again a simulation
+    whose responses are cached only recomputes the final 3-channel stages. Responses
+    of related simulators can be projected in the same pass over the cube.
+    """
+
+    def __init__(self, image_ms : ImageMS, budget_bytes : int = ResourceManager.PIPELINE_CACHE_BYTES):
+        """
+        Constructor of the pipeline.
+
+        Args:
+            image_ms (ImageMS): The multispectral image the simulations of the pipeline run on, or on its levels
+            budget_bytes (int): Memory the cached responses of the image and of its levels may use,
+                                the least recently used are released first
+        """
+        self.__image_ms = image_ms
+        self.__budget_bytes = budget_bytes
+        # (image, responses) by (image identity, response key), the image is kept so that its identity is not reused
+        self.__responses = OrderedDict()
+
+    def get_image(self) -> ImageMS:
+        """
+        Get the image of the pipeline.
+
+        Returns:
+            ImageMS: The multispectral image
+        """
+        return self.__image_ms
+
+    def get_responses(self, simulator : SimulateMethod, companions : tuple = (),
+                      progress : callable = None) -> np.ndarray:
+        """
+        Spectral projection stage: get the responses of the bands to the sensitivities of a simulator.
+
+        Args:
+            simulator (SimulateMethod): A simulator of the image, or of one of its levels, projecting every band
+            companions (tuple): Other simulators of the same image whose responses are projected in the same pass
+                                when the responses of the simulator are not cached, the first ones whose
+                                responses fit in the budget with those of the simulator
+            progress (callable): Called with the number of projected blocks and their total number during the
+                                 projection, an exception it raises stops it and nothing is cached
+
+        Returns:
+            np.ndarray: The read-only (height, width, 3) responses, in the order of calculate_sensitivity
+        """
+        image_ms = simulator._image_ms
+        key = simulator.get_response_key()
+        cached = self.__responses.get((id(image_ms), key))
+        if cached is not None:
+            self.__responses.move_to_end((id(image_ms), key))
+            return cached[1]
+
+        # Every simulator missing from the cache is projected in a single read of the bands, as long as
+        # the responses of the pass fit in the budget, otherwise they would be released as soon as stored
+        pending = OrderedDict([(key, simulator)])
+        width, height = image_ms.get_size()
+        capacity = self.__budget_bytes // (width * height * 3 * np.dtype(key[0]).itemsize)
+        for companion in companions:
+            if len(pending) >= capacity:
+                break
+            companion_key = companion.get_response_key()
+            # Responses of a pass share its image and its floating point type
+            if companion._image_ms is image_ms and (id(image_ms), companion_key) not in self.__responses \
+                    and companion_key[0] == key[0]:
+                pending.setdefault(companion_key, companion)
+
+        matrices = []
+        for pending_simulator in pending.values():
+            _, scale, _ = pending_simulator.get_projection()
+            matrices.append(pending_simulator._get_sensitivity_matrix((0, 1, 2), scale))
+        dtype = np.dtype(key[0])
+        projected = SimulateMethod._project_matrix(image_ms, np.hstack(matrices), dtype, None,
+                                                   simulator._executor, progress)
+
+        # The responses of the simulator are stored last, so they are the last ones released
+        for position, pending_key in reversed(list(enumerate(pending))):
+            pending_responses = projected[:, :, 3 * position:3 * position + 3]
+            if len(pending) > 1:
+                pending_responses = np.ascontiguousarray(pending_responses)
+            pending_responses.flags.writeable = False
+            self.__store(image_ms, pending_key, pending_responses)
+        return pending_responses
+
+    def run(self, simulator : SimulateMethod, companions : tuple = (), progress : callable = None) -> np.ndarray:
+        """
+        Run a simulation through every stage.
+
+        Args:
+            simulator (SimulateMethod): A simulator of the image, or of one of its levels, projecting every band
+            companions (tuple): Simulators whose responses are projected in the same pass if a projection is needed
+            progress (callable): Called with the number of projected blocks and their total number if a
+                                 projection is needed, an exception it raises stops the simulation
+
+        Returns:
+            np.ndarray: The simulated image, written into the output buffer of the simulator if it has one
+        """
+        responses = self.get_responses(simulator, companions, progress)
+        height, width, _ = responses.shape
+        _, _, dtype = simulator.get_projection()
+        image = simulator._get_output((height, width), simulator._get_dtype(dtype))
+        # LMS transform and deficiency transform stages, then normalization in place
+        simulator.transform(responses, image)
+        return simulator._normalize(image)
+
+    def get_cached_keys(self, image_ms : ImageMS = None) -> list:
+        """
+        Get the identities of the cached responses of an image.
+
+        Args:
+            image_ms (ImageMS): The image of the pipeline or one of its levels, None for the image of the pipeline
+
+        Returns:
+            list: The response keys, from the least to the most recently used
+        """
+        identity = id(image_ms if image_ms is not None else self.__image_ms)
+        return [key for image_identity, key in self.__responses if image_identity == identity]
+
+    def get_nbytes(self) -> int:
+        """
+        Get the memory used by the cached responses of the image and of its levels.
+
+        Returns:
+            int: The number of bytes
+        """
+        return sum(responses.nbytes for _, responses in self.__responses.values())
+
+    def clear(self) -> None:
+        """
+        Release every cached response.
+        """
+        self.__responses.clear()
+
+    def __store(self, image_ms : ImageMS, key : tuple, responses : np.ndarray) -> None:
+        """
+        Cache responses, releasing the least recently used ones over the budget.
+
+        Args:
+            image_ms (ImageMS): The projected image
+            key (tuple): Identity of the responses
+            responses (np.ndarray): The responses
+        """
+        self.__responses[(id(image_ms), key)] = (image_ms, responses)
+        self.__responses.move_to_end((id(image_ms), key))
+        while len(self.__responses) > 1 and self.get_nbytes() > self.__budget_bytes:
+            self.__responses.popitem(last=False)
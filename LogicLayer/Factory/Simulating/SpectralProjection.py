@@ -0,0 +1,163 @@
+import threading
+
+import numpy as np
+
+from LogicLayer import ImageMS
+from LogicLayer.Factory.Simulating.TileExecutor import TileExecutor
+
+class SpectralProjection:
+    """
+    Projection engine shared by every vision simulator.
+
+    The spectral response of a simulator is gathered once into a (n_bands x 3)
+    sensitivity matrix, then the whole band cube is projected onto the three
+    output channels with a single matrix product instead of three multiply-adds
+    per band. The matrices of several simulators can be stacked side by side to
+    project the cube onto all their channels in a single read.
+    """
+    BLOCK_BYTES : int = 32 * 1024 * 1024 # Size of the blocks of the cube converted to floating point at once
+
+    @staticmethod
+    def build_sensitivity_matrix(image_ms : ImageMS, calculate_sensitivity : callable,
+                                 channel_order : tuple = (0, 1, 2), vectorized : bool = False) -> np.ndarray:
+        """
+        Build the sensitivity matrix of a simulator for the bands of an image.
+
+        Args:
+            image_ms (ImageMS): The multispectral image whose band wavelengths are used
+            calculate_sensitivity (callable): Function returning a 3-tuple of sensitivities for a wavelength
+            channel_order (tuple): Index in the sensitivity tuple of the value feeding the R, G and B channels
+            vectorized (bool): True if calculate_sensitivity takes the vector of every wavelength
+                               and returns a (n_bands x 3) array
+
+        Returns:
+            np.ndarray: A (n_bands x 3) matrix, one row per band, columns in R, G, B order
+        """
+        wavelengths = [band.get_wavelength()[0] for band in image_ms.get_bands()]
+        if vectorized:
+            matrix = np.asarray(calculate_sensitivity(np.array(wavelengths, dtype=np.float64)), dtype=np.float64)
+        else:
+            matrix = np.array([calculate_sensitivity(wavelength) for wavelength in wavelengths], dtype=np.float64)
+        return matrix[:, list(channel_order)]
+
+    @staticmethod
+    def get_cube(image_ms : ImageMS) -> np.ndarray:
+        """
+        Get the (n_bands, height, width) cube of an image without copying its pixels.
+
+        Args:
+            image_ms (ImageMS): The multispectral image
+
+        Returns:
+            np.ndarray: The band cube
+        """
+        return image_ms.get_cube()
+
+    @staticmethod
+    def project(cube : np.ndarray, matrix : np.ndarray, dtype : type = np.float64,
+                out : np.ndarray = None, executor : TileExecutor = None, progress : callable = None) -> np.ndarray:
+        """
+        Project a band cube onto three channels.
+
+        The cube keeps its native type: it is converted to floating point by blocks of
+        rows into a single block buffer, so the whole cube is never duplicated as floats.
+        The product of each block is written straight into the result.
+
+        Args:
+            cube (np.ndarray): A (n_bands, height, width) cube
+            matrix (np.ndarray): The (n_bands x channels) sensitivity matrix
+            dtype (type): Floating point type of the computation and of the result
+            out (np.ndarray): Contiguous (height, width, channels) array of type dtype receiving the result,
+                              None to allocate it
+            executor (TileExecutor): Executor projecting tiles of rows concurrently, None to project
+                                     on the calling thread
+            progress (callable): Called with the number of projected blocks and the total number of blocks
+                                 after each block, from the threads of the executor. An exception it raises
+                                 stops the projection and is propagated
+
+        Returns:
+            np.ndarray: The (height, width, channels) projected image
+        """
+        n_bands, height, width = cube.shape
+        weights = matrix.astype(dtype)
+        channels = weights.shape[1]
+        if out is None:
+            out = np.empty((height, width, channels), dtype=dtype)
+        pixels = out.reshape(-1, channels)
+        rows = min(height, SpectralProjection.get_rows_per_block(cube.shape, dtype))
+        if executor is not None:
+            # Blocks are made small enough to give every worker a tile
+            rows = max(1, min(rows, -(-height // executor.get_workers())))
+        # Projected blocks are counted across the tiles
+        lock = threading.Lock()
+        projected = [0]
+
+        def project_tile(tile_start : int, tile_stop : int) -> None:
+            # Each tile converts its blocks into a block buffer of its own
+            block = np.empty((n_bands, min(rows, tile_stop - tile_start), width), dtype=dtype)
+            for start in range(tile_start, tile_stop, rows):
+                stop = min(start + rows, tile_stop)
+                block_rows = block[:, :stop - start]
+                np.copyto(block_rows, cube[:, start:stop], casting='unsafe')
+                np.matmul(block_rows.reshape(n_bands, -1).T, weights, out=pixels[start * width:stop * width])
+                if progress is not None:
+                    with lock:
+                        projected[0] += 1
+                        count = projected[0]
+                    progress(count, -(-height // rows))
+
+        if executor is None:
+            project_tile(0, height)
+        else:
+            executor.run(project_tile, executor.split(height, rows))
+        return out
+
+    @staticmethod
+    def get_rows_per_block(shape : tuple, dtype : type) -> int:
+        """
+        Compute how many rows of the cube are converted to floating point at once.
+
+        Args:
+            shape (tuple): The (n_bands, height, width) shape of the cube
+            dtype (type): Floating point type of the computation
+
+        Returns:
+            int: The number of rows of a block, at least one
+        """
+        n_bands, _, width = shape
+        row_bytes = n_bands * width * np.dtype(dtype).itemsize
+        return max(1, SpectralProjection.BLOCK_BYTES // max(1, row_bytes))
+
+    @staticmethod
+    def project_bands(bands : list, matrix : np.ndarray, dtype : type = np.float64,
+                      out : np.ndarray = None, progress : callable = None) -> np.ndarray:
+        """
+        Project bands onto three channels one band at a time, for images whose bands
+        are decoded on demand and are never all held in memory.
+
+        Args:
+            bands (list): The Band objects, in the order of the rows of the matrix
+            matrix (np.ndarray): The (n_bands x channels) sensitivity matrix
+            dtype (type): Floating point type of the computation and of the result
+            out (np.ndarray): (height, width, channels) array of type dtype receiving the result,
+                              None to allocate it
+            progress (callable): Called with the number of projected bands and the number of bands after
+                                 each band. An exception it raises stops the projection and is propagated
+
+        Returns:
+            np.ndarray: The (height, width, channels) projected image
+        """
+        weighted_band = None
+        for band_index, (band, weights) in enumerate(zip(bands, matrix.astype(dtype))):
+            band_data = band.get_raw_shade_of_grey()
+            if weighted_band is None:
+                if out is None:
+                    out = np.empty(band_data.shape + (len(weights),), dtype=dtype)
+                out.fill(0)
+                weighted_band = np.empty(band_data.shape, dtype=dtype)
+            for channel in range(len(weights)):
+                np.multiply(band_data, weights[channel], out=weighted_band, casting='unsafe')
+                out[:, :, channel] += weighted_band
+            if progress is not None:
+                progress(band_index + 1, len(bands))
+        return out
@@ -0,0 +1,76 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+class TileExecutor:
+    """
+    Thread pool running the kernels of a simulation on tiles of rows of the image.
+
+    NumPy releases the GIL in the projection and normalization kernels, so the
+    tiles of a simulation are computed concurrently. Every tile writes into its
+    own rows of a shared output, the result does not depend on the number of
+    workers.
+    """
+
+    def __init__(self, workers : int = None):
+        """
+        Constructor of the executor, the threads are only started by the first tiled run.
+
+        Args:
+            workers (int): Number of threads, None to use every core
+        """
+        self.__workers = max(1, workers if workers is not None else (os.cpu_count() or 1))
+        self.__pool = None
+
+    def get_workers(self) -> int:
+        """
+        Get the number of threads of the executor.
+
+        Returns:
+            int: The number of threads
+        """
+        return self.__workers
+
+    def split(self, height : int, rows : int = 1) -> list:
+        """
+        Split the rows of an image into at most one tile per worker.
+
+        Args:
+            height (int): The number of rows of the image
+            rows (int): Tiles start on multiples of this number of rows
+
+        Returns:
+            list: The (start, stop) rows of every tile, in order
+        """
+        blocks = -(-height // max(1, rows))
+        blocks_per_tile = -(-blocks // self.__workers)
+        step = blocks_per_tile * max(1, rows)
+        return [(start, min(start + step, height)) for start in range(0, height, step)]
+
+    def run(self, function : callable, tiles : list) -> list:
+        """
+        Call a function on every tile, concurrently when there are several tiles. When a tile
+        raises, the other tiles are still waited for, so none of them writes into the output
+        once the exception is propagated.
+
+        Args:
+            function (callable): Function taking the start and stop rows of a tile
+            tiles (list): The (start, stop) rows of the tiles
+
+        Returns:
+            list: The results of the function, in the order of the tiles
+        """
+        if len(tiles) <= 1 or self.__workers == 1:
+            return [function(start, stop) for start, stop in tiles]
+        if self.__pool is None:
+            self.__pool = ThreadPoolExecutor(max_workers=self.__workers)
+        futures = [self.__pool.submit(function, start, stop) for start, stop in tiles]
+        wait(futures)
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        """
+        Stop the threads, they are started again by the next tiled run.
+        """
+        if self.__pool is not None:
+            self.__pool.shutdown()
+            self.__pool = None
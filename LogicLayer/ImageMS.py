@@ -1,6 +1,10 @@
 from PIL import Image
+import numpy as np
 
 from LogicLayer.Band import Band
+from LogicLayer.LazyBand import LazyBand
+from LogicLayer.BandStatistics import BandStatistics
+from LogicLayer.ImagePyramid import ImagePyramid
 from Exceptions.NotExistingBandException import NotExistingBandException
 from Exceptions.ErrorMessages import ErrorMessages
 
@@ -11,7 +15,7 @@ class ImageMS (Image.Image) :
     Author : Lakhdar Gibril
     """
 
-    def __init__(self, name : str, start_wavelength : int, end_wavelength : int, size : tuple, bands : list) : 
+    def __init__(self, name : str, start_wavelength : int, end_wavelength : int, size : tuple, bands : list, cube : np.ndarray = None, scale : float = 1.0, lazy : bool = False) : 
         """
         Natural constructor of the class ImageMS
         args: 
@@ -20,6 +24,10 @@ class ImageMS (Image.Image) :
             - end_wavelength: an integer which represents the end wavelength of the multispectral image
             - size: a tuple with the height and width of the image
             - bands: represent the list of bands in the image
+            - cube: the (bands, height, width) array the bands are views of. When it is not given,
+              the bands are gathered into a new cube and replaced by views of it
+            - scale: factor converting the values of the cube to shades of grey between 0 and 255
+            - lazy: True when the bands decode their pixels on demand, the image then has no cube
 
         Author : Lakhdar Gibril
         """
@@ -27,9 +35,19 @@ class ImageMS (Image.Image) :
         self.__path = name 
         self.__start_wavelength = start_wavelength
         self.__end_wavelength = end_wavelength
+        if cube is None and not lazy:
+            cube = np.stack([band.get_shade_of_grey() for band in bands])
+            bands = [Band(band.get_number(), cube[index], band.get_wavelength(), scale) for index, band in enumerate(bands)]
+        self.__cube = None
+        if cube is not None:
+            self.__cube = cube.view()
+            self.__cube.flags.writeable = False
+        self.__scale = scale
         self.__bands = bands
         self.__size = size
         self.__current = self.__bands[0]  # Represent the current band
+        self.__statistics = {}  # Statistics of the bands by number, computed on first use
+        self.__pyramid = None  # Downsampled levels of the image, built on first use
 
     def get_name(self) -> str : 
         """
@@ -90,6 +108,63 @@ class ImageMS (Image.Image) :
         """
         return self.__bands
     
+    def get_cube(self) -> np.ndarray :
+        """
+        Getter which allow to get the pixels of every band as a single contiguous array
+        @return : a read-only (bands, height, width) array shared with the Band objects,
+                  None when the bands are decoded on demand
+
+        Author : Lakhdar Gibril
+        """
+        return self.__cube
+
+    def has_cube(self) -> bool :
+        """
+        Method which allow to know if the pixels of every band are held in memory as a single array
+        @return : False when the bands are decoded on demand
+        """
+        return self.__cube is not None
+
+    def get_scale(self) -> float :
+        """
+        Getter which allow to get the factor converting the values of the cube to shades of grey
+        @return : the scale as a float
+        """
+        return self.__scale
+
+    def get_band_statistics(self, band : Band) -> BandStatistics :
+        """
+        Getter which allow to get the statistics of a band of the image, computed on the first call
+        and then kept, so that display stretching and normalizations do not scan the band again
+        args:
+            - band: a band of the image
+        @return : the statistics of the shades of grey of the band
+        """
+        statistics = self.__statistics.get(band.get_number())
+        if statistics is None:
+            statistics = BandStatistics(band.get_shade_of_grey())
+            self.__statistics[band.get_number()] = statistics
+        return statistics
+
+    def get_pyramid(self) -> ImagePyramid :
+        """
+        Getter which allow to get the downsampled levels of the image, used to display it
+        @return : the pyramid of the image, the bands of its levels are built on first use
+        """
+        if self.__pyramid is None:
+            self.__pyramid = ImagePyramid(self)
+        return self.__pyramid
+
+    def close(self) -> None :
+        """
+        Method which allow releasing the resources of an image which is not used anymore:
+        the file handles of the bands decoded on demand and the downsampled levels
+        """
+        for band in self.__bands:
+            if isinstance(band, LazyBand):
+                band.close()
+        self.__pyramid = None
+
     def get_number_bands(self) -> int: 
         """
         Getter which allow to get the number of bands of the image 
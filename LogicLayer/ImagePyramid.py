@@ -0,0 +1,174 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from LogicLayer.LazyBand import LazyBand
+from ResourceManager import ResourceManager
+
+class ImagePyramid:
+    """
+    Class ImagePyramid which represents the downsampled levels of a multispectral image.
+    Level 0 is the image itself, level n averages blocks of 2^n x 2^n pixels of the image.
+    The bands of a level are built from the image one at a time, the first time they are read,
+    in the type of the image, and kept within a memory budget shared by the levels, so that
+    displaying a band costs memory proportional to the screen instead of the sensor.
+    """
+
+    def __init__(self, image_ms, budget_bytes : int = ResourceManager.PYRAMID_CACHE_BYTES) :
+        """
+        Natural constructor of the class ImagePyramid
+        args:
+            - image_ms: the multispectral image at full resolution, as an ImageMS object
+            - budget_bytes: the memory the built bands may use, the least recently used are released first
+        """
+        self.__image_ms = image_ms
+        self.__levels = {0: image_ms}
+        self.__budget_bytes = budget_bytes
+        self.__bands = OrderedDict()  # Built bands, by (level, index of the band in the image)
+        # Levels may be requested by the display and by a simulation running in the background
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def area_average(array : np.ndarray, factor : int, axes : tuple = (0, 1)) -> np.ndarray :
+        """
+        Method which allow downsampling an array by averaging blocks of factor x factor pixels.
+        The blocks on the bottom and right edges are averaged over the pixels they contain
+        args:
+            - array: the array to downsample
+            - factor: the size of the blocks, in pixels
+            - axes: the row and column axes of the array
+        @return : the downsampled array, in double precision for a double precision array and else in simple precision
+        """
+        if factor <= 1:
+            return array
+        dtype = np.float64 if array.dtype == np.float64 else np.float32
+        result = array
+        for axis in axes:
+            length = result.shape[axis]
+            index = [slice(None)] * result.ndim
+            # Sums of the blocks along the axis, one strided slice per offset in the block
+            index[axis] = slice(0, None, factor)
+            total = np.array(result[tuple(index)], dtype=dtype)
+            for offset in range(1, min(factor, length)):
+                index[axis] = slice(offset, None, factor)
+                part = result[tuple(index)]
+                target = [slice(None)] * result.ndim
+                target[axis] = slice(0, part.shape[axis])
+                np.add(total[tuple(target)], part, out=total[tuple(target)])
+            # Divided by the number of pixels of each block, fewer on the edge
+            starts = np.arange(0, length, factor)
+            counts = np.minimum(starts + factor, length) - starts
+            shape = [1] * total.ndim
+            shape[axis] = len(starts)
+            total /= counts.reshape(shape).astype(dtype)
+            result = total
+        return result
+
+    def get_level(self, level : int) :
+        """
+        Getter which allow getting a level of the pyramid, its bands are built when they are first read
+        args:
+            - level: the index of the level, 0 for the image itself
+        @return : the ImageMS of the level, with the bands and the wavelengths of the image
+        """
+        from LogicLayer.ImageMS import ImageMS
+
+        with self.__lock:
+            image_ms = self.__levels.get(level)
+            if image_ms is None:
+                factor = ImagePyramid.get_factor(level)
+                width, height = self.__image_ms.get_size()
+                bands = [LazyBand(band.get_number(), band.get_wavelength(),
+                                  lambda index, level=level: self.__read_band(level, index), band.get_scale(), index)
+                         for index, band in enumerate(self.__image_ms.get_bands())]
+                image_ms = ImageMS(self.__image_ms.get_path(), self.__image_ms.get_start_wavelength(),
+                                   self.__image_ms.get_end_wavelength(), (-(-width // factor), -(-height // factor)),
+                                   bands, None, self.__image_ms.get_scale(), True)
+                self.__levels[level] = image_ms
+            return image_ms
+
+    def get_level_for_size(self, size : tuple) :
+        """
+        Getter which allow getting the smallest level which still covers a display area
+        args:
+            - size: the (width, height) of the display area
+        @return : the ImageMS of the level
+        """
+        level = ImagePyramid.get_level_index(self.__levels[0].get_size(), size)
+        return self.get_level(level)
+
+    @staticmethod
+    def get_level_index(image_size : tuple, size : tuple) -> int :
+        """
+        Method which allow choosing the level matching a display area: the last level whose width
+        or height is still at least the one of the area, so that the display is never upscaled
+        args:
+            - image_size: the (width, height) of the image
+            - size: the (width, height) of the display area
+        @return : the index of the level
+        """
+        width, height = image_size
+        level = 0
+        while width > 1 or height > 1:
+            width, height = -(-width // 2), -(-height // 2)
+            if width < size[0] and height < size[1]:
+                break
+            level += 1
+        return level
+
+    @staticmethod
+    def get_factor(level : int) -> int :
+        """
+        Method which allow getting the downsampling factor of a level
+        args:
+            - level: the index of the level
+        @return : the width of the image divided by the width of the level, rounded up
+        """
+        return 2 ** level
+
+    def get_nbytes(self) -> int :
+        """
+        Getter which allow getting the memory used by the built bands of the levels
+        @return : the number of bytes
+        """
+        with self.__lock:
+            return sum(pixels.nbytes for pixels in self.__bands.values())
+
+    def get_built_bands(self) -> list :
+        """
+        Getter which allow getting the bands built so far, from the least to the most recently used
+        @return : the list of (level, index of the band in the image) pairs
+        """
+        with self.__lock:
+            return list(self.__bands.keys())
+
+    def __read_band(self, level : int, index : int) -> np.ndarray :
+        """
+        Method which allow getting a band of a level, averaging the band of the image if it is not built
+        args:
+            - level: the index of the level
+            - index: the index of the band in the image
+        @return : the read-only pixels of the band of the level, in the type of the band of the image
+        """
+        key = (level, index)
+        with self.__lock:
+            pixels = self.__bands.get(key)
+            if pixels is not None:
+                self.__bands.move_to_end(key)
+                return pixels
+
+        source = self.__image_ms.get_bands()[index].get_raw_shade_of_grey()
+        pixels = ImagePyramid.area_average(source, ImagePyramid.get_factor(level))
+        if np.issubdtype(source.dtype, np.integer):
+            pixels = np.rint(pixels)
+        pixels = pixels.astype(source.dtype, copy=False)
+        pixels.flags.writeable = False
+
+        with self.__lock:
+            self.__bands[key] = pixels
+            self.__bands.move_to_end(key)
+            # The band being read is always kept
+            while len(self.__bands) > 1 and sum(band.nbytes for band in self.__bands.values()) > self.__budget_bytes:
+                self.__bands.popitem(last=False)
+        return pixels
@@ -0,0 +1,37 @@
+import numpy as np
+
+from LogicLayer.Band import Band
+
+class LazyBand(Band):
+    """
+    Class LazyBand which represents a band whose pixels are only decoded the first time they are needed
+    """
+
+    def __init__(self, number : int, wave_length : tuple, reader : callable, scale : float = 1.0, frame : int = None) :
+        """
+        Natural constructor of the class LazyBand
+        args:
+            - number: the number of the band in its image
+            - wave_length: represents the wave_length of the band as a tuple of int
+            - reader: function returning the decoded pixels of a frame from its number
+            - scale: factor converting the decoded values to shades of grey between 0 and 255
+            - frame: the frame holding the pixels of the band, None if it is the number of the band
+        """
+        super().__init__(number, None, wave_length, scale)
+        self.__reader = reader
+        self.__frame = number if frame is None else frame
+
+    def get_raw_shade_of_grey(self) -> np.ndarray :
+        """
+        Getter which allow getting the values of the band as stored, decoding them if needed
+        @return : the decoded values as a read-only array
+        """
+        return self.__reader(self.__frame)
+
+    def close(self) -> None :
+        """
+        Method which allow releasing the file handle and the decoded frames of the reader, if it holds any
+        """
+        close = getattr(self.__reader, "close", None)
+        if close is not None:
+            close()
@@ -9,6 +9,26 @@ class ResourceManager :
     MAX_COLOR_BITS : int = 255
     WAVELENGTH_LABEL : str = "Center wavelengths:"
     TABULATION_SYMBOL : chr = '\t\t'
+
+    # Image loading modes
+    LOAD_DECODE : str = "decode" # Every frame is decoded into memory
+    LOAD_MEMORY_MAP : str = "memory_map" # Uncompressed frames are mapped from the file
+    LOAD_LAZY : str = "lazy" # Frames are decoded the first time a band is accessed
+    DEFAULT_LOAD_MODE : str = LOAD_MEMORY_MAP
+    LAZY_FRAME_CACHE_SIZE : int = 8 # Number of decoded frames kept in memory in lazy mode
+    DEFAULT_LOAD_WORKERS : int = 4 # Number of threads decoding frames at load time
+    SIDECAR_EXTENSION : str = ".sfccube" # Binary copy of a loaded cube, reopened without decoding
+    USE_CUBE_CACHE : bool = True # Reopen images whose frames had to be decoded from a sidecar written in the background
+    SIMULATION_WORKERS : int = None # Threads running the tiles of a simulation, None to use every core
+    PIPELINE_CACHE_BYTES : int = 512 * 1024 * 1024 # Memory of the cached band responses of the loaded image
+    PYRAMID_CACHE_BYTES : int = 256 * 1024 * 1024 # Memory of the downsampled bands displayed or previewed
+    RESULT_CACHE_BYTES : int = 256 * 1024 * 1024 # Memory of the cached simulated images and their pixmaps
+    DISPLAY_CLIP_PERCENT : float = 0.0 # Percent of the darkest and of the brightest pixels saturated when displaying a band
+    PREVIEW_SIMULATION : bool = True # Simulate the pyramid level matching the display, the full resolution only on save
+    PROGRESSIVE_REFINEMENT : bool = True # Display a coarse preview, then refine it up to the full resolution
+    REFINEMENT_COARSE_DIVISOR : int = 4 # Size of the display divided by the size of the coarse preview
+    PREFETCH_COLOR_BLINDNESS : bool = True # Project the deficiency types with the human responses in one pass, as many as fit in PIPELINE_CACHE_BYTES
+    DALTONIAN_TRANSFORM_MODE : str = "spectral" # "spectral" projects each deficiency type, "lms" applies a 3x3 matrix to the human responses
     
     # Simulations Types 
     RGB_BANDS : str = "RGB Bands"
@@ -23,6 +43,8 @@ class ResourceManager :
     IUT_LOGO = f"{ASSETS_PATH}Logo-iut-dijon-auxerre-nevers.png"
     IMVIA_LOGO = f"{ASSETS_PATH}Logo-laboratoire-ImViA.png"
     APP_LOGO = f"{ASSETS_PATH}Logo-SimulFCImage.ico"
+    CONE_FUNDAMENTALS_PATH : str = "LogicLayer/Factory/Simulating/data/linss2_10e_fine.csv"
+    SPECTRAL_TABLE_EXTENSION : str = ".npy" # Binary copy of a response dataset, loaded without parsing the CSV
 
     # Display parameters
     WINDOW_TITLE : str = "SimulFCImage"
@@ -44,6 +66,7 @@ class ResourceManager :
 
     # Default directories
     DEFAULT_IMAGE_DIRECTORY = "Data/Images"  # Ajout du répertoire par défaut pour les images
+    CUBE_CACHE_DIRECTORY = "Data/Cache" # Sidecars of the loaded images
 
     # Daltonian Types
     DEUTERANOPIA = "Deuteranopia"
@@ -52,4 +75,6 @@ class ResourceManager :
     PROTANOMALY = "Protanomaly"
     TRITANOPIA = "Tritanopia"
     TRITANOMALY = "Tritanomaly"
-    ACHROMATOPSIA = "Achromatopsia"
\ No newline at end of file
+    ACHROMATOPSIA = "Achromatopsia"
+    DALTONIAN_TYPES : tuple = (DEUTERANOPIA, PROTANOPIA, DEUTERANOMALY, PROTANOMALY,
+                               TRITANOPIA, TRITANOMALY, ACHROMATOPSIA)
\ No newline at end of file
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+
+import numpy as np
+
+from Storage.ImageManager import ImageManager
+from LogicLayer.ImageMS import ImageMS
+from ResourceManager import ResourceManager
+
+class CubeCache:
+    """
+    Class CubeCache which writes the band cube of a loaded image into a binary sidecar file
+    and reopens it by memory-mapping, without decoding the TIFF or parsing the metadata again.
+
+    A sidecar starts with a magic number and the length of a JSON header holding the
+    wavelengths, shape, type and scale of the cube and the identity of its source files,
+    followed by the raw cube aligned on ALIGNMENT bytes.
+    """
+    MAGIC : bytes = b"SFCCUBE1"
+    ALIGNMENT : int = 64
+    HASH_SAMPLE_BYTES : int = 1024 * 1024
+
+    __writers : dict = {}  # Threads writing a sidecar in the background, by sidecar path
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get_sidecar_path(image_path : str, cache_dir : str = None) -> str :
+        """
+        Compute where the sidecar of an image is stored
+        args:
+            - image_path: the path of the TIFF file
+            - cache_dir: the directory of the sidecars, None to store it next to the image
+        @return : the path of the sidecar
+        """
+        if cache_dir is None:
+            return image_path + ResourceManager.SIDECAR_EXTENSION
+        # Images with the same name in different directories must not share a sidecar
+        path_digest = hashlib.sha1(os.path.abspath(image_path).encode()).hexdigest()[:12]
+        file_name = f"{os.path.basename(image_path)}.{path_digest}{ResourceManager.SIDECAR_EXTENSION}"
+        return os.path.join(cache_dir, file_name)
+
+    @staticmethod
+    def get_source_identity(file_path : str, with_hash : bool = True) -> dict :
+        """
+        Describe the current state of a source file
+        args:
+            - file_path: the path of the file
+            - with_hash: True to add a hash of the content
+        @return : dictionary with the size, modification time and content hash of the file
+        """
+        status = os.stat(file_path)
+        identity = {"size": status.st_size, "mtime_ns": status.st_mtime_ns}
+        if with_hash:
+            identity["hash"] = CubeCache.hash_content(file_path, status.st_size)
+        return identity
+
+    @staticmethod
+    def hash_content(file_path : str, size : int) -> str :
+        """
+        Hash the beginning and the end of a file, where TIFF headers and directories are usually written
+        args:
+            - file_path: the path of the file
+            - size: the size of the file in bytes
+        @return : the hexadecimal digest
+        """
+        digest = hashlib.sha1(str(size).encode())
+        with open(file_path, "rb") as source:
+            digest.update(source.read(CubeCache.HASH_SAMPLE_BYTES))
+            if size > CubeCache.HASH_SAMPLE_BYTES:
+                source.seek(max(CubeCache.HASH_SAMPLE_BYTES, size - CubeCache.HASH_SAMPLE_BYTES))
+                digest.update(source.read())
+        return digest.hexdigest()
+
+    @staticmethod
+    def write(image_ms : ImageMS, metadata_path : str, cache_dir : str = None, progress : callable = None) -> str :
+        """
+        Write the sidecar of a loaded image, band by band
+        args:
+            - image_ms: the loaded image
+            - metadata_path: the path of the metadata file the wavelengths were read from
+            - cache_dir: the directory of the sidecars, None to store it next to the image
+            - progress: called with the number of written bands and the number of bands after each band,
+              an exception it raises stops the write and leaves no sidecar
+        @return : the path of the written sidecar
+        """
+        image_path = image_ms.get_path()
+        sidecar_path = CubeCache.get_sidecar_path(image_path, cache_dir)
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        bands = image_ms.get_bands()
+        first_band = bands[0].get_raw_shade_of_grey()
+        header = {
+            "shape": [len(bands)] + list(first_band.shape),
+            "dtype": first_band.dtype.str,
+            "scale": image_ms.get_scale(),
+            "size": list(image_ms.get_size()),
+            "wavelengths": [band.get_wavelength()[0] for band in bands],
+            "source": CubeCache.get_source_identity(image_path),
+            "metadata": CubeCache.get_source_identity(metadata_path, with_hash=False),
+        }
+        header_bytes = json.dumps(header).encode()
+        prefix_length = len(CubeCache.MAGIC) + 4 + len(header_bytes)
+        padding = -prefix_length % CubeCache.ALIGNMENT
+
+        # Written under a temporary name so a reader never sees a partial sidecar
+        temporary_path = sidecar_path + ".tmp"
+        try:
+            with open(temporary_path, "wb") as sidecar:
+                sidecar.write(CubeCache.MAGIC)
+                sidecar.write(struct.pack("<I", len(header_bytes) + padding))
+                sidecar.write(header_bytes + b" " * padding)
+                for band_index, band in enumerate(bands):
+                    sidecar.write(np.ascontiguousarray(band.get_raw_shade_of_grey()).tobytes())
+                    if progress is not None:
+                        progress(band_index + 1, len(bands))
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        os.replace(temporary_path, sidecar_path)
+        return sidecar_path
+
+    @staticmethod
+    def write_in_background(image_ms : ImageMS, metadata_path : str, cache_dir : str = None) -> threading.Thread :
+        """
+        Write the sidecar of a loaded image from a background thread, so that the load returns without waiting
+        for the copy. A sidecar already being written is not written twice
+        args:
+            - image_ms: the loaded image
+            - metadata_path: the path of the metadata file the wavelengths were read from
+            - cache_dir: the directory of the sidecars, None to store it next to the image
+        @return : the thread writing the sidecar
+        """
+        sidecar_path = CubeCache.get_sidecar_path(image_ms.get_path(), cache_dir)
+
+        def write() -> None:
+            try:
+                CubeCache.write(image_ms, metadata_path, cache_dir)
+            except OSError:
+                # The sidecar only speeds up the next loads, the image is usable without it
+                pass
+
+        with CubeCache.__lock:
+            writer = CubeCache.__writers.get(sidecar_path)
+            if writer is None or not writer.is_alive():
+                # A daemon thread, quitting the application leaves at most a temporary file
+                writer = threading.Thread(target=write, daemon=True)
+                CubeCache.__writers[sidecar_path] = writer
+                writer.start()
+        return writer
+
+    @staticmethod
+    def wait_for_writes(timeout : float = None) -> None :
+        """
+        Wait for the sidecars being written in the background
+        args:
+            - timeout: the maximum time to wait for each sidecar in seconds, None to wait until they are written
+        """
+        with CubeCache.__lock:
+            writers = list(CubeCache.__writers.values())
+        for writer in writers:
+            writer.join(timeout)
+
+    @staticmethod
+    def read_header(sidecar_path : str) -> tuple :
+        """
+        Read the header of a sidecar
+        args:
+            - sidecar_path: the path of the sidecar
+        @return : the header as a dictionary and the offset of the cube in the file, or None if it is not a sidecar
+        """
+        with open(sidecar_path, "rb") as sidecar:
+            if sidecar.read(len(CubeCache.MAGIC)) != CubeCache.MAGIC:
+                return None
+            header_length = struct.unpack("<I", sidecar.read(4))[0]
+            header = json.loads(sidecar.read(header_length).decode())
+        return header, len(CubeCache.MAGIC) + 4 + header_length
+
+    @staticmethod
+    def open(image_path : str, metadata_path : str, cache_dir : str = None, progress : callable = None) -> ImageMS :
+        """
+        Open the sidecar of an image if it is still valid
+        args:
+            - image_path: the path of the TIFF file
+            - metadata_path: the path of the metadata file
+            - cache_dir: the directory of the sidecars, None if it is stored next to the image
+            - progress: called with the number of opened bands and the number of bands after each band
+        @return : the image backed by the memory-mapped sidecar, or None if there is no valid sidecar
+        """
+        sidecar_path = CubeCache.get_sidecar_path(image_path, cache_dir)
+        if not os.path.exists(sidecar_path):
+            return None
+        read = CubeCache.read_header(sidecar_path)
+        if read is None:
+            return None
+        header, offset = read
+
+        # Size and modification time are compared first, the content is only hashed if they match
+        source = CubeCache.get_source_identity(image_path, with_hash=False)
+        if source["size"] != header["source"]["size"] or source["mtime_ns"] != header["source"]["mtime_ns"]:
+            return None
+        if CubeCache.get_source_identity(metadata_path, with_hash=False) != header["metadata"]:
+            return None
+        if CubeCache.hash_content(image_path, source["size"]) != header["source"]["hash"]:
+            return None
+
+        cube = np.memmap(sidecar_path, dtype=np.dtype(header["dtype"]), mode="r",
+                         offset=offset, shape=tuple(header["shape"]))
+        wavelengths = header["wavelengths"]
+        bands = []
+        for wavelength_index, wavelength in enumerate(wavelengths):
+            band = ImageManager.create_band_instance([
+                wavelength_index + 1,
+                cube[wavelength_index],
+                (wavelength, wavelength),
+                header["scale"]
+            ])
+            bands.append(band)
+            if progress is not None:
+                progress(wavelength_index + 1, len(wavelengths))
+
+        return ImageManager.create_imagems_instance([
+            image_path,
+            wavelengths[0],
+            wavelengths[-1],
+            tuple(header["size"]),
+            bands,
+            cube,
+            header["scale"]
+        ])
@@ -1,11 +1,17 @@
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from PIL import Image 
-import pandas as pd
-from scipy.interpolate import interp1d
 
 from Storage.ImageManager import ImageManager
+from Storage.TiffLayout import TiffLayout
+from Storage.FrameReader import FrameReader
+from Storage.MetadataIndex import MetadataIndex
+from Storage.CubeCache import CubeCache
+from Storage.SpectralResponse import SpectralResponse
 from LogicLayer.ImageMS import ImageMS
-from Exceptions.MetaDataNotFoundException import MetaDataNotFoundException
 from Exceptions.ErrorMessages import ErrorMessages
 from ResourceManager import ResourceManager
 
@@ -35,26 +41,73 @@ class FileManager:
         image_to_save.save(path)
 
     @staticmethod
-    def Load(image_path: str, metadata_path: str) -> ImageMS:
+    def Load(image_path: str, metadata_path: str, load_mode: str = ResourceManager.LOAD_DECODE,
+             workers: int = ResourceManager.DEFAULT_LOAD_WORKERS, cache: bool = False,
+             cache_dir: str = None, window: tuple = None, stride: int = 1,
+             wavelength_range: tuple = None, band_numbers: list = None, progress: callable = None) -> ImageMS:
         """
         Load a multispectral image and its metadata from files.
         
         Args:
             image_path (str): Path to the image file
             metadata_path (str): Path to the metadata file
+            load_mode (str): ResourceManager.LOAD_DECODE to decode every frame,
+                             ResourceManager.LOAD_MEMORY_MAP to map uncompressed frames from the file, or
+                             ResourceManager.LOAD_LAZY to decode each frame when its band is first accessed
+            workers (int): Number of threads decoding the frames when they are decoded at load time
+            cache (bool): True to reopen the image from its sidecar when it is still valid, and otherwise
+                          to write the sidecar in the background when the frames had to be decoded
+            cache_dir (str): Directory of the sidecars, None to store them next to the images
+            window (tuple): (row_start, row_stop, col_start, col_stop) bounds of the region to load,
+                            None to load the whole image
+            stride (int): Step between the loaded rows and columns
+            wavelength_range (tuple): (min, max) wavelengths of the bands to load, None to load every band
+            band_numbers (list): Numbers of the bands to load, None to load every band
+            progress (callable): Called with the number of loaded bands and the total number of bands,
+                                 after each decoded, mapped or reopened band and once the image is loaded.
+                                 An exception it raises stops the load and is propagated. The sidecar
+                                 written in the background once the load returns does not report to it
             
         Returns:
-            ImageMS: Loaded multispectral image object
+            ImageMS: Loaded multispectral image object, its bands are numbered from 1 in the order of the file
             
         Raises:
-            ValueError: If image format is not supported
+            ValueError: If image format is not supported, the window is empty or no band is selected
             MetaDataNotFoundException: If metadata is missing or invalid
         """
         if not image_path.lower().endswith('.tif'):
             raise ValueError(ErrorMessages.UNSUPPORTED_FORMAT)
         
+        partial = window is not None or stride != 1 or wavelength_range is not None or band_numbers is not None
+        if cache:
+            image_ms = CubeCache.open(image_path, metadata_path, cache_dir, progress)
+            if image_ms is not None:
+                if partial:
+                    rows, cols, _ = FileManager.get_region(image_ms.get_size(), window, stride)
+                    wavelengths = [band.get_wavelength()[0] for band in image_ms.get_bands()]
+                    frames = FileManager.select_frames(len(wavelengths), wavelengths, wavelength_range, band_numbers)
+                    image_ms = FileManager.crop_image(image_ms, rows, cols, [frame - 1 for frame in frames])
+                if progress is not None:
+                    progress(image_ms.get_number_bands(), image_ms.get_number_bands())
+                return image_ms
+        
         metadata = FileManager.open_and_get_metadata(metadata_path, image_path)
-        image_ms = FileManager.open_and_get_image_and_bands_data(image_path, metadata)
+        if load_mode == ResourceManager.LOAD_MEMORY_MAP:
+            image_ms = FileManager.open_and_map_image_and_bands_data(image_path, metadata, workers, window, stride,
+                                                                     wavelength_range, band_numbers, progress)
+        elif load_mode == ResourceManager.LOAD_LAZY:
+            image_ms = FileManager.open_and_get_lazy_image(image_path, metadata, window=window, stride=stride,
+                                                           wavelength_range=wavelength_range, band_numbers=band_numbers)
+        else:
+            image_ms = FileManager.open_and_get_image_and_bands_data(image_path, metadata, workers, window, stride,
+                                                                     wavelength_range, band_numbers, progress)
+        
+        # A sidecar always holds the whole image, so it is only written from a full load. Mapped and lazy
+        # images already open without decoding, only decoded images are copied, in the background
+        if cache and not partial and image_ms.has_cube() and not FileManager.is_memory_mapped(image_ms.get_cube()):
+            CubeCache.write_in_background(image_ms, metadata_path, cache_dir)
+        if progress is not None:
+            progress(image_ms.get_number_bands(), image_ms.get_number_bands())
         return image_ms
 
     @staticmethod
@@ -62,6 +115,8 @@ class FileManager:
         """
         Extract wavelength metadata from the metadata file.
         
+        The file is indexed once and the index is reused while the file is unchanged.
+        
         Args:
             file_path (str): Path to the metadata file
             image_path (str): Path to the image file (used to match metadata)
@@ -72,90 +127,398 @@ class FileManager:
         Raises:
             MetaDataNotFoundException: If required metadata is not found
         """
-        wavelengths = []
-        image_name_found = False
-        wavelengths_found = False
-        
-        with open(file_path, 'r') as meta:
-            image_name = image_path.split('/')[-1]
-            for line in meta:
-                if f"{image_name}:" in line:
-                    image_name_found = True
-                    continue
-                if image_name_found and ResourceManager.WAVELENGTH_LABEL in line:
-                    wavelengths_found = True
-                    continue
-                if wavelengths_found and line.strip() and line.startswith(ResourceManager.TABULATION_SYMBOL):
-                    values = [float(val) for val in line.strip().split()]
-                    wavelengths.extend(values)
-                    
-        if not wavelengths:
-            raise MetaDataNotFoundException(ErrorMessages.METADATA_ERROR)
-        return wavelengths
+        return MetadataIndex.get(file_path).get_wavelengths(image_path)
+
+    @staticmethod
+    def open_and_get_many_metadata(file_path: str, image_paths: list) -> dict:
+        """
+        Extract the wavelength metadata of several images from the metadata file at once.
+        
+        Args:
+            file_path (str): Path to the metadata file
+            image_paths (list): Paths to the image files
+            
+        Returns:
+            dict: Dictionary mapping each image path found in the file to its list of wavelength values
+        """
+        return MetadataIndex.get(file_path).get_many_wavelengths(image_paths)
 
     @staticmethod
-    def open_and_get_image_and_bands_data(image_path: str, metadata: list) -> ImageMS:
+    def open_and_get_image_and_bands_data(image_path: str, metadata: list,
+                                          workers: int = ResourceManager.DEFAULT_LOAD_WORKERS,
+                                          window: tuple = None, stride: int = 1,
+                                          wavelength_range: tuple = None, band_numbers: list = None,
+                                          progress: callable = None) -> ImageMS:
         """
         Load image data and create band objects from a multispectral image file.
         
+        The frames are decoded into a preallocated cube which keeps their native type
+        (uint8, uint16, ...), the conversion to shades of grey is described by the scale
+        factor of the image. With several workers, each one opens its own handle on the
+        file and decodes a disjoint slice of the frames. When a window is given, only
+        the region is kept from each decoded frame. Frames outside of the band selection
+        are never decoded.
+        
         Args:
             image_path (str): Path to the image file
             metadata (list): List of wavelength values for each band
+            workers (int): Number of threads decoding the frames
+            window (tuple): (row_start, row_stop, col_start, col_stop) bounds of the region to load
+            stride (int): Step between the loaded rows and columns
+            wavelength_range (tuple): (min, max) wavelengths of the bands to load
+            band_numbers (list): Numbers of the bands to load
+            progress (callable): Called with the number of decoded bands and the total number of bands
+                                 after each band, from the decoding threads
             
         Returns:
-            ImageMS: Multispectral image object with all bands loaded
+            ImageMS: Multispectral image object with the selected bands loaded
         """
         with Image.open(image_path) as image:
-            bands = []
-            for num_band in range(1, image.n_frames):
-                image.seek(num_band)
-                band_shade = np.array(image)
-                
-                # Convert band data based on image mode
-                if image.mode == ResourceManager.SHADE_OF_GREY:
-                    band_shade = np.array(image) * ResourceManager.MAX_COLOR_BITS
-                elif image.mode == ResourceManager.IMAGE_16BIT:
-                    band_shade = np.array(image) / ResourceManager.NUMBER_TO_CONVERT_TO_8BITS
-                
-                wavelength_index = num_band - 1
-                band = ImageManager.create_band_instance([
-                    num_band,
-                    band_shade,
-                    (metadata[wavelength_index], metadata[wavelength_index])
-                ])
-                bands.append(band)
-                
-            image_ms = ImageManager.create_imagems_instance([
-                image_path,
-                metadata[0],
-                metadata[wavelength_index],
-                image.size,
-                bands
+            frames = FileManager.select_frames(image.n_frames - 1, metadata, wavelength_range, band_numbers)
+            rows, cols, size = FileManager.get_region(image.size, window, stride)
+            
+            # The first band gives the native type of the cube every band is written into
+            image.seek(frames[0])
+            first_band = np.asarray(image)[rows, cols]
+            cube = np.empty((len(frames),) + first_band.shape, dtype=first_band.dtype)
+            cube[0] = first_band
+            del first_band
+            scale = FileManager.get_scale_factor(image.mode)
+            
+        on_frame = None
+        if progress is not None:
+            # Decoded bands are counted across the threads
+            lock = threading.Lock()
+            decoded = [1]
+            def on_frame() -> None:
+                with lock:
+                    decoded[0] += 1
+                    count = decoded[0]
+                progress(count, len(frames))
+            progress(1, len(frames))
+        
+        targets = list(enumerate(frames))[1:]
+        workers = max(1, min(workers, len(targets)))
+        if workers == 1:
+            FileManager.decode_frames(image_path, targets, cube, rows, cols, on_frame)
+        else:
+            # Decoders release the GIL, so threads decode their slices concurrently
+            slices = [targets[index::workers] for index in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for result in [executor.submit(FileManager.decode_frames, image_path, targets_slice, cube, rows, cols,
+                                               on_frame)
+                               for targets_slice in slices]:
+                    result.result()
+        
+        # Every band is a view of the cube
+        bands = []
+        for index, frame in enumerate(frames):
+            band = ImageManager.create_band_instance([
+                index + 1,
+                cube[index],
+                (metadata[frame - 1], metadata[frame - 1]),
+                scale
             ])
-            return image_ms
+            bands.append(band)
+            
+        image_ms = ImageManager.create_imagems_instance([
+            image_path,
+            metadata[frames[0] - 1],
+            metadata[frames[-1] - 1],
+            size,
+            bands,
+            cube,
+            scale
+        ])
+        return image_ms
+
+    @staticmethod
+    def decode_frames(image_path: str, targets: list, cube: np.ndarray,
+                      rows: slice = slice(None), cols: slice = slice(None), on_frame: callable = None) -> None:
+        """
+        Decode some frames of an image file into a preallocated cube, with a file handle of its own.
+        
+        Args:
+            image_path (str): Path to the image file
+            targets (list): (index in the cube, index of the frame) pairs of the frames to decode
+            cube (np.ndarray): The (bands, height, width) cube to fill
+            rows (slice): Rows of each frame kept in the cube
+            cols (slice): Columns of each frame kept in the cube
+            on_frame (callable): Called without argument after each decoded frame, None to skip
+        """
+        with Image.open(image_path) as image:
+            for index, frame in targets:
+                image.seek(frame)
+                cube[index] = np.asarray(image)[rows, cols]
+                if on_frame is not None:
+                    on_frame()
 
     @staticmethod
-    def open_and_load_sensitivity_data() -> callable:
+    def open_and_map_image_and_bands_data(image_path: str, metadata: list,
+                                          workers: int = ResourceManager.DEFAULT_LOAD_WORKERS,
+                                          window: tuple = None, stride: int = 1,
+                                          wavelength_range: tuple = None, band_numbers: list = None,
+                                          progress: callable = None) -> ImageMS:
         """
-        Load and create interpolation functions for cone sensitivity data.
+        Memory-map the bands of an uncompressed multispectral image file.
         
+        The pixels are kept in the file with their native type, a frame is only read
+        when one of its pixels is accessed. Compressed, tiled or irregularly stored
+        files are decoded with open_and_get_image_and_bands_data instead. A window is
+        a strided view of the mapped strips, pixels outside of it are never read. Only
+        the selected frames are mapped, a selection whose frames are not evenly spaced
+        in the file is decoded instead.
+        
+        Args:
+            image_path (str): Path to the image file
+            metadata (list): List of wavelength values for each band
+            workers (int): Number of threads decoding the frames if the file cannot be mapped
+            window (tuple): (row_start, row_stop, col_start, col_stop) bounds of the region to load
+            stride (int): Step between the loaded rows and columns
+            wavelength_range (tuple): (min, max) wavelengths of the bands to load
+            band_numbers (list): Numbers of the bands to load
+            progress (callable): Called with the number of mapped bands and the total number of bands
+                                 after each band, or after each decoded band if the file cannot be mapped
+            
         Returns:
-            callable: Function that takes wavelength and returns (L, M, S) sensitivities
+            ImageMS: Multispectral image object backed by the file
+        """
+        with Image.open(image_path) as image:
+            frames = FileManager.select_frames(image.n_frames - 1, metadata, wavelength_range, band_numbers)
+            layout = TiffLayout.read(image, frames)
+            if layout is None or not layout.is_uniform():
+                return FileManager.open_and_get_image_and_bands_data(image_path, metadata, workers, window, stride,
+                                                                     wavelength_range, band_numbers, progress)
+            scale = FileManager.get_scale_factor(image.mode)
+            
+        rows, cols, size = FileManager.get_region(layout.get_size(), window, stride)
+        cube = layout.memory_map(image_path)[:, rows, cols]
+        bands = []
+        for index, frame in enumerate(frames):
+            band = ImageManager.create_band_instance([
+                index + 1,
+                cube[index],
+                (metadata[frame - 1], metadata[frame - 1]),
+                scale
+            ])
+            bands.append(band)
+            if progress is not None:
+                progress(index + 1, len(frames))
+            
+        return ImageManager.create_imagems_instance([
+            image_path,
+            metadata[frames[0] - 1],
+            metadata[frames[-1] - 1],
+            size,
+            bands,
+            cube,
+            scale
+        ])
+
+    @staticmethod
+    def open_and_get_lazy_image(image_path: str, metadata: list,
+                                cache_size: int = ResourceManager.LAZY_FRAME_CACHE_SIZE,
+                                window: tuple = None, stride: int = 1,
+                                wavelength_range: tuple = None, band_numbers: list = None) -> ImageMS:
         """
-        # Load sensitivity data from CSV
-        data_path = "LogicLayer/Factory/Simulating/data/linss2_10e_fine.csv"
-        data = pd.read_csv(data_path, header=None, names=['wavelength', 'L', 'M', 'S'])
+        Create a multispectral image whose bands decode their frame the first time they are accessed.
         
-        # Create interpolation functions
-        wavelengths = data['wavelength'].values
-        L_interp = interp1d(wavelengths, data['L'].values, bounds_error=False, fill_value=0)
-        M_interp = interp1d(wavelengths, data['M'].values, bounds_error=False, fill_value=0)
-        S_interp = interp1d(wavelengths, data['S'].values, bounds_error=False, fill_value=0)
+        Only the header of the file is read here. Decoded frames are kept in a bounded
+        least recently used cache shared by the bands of the image.
         
-        def get_sensitivities(wavelength: float) -> tuple:
-            """Return interpolated cone sensitivities for a given wavelength"""
-            return (float(L_interp(wavelength)),
-                   float(M_interp(wavelength)),
-                   float(S_interp(wavelength)))
+        Args:
+            image_path (str): Path to the image file
+            metadata (list): List of wavelength values for each band
+            cache_size (int): Maximum number of decoded frames kept in memory
+            window (tuple): (row_start, row_stop, col_start, col_stop) bounds of the region kept from each frame
+            stride (int): Step between the kept rows and columns
+            wavelength_range (tuple): (min, max) wavelengths of the bands to create
+            band_numbers (list): Numbers of the bands to create
+            
+        Returns:
+            ImageMS: Multispectral image object without cube
+        """
+        with Image.open(image_path) as image:
+            frames = FileManager.select_frames(image.n_frames - 1, metadata, wavelength_range, band_numbers)
+            # The first frame of the file is not a band, the mode and size are those of the first band
+            image.seek(frames[0])
+            rows, cols, size = FileManager.get_region(image.size, window, stride)
+            scale = FileManager.get_scale_factor(image.mode)
+            
+        reader = FrameReader(image_path, cache_size, (rows, cols))
+        bands = []
+        for index, frame in enumerate(frames):
+            band = ImageManager.create_lazy_band_instance([
+                index + 1,
+                (metadata[frame - 1], metadata[frame - 1]),
+                reader,
+                scale,
+                frame
+            ])
+            bands.append(band)
+            
+        return ImageManager.create_imagems_instance([
+            image_path,
+            metadata[frames[0] - 1],
+            metadata[frames[-1] - 1],
+            size,
+            bands,
+            None,
+            scale,
+            True
+        ])
+
+    @staticmethod
+    def is_memory_mapped(array: np.ndarray) -> bool:
+        """
+        Check if an array is a view of a memory-mapped file rather than of decoded pixels.
+        
+        Args:
+            array (np.ndarray): The array
+            
+        Returns:
+            bool: True if the array is backed by a file
+        """
+        while array is not None:
+            if isinstance(array, (np.memmap, mmap.mmap)):
+                return True
+            array = getattr(array, "base", None)
+        return False
+
+    @staticmethod
+    def get_region(size: tuple, window: tuple = None, stride: int = 1) -> tuple:
+        """
+        Compute the rows and columns of a window of an image.
+        
+        Args:
+            size (tuple): The (width, height) of the image
+            window (tuple): (row_start, row_stop, col_start, col_stop) bounds of the region,
+                            None for the whole image. Bounds outside of the image are clipped to it
+            stride (int): Step between the rows and columns of the region
+            
+        Returns:
+            tuple: The rows slice, the columns slice and the (width, height) of the region
+            
+        Raises:
+            ValueError: If the stride is not positive or the region is empty
+        """
+        width, height = size
+        if window is None:
+            window = (0, height, 0, width)
+        # Negative bounds are clipped to the first row or column, not counted from the end of the image
+        row_start, row_stop, col_start, col_stop = (max(0, bound) for bound in window)
+        if not isinstance(stride, int) or stride < 1:
+            raise ValueError(ErrorMessages.INVALID_WINDOW)
+        
+        # Slicing ranges clips the bounds past the image to it
+        rows = range(height)[row_start:row_stop:stride]
+        cols = range(width)[col_start:col_stop:stride]
+        if len(rows) == 0 or len(cols) == 0:
+            raise ValueError(ErrorMessages.INVALID_WINDOW)
+        return slice(rows.start, rows.stop, stride), slice(cols.start, cols.stop, stride), (len(cols), len(rows))
+
+    @staticmethod
+    def select_frames(n_bands: int, metadata: list, wavelength_range: tuple = None,
+                      band_numbers: list = None) -> list:
+        """
+        Compute the frames holding the selected bands of an image.
         
-        return get_sensitivities
\ No newline at end of file
+        Band n of the file is stored in frame n. When both a wavelength range and band
+        numbers are given, only the bands matching both are selected.
+        
+        Args:
+            n_bands (int): Number of bands in the file
+            metadata (list): List of wavelength values for each band
+            wavelength_range (tuple): (min, max) wavelengths of the selected bands, bounds included
+            band_numbers (list): Numbers of the selected bands
+            
+        Returns:
+            list: The frames of the selected bands, in the order of the file
+            
+        Raises:
+            ValueError: If a band number is out of range or no band is selected
+        """
+        frames = range(1, min(n_bands, len(metadata)) + 1)
+        if band_numbers is not None:
+            if any(not 1 <= number <= len(frames) for number in band_numbers):
+                raise ValueError(ErrorMessages.INVALID_BAND_SELECTION)
+            frames = sorted(set(band_numbers))
+        if wavelength_range is not None:
+            low, high = wavelength_range
+            frames = [frame for frame in frames if low <= metadata[frame - 1] <= high]
+        if len(frames) == 0:
+            raise ValueError(ErrorMessages.INVALID_BAND_SELECTION)
+        return list(frames)
+
+    @staticmethod
+    def crop_image(image_ms: ImageMS, rows: slice, cols: slice, band_indexes: list = None) -> ImageMS:
+        """
+        Create an image holding a region and some bands of an image whose bands are in a cube.
+        
+        Pixels are not copied unless the kept bands are unevenly spaced in the cube.
+        
+        Args:
+            image_ms (ImageMS): The image with a cube
+            rows (slice): Rows of the region
+            cols (slice): Columns of the region
+            band_indexes (list): Indexes of the kept bands in the cube, None to keep every band
+            
+        Returns:
+            ImageMS: The image of the region, its bands are numbered from 1
+        """
+        all_bands = image_ms.get_bands()
+        if band_indexes is None:
+            band_indexes = range(len(all_bands))
+        # Evenly spaced bands are kept as a view of the cube
+        steps = set(np.diff(band_indexes).tolist())
+        if len(steps) <= 1:
+            step = steps.pop() if steps else 1
+            selection = slice(band_indexes[0], band_indexes[-1] + 1, step)
+        else:
+            selection = list(band_indexes)
+        cube = image_ms.get_cube()[selection, rows, cols]
+        bands = []
+        for index, band_index in enumerate(band_indexes):
+            bands.append(ImageManager.create_band_instance([
+                index + 1,
+                cube[index],
+                all_bands[band_index].get_wavelength(),
+                image_ms.get_scale()
+            ]))
+        return ImageManager.create_imagems_instance([
+            image_ms.get_path(),
+            bands[0].get_wavelength()[0],
+            bands[-1].get_wavelength()[0],
+            (cube.shape[2], cube.shape[1]),
+            bands,
+            cube,
+            image_ms.get_scale()
+        ])
+
+    @staticmethod
+    def get_scale_factor(mode: str) -> float:
+        """
+        Get the factor converting the values of a frame to shades of grey between 0 and 255.
+        
+        Args:
+            mode (str): The PIL mode of the frame
+            
+        Returns:
+            float: The scale factor
+        """
+        if mode == ResourceManager.SHADE_OF_GREY:
+            return ResourceManager.MAX_COLOR_BITS
+        if mode == ResourceManager.IMAGE_16BIT:
+            return 1 / ResourceManager.NUMBER_TO_CONVERT_TO_8BITS
+        return 1.0
+
+    @staticmethod
+    def open_and_load_sensitivity_data() -> SpectralResponse:
+        """
+        Load the cone sensitivity data, the file is only read once per process.
+        
+        Returns:
+            SpectralResponse: Callable that takes a wavelength and returns (L, M, S) sensitivities,
+                              its evaluate method takes a vector of wavelengths
+        """
+        return SpectralResponse.get(ResourceManager.CONE_FUNDAMENTALS_PATH)
\ No newline at end of file
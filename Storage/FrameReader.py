@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+class FrameReader:
+    """
+    Class FrameReader which decodes the frames of a multi-page TIFF on demand
+    and keeps the most recently used ones in a bounded cache.
+    """
+
+    def __init__(self, image_path : str, cache_size : int, region : tuple = None) :
+        """
+        Natural constructor of the class FrameReader
+        args:
+            - image_path: the path of the TIFF file
+            - cache_size: the maximum number of decoded frames kept in memory
+            - region: the (rows, columns) slices kept from each frame, None to keep whole frames
+        """
+        self.__image_path = image_path
+        self.__region = region
+        self.__cache_size = max(1, cache_size)
+        self.__cache = OrderedDict()
+        self.__image = None
+        self.__lock = threading.Lock()
+
+    def read(self, frame : int) -> np.ndarray :
+        """
+        Get the decoded pixels of a frame, decoding it if it is not in the cache
+        args:
+            - frame: the index of the frame in the file
+        @return : the pixels of the frame with their native type, as a read-only array
+        """
+        with self.__lock:
+            if frame in self.__cache:
+                self.__cache.move_to_end(frame)
+                return self.__cache[frame]
+
+            if self.__image is None:
+                self.__image = Image.open(self.__image_path)
+            self.__image.seek(frame)
+            pixels = np.array(self.__image)
+            if self.__region is not None:
+                # Only the region is kept in the cache, the whole frame is released
+                pixels = pixels[self.__region].copy()
+            pixels.flags.writeable = False
+
+            self.__cache[frame] = pixels
+            if len(self.__cache) > self.__cache_size:
+                self.__cache.popitem(last=False)
+            return pixels
+
+    def __call__(self, frame : int) -> np.ndarray :
+        """
+        Allow the reader to be given as the frame source of lazy bands
+        """
+        return self.read(frame)
+
+    def get_cached_frames(self) -> list :
+        """
+        Getter which allow to get the frames currently decoded, from the least to the most recently used
+        """
+        with self.__lock:
+            return list(self.__cache.keys())
+
+    def is_open(self) -> bool :
+        """
+        Method which allow to know if the file handle is open, it is opened by the first decoded frame
+        """
+        with self.__lock:
+            return self.__image is not None
+
+    def close(self) -> None :
+        """
+        Release the file handle and the decoded frames, a next read opens the file again
+        """
+        with self.__lock:
+            if self.__image is not None:
+                self.__image.close()
+                self.__image = None
+            self.__cache.clear()
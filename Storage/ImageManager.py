@@ -1,4 +1,5 @@
 from LogicLayer.Band import Band
+from LogicLayer.LazyBand import LazyBand
 from LogicLayer.ImageMS import ImageMS
 
 class ImageManager : 
@@ -23,9 +24,20 @@ class ImageManager :
             - data: list of mixed data for the Band attributes.
         Author : Lakhdar Gibril
         """
-        band = Band(data[0], data[1], data[2])
+        scale = data[3] if len(data) > 3 else 1.0
+        band = Band(data[0], data[1], data[2], scale)
         return band  
 
+    @staticmethod
+    def create_lazy_band_instance(data: list) -> LazyBand: 
+        """
+        Method which allows creating a LazyBand class instance whose pixels are decoded on demand
+        Parameters : 
+            - data: list of the band number, wavelength, frame reader, scale and optionally the frame of the band
+        """
+        frame = data[4] if len(data) > 4 else None
+        return LazyBand(data[0], data[1], data[2], data[3], frame)
+
     @staticmethod
     def create_imagems_instance(data : list) -> ImageMS : 
         """
@@ -34,5 +46,8 @@ class ImageManager :
             - data : list of mixed data for the ImageMS class attributes.
         Author : Lakhdar Gibril
         """
-        image = ImageMS(data[0],data[1],data[2],data[3],data[4])
+        cube = data[5] if len(data) > 5 else None
+        scale = data[6] if len(data) > 6 else 1.0
+        lazy = data[7] if len(data) > 7 else False
+        image = ImageMS(data[0],data[1],data[2],data[3],data[4],cube,scale,lazy)
         return image 
\ No newline at end of file
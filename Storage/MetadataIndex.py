@@ -0,0 +1,112 @@
+import os
+import re
+import threading
+
+from Exceptions.MetaDataNotFoundException import MetaDataNotFoundException
+from Exceptions.ErrorMessages import ErrorMessages
+from ResourceManager import ResourceManager
+
+class MetadataIndex:
+    """
+    Class MetadataIndex which holds the wavelengths of every image described in a metadata file.
+
+    The file is parsed in a single pass and the index is cached by path and modification
+    time, so later loads from the same metadata file are dictionary lookups.
+    """
+    # A section starts with a line which is not indented and ends with the image file name and a colon
+    IMAGE_SECTION_PATTERN = re.compile(r"^(?=\S)(?:.*[/\\])?([^/\\]+?):\s*$")
+
+    __indexes : dict = {}
+    __lock = threading.Lock()
+
+    def __init__(self, sections : dict) :
+        """
+        Natural constructor of the class MetadataIndex
+        args:
+            - sections: dictionary mapping an image name to its list of wavelengths
+        """
+        self.__sections = sections
+
+    @staticmethod
+    def get(file_path : str) -> "MetadataIndex" :
+        """
+        Get the index of a metadata file, parsing it only if it changed since the last call
+        args:
+            - file_path: the path of the metadata file
+        @return : the index of the file
+        """
+        status = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        version = (status.st_mtime_ns, status.st_size)
+        with MetadataIndex.__lock:
+            cached = MetadataIndex.__indexes.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+        index = MetadataIndex.parse(file_path)
+        with MetadataIndex.__lock:
+            MetadataIndex.__indexes[key] = (version, index)
+        return index
+
+    @staticmethod
+    def parse(file_path : str) -> "MetadataIndex" :
+        """
+        Read every image section of a metadata file in one pass
+        args:
+            - file_path: the path of the metadata file
+        @return : the index of the file
+        """
+        sections = {}
+        wavelengths = None
+        reading_wavelengths = False
+        with open(file_path, 'r') as meta:
+            for line in meta:
+                if not line.strip():
+                    continue
+                if ResourceManager.WAVELENGTH_LABEL in line:
+                    reading_wavelengths = wavelengths is not None
+                    continue
+                section = MetadataIndex.IMAGE_SECTION_PATTERN.match(line)
+                if section:
+                    wavelengths = sections.setdefault(section.group(1), [])
+                    reading_wavelengths = False
+                elif reading_wavelengths and line.startswith(ResourceManager.TABULATION_SYMBOL):
+                    wavelengths.extend(float(value) for value in line.strip().split())
+                else:
+                    # Only the values directly following the wavelength label of a section are kept
+                    reading_wavelengths = False
+        return MetadataIndex(sections)
+
+    def get_wavelengths(self, image_name : str) -> list :
+        """
+        Get the wavelengths of an image
+        args:
+            - image_name: the name of the image file, with or without its path
+        @return : the list of wavelengths
+        raises:
+            - MetaDataNotFoundException: if the image has no wavelengths in the file
+        """
+        wavelengths = self.__sections.get(image_name.split('/')[-1])
+        if not wavelengths:
+            raise MetaDataNotFoundException(ErrorMessages.METADATA_ERROR)
+        return list(wavelengths)
+
+    def get_many_wavelengths(self, image_names : list) -> dict :
+        """
+        Get the wavelengths of several images at once
+        args:
+            - image_names: the names of the image files, with or without their path
+        @return : dictionary mapping each name found in the file to its list of wavelengths
+        """
+        found = {}
+        for image_name in image_names:
+            wavelengths = self.__sections.get(image_name.split('/')[-1])
+            if wavelengths:
+                found[image_name] = list(wavelengths)
+        return found
+
+    def get_image_names(self) -> list :
+        """
+        Getter which allow to get the names of the images described in the file
+        """
+        return list(self.__sections.keys())
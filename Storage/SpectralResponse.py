@@ -0,0 +1,166 @@
+import hashlib
+import os
+import sys
+import threading
+
+import numpy as np
+
+from ResourceManager import ResourceManager
+
+class SpectralResponse:
+    """
+    Class SpectralResponse which holds a table of response curves sampled at some wavelengths
+    and interpolates them for whole vectors of wavelengths.
+
+    Each dataset file is read once per process, the loaded responses are shared
+    by every simulator using them. A binary table shipped next to a CSV dataset is
+    loaded instead of parsing it, it is only written by the build step:
+    python -m Storage.SpectralResponse [dataset.csv ...]
+    A dataset without table is parsed, and a copy of the table is kept in the cache
+    directory for the next processes, the shipped files are never written at run time.
+    """
+    __datasets : dict = {}
+    __lock : threading.Lock = threading.Lock()
+
+    def __init__(self, wavelengths : np.ndarray, responses : np.ndarray) :
+        """
+        Natural constructor of the class SpectralResponse
+        args:
+            - wavelengths: the sampled wavelengths in nanometers, in increasing order
+            - responses: the (wavelengths, curves) values of the curves, missing values are read as 0
+        """
+        self.__wavelengths = np.asarray(wavelengths, dtype=np.float64)
+        self.__responses = np.nan_to_num(np.asarray(responses, dtype=np.float64), nan=0.0)
+
+    @staticmethod
+    def get(data_path : str, cache_dir : str = ResourceManager.CUBE_CACHE_DIRECTORY) -> 'SpectralResponse' :
+        """
+        Get the responses of a dataset file, reading it only the first time it is asked for
+        args:
+            - data_path: the path of the dataset file
+            - cache_dir: the directory of the tables of the datasets shipped without one
+        @return : the shared SpectralResponse of the file
+        """
+        key = os.path.abspath(data_path)
+        with SpectralResponse.__lock:
+            response = SpectralResponse.__datasets.get(key)
+            if response is None:
+                response = SpectralResponse.read(data_path, cache_dir)
+                SpectralResponse.__datasets[key] = response
+        return response
+
+    @staticmethod
+    def get_table_path(data_path : str) -> str :
+        """
+        Compute where the binary table shipped with a dataset is stored
+        args:
+            - data_path: the path of the dataset file
+        @return : the path of the binary table
+        """
+        return os.path.splitext(data_path)[0] + ResourceManager.SPECTRAL_TABLE_EXTENSION
+
+    @staticmethod
+    def get_cached_table_path(data_path : str, cache_dir : str) -> str :
+        """
+        Compute where the table of a dataset shipped without one is kept
+        args:
+            - data_path: the path of the dataset file
+            - cache_dir: the directory of the tables
+        @return : the path of the binary table
+        """
+        # Datasets with the same name in different directories must not share a table
+        path_digest = hashlib.sha1(os.path.abspath(data_path).encode()).hexdigest()[:12]
+        name = os.path.splitext(os.path.basename(data_path))[0]
+        return os.path.join(cache_dir, f"{name}.{path_digest}{ResourceManager.SPECTRAL_TABLE_EXTENSION}")
+
+    @staticmethod
+    def parse(data_path : str) -> np.ndarray :
+        """
+        Parse a CSV dataset
+        args:
+            - data_path: the path of the dataset file
+        @return : the (wavelengths, 1 + curves) values, empty fields are read as NaN
+        """
+        return np.genfromtxt(data_path, delimiter=",", dtype=np.float64, ndmin=2)
+
+    @staticmethod
+    def build_table(data_path : str) -> str :
+        """
+        Build step writing the binary table shipped next to a dataset, to run again when the CSV changes
+        args:
+            - data_path: the path of the dataset file
+        @return : the path of the written table
+        """
+        table_path = SpectralResponse.get_table_path(data_path)
+        np.save(table_path, SpectralResponse.parse(data_path), allow_pickle=False)
+        return table_path
+
+    @staticmethod
+    def read(data_path : str, cache_dir : str = None) -> 'SpectralResponse' :
+        """
+        Read a dataset whose first column holds the wavelengths and the others the curves,
+        from the binary table shipped with it if there is one, whatever the modification times
+        args:
+            - data_path: the path of the dataset file
+            - cache_dir: the directory keeping the table of a dataset shipped without one,
+              it is used while it is at least as recent as the CSV file. None to parse the CSV every time
+        @return : the SpectralResponse of the file
+        """
+        table_path = SpectralResponse.get_table_path(data_path)
+        if os.path.exists(table_path):
+            data = np.load(table_path, allow_pickle=False)
+            return SpectralResponse(data[:, 0], data[:, 1:])
+
+        cached_path = None if cache_dir is None else SpectralResponse.get_cached_table_path(data_path, cache_dir)
+        if cached_path is not None and os.path.exists(cached_path) \
+                and os.path.getmtime(cached_path) >= os.path.getmtime(data_path):
+            data = np.load(cached_path, allow_pickle=False)
+        else:
+            data = SpectralResponse.parse(data_path)
+            if cached_path is not None:
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    np.save(cached_path, data, allow_pickle=False)
+                except OSError:
+                    # The table only speeds up the next reads, the parsed data is usable without it
+                    pass
+        return SpectralResponse(data[:, 0], data[:, 1:])
+
+    def evaluate(self, wavelengths : np.ndarray) -> np.ndarray :
+        """
+        Interpolate every curve at several wavelengths at once
+        args:
+            - wavelengths: the wavelengths in nanometers
+        @return : a (wavelengths, curves) array, 0 outside of the sampled wavelengths
+        """
+        wavelengths = np.asarray(wavelengths, dtype=np.float64)
+        values = np.empty((wavelengths.size, self.__responses.shape[1]), dtype=np.float64)
+        for curve in range(self.__responses.shape[1]):
+            values[:, curve] = np.interp(wavelengths, self.__wavelengths, self.__responses[:, curve], left=0.0, right=0.0)
+        return values
+
+    def __call__(self, wavelength : float) -> tuple :
+        """
+        Interpolate every curve at one wavelength
+        args:
+            - wavelength: the wavelength in nanometers
+        @return : the values of the curves as a tuple of float
+        """
+        return tuple(float(value) for value in self.evaluate([wavelength])[0])
+
+    def get_wavelengths(self) -> np.ndarray :
+        """
+        Getter which allow to get the sampled wavelengths
+        """
+        return self.__wavelengths
+
+    def get_responses(self) -> np.ndarray :
+        """
+        Getter which allow to get the sampled values of the curves
+        """
+        return self.__responses
+
+if __name__ == "__main__":
+    # Build step of the shipped tables, of the cone fundamentals when no dataset is given
+    for dataset_path in sys.argv[1:] or [ResourceManager.CONE_FUNDAMENTALS_PATH]:
+        print(SpectralResponse.build_table(dataset_path))
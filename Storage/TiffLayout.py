@@ -0,0 +1,136 @@
+import numpy as np
+from PIL import Image
+
+class TiffLayout:
+    """
+    Class TiffLayout which describes where the pixels of the frames of a multi-page TIFF
+    are stored in the file, so that uncompressed frames can be memory-mapped instead of decoded.
+    """
+    COMPRESSION_TAG : int = 259
+    BITS_PER_SAMPLE_TAG : int = 258
+    SAMPLES_PER_PIXEL_TAG : int = 277
+    STRIP_OFFSETS_TAG : int = 273
+    STRIP_BYTE_COUNTS_TAG : int = 279
+    SAMPLE_FORMAT_TAG : int = 339
+    TILE_WIDTH_TAG : int = 322
+    NO_COMPRESSION : int = 1
+    SAMPLE_FORMAT_KINDS : dict = {1: 'u', 2: 'i', 3: 'f'}
+
+    def __init__(self, size : tuple, dtype : np.dtype, offsets : list) :
+        """
+        Natural constructor of the class TiffLayout
+        args:
+            - size: the (width, height) of every frame
+            - dtype: the type of the pixels as stored in the file
+            - offsets: the position in the file of the first pixel of each frame
+        """
+        self.__size = size
+        self.__dtype = dtype
+        self.__offsets = offsets
+
+    @staticmethod
+    def read(image : Image.Image, frames : range) -> "TiffLayout" :
+        """
+        Read the layout of some frames of an opened TIFF from their tags, without decoding them
+        args:
+            - image: the opened TIFF image
+            - frames: the indexes of the frames to describe
+        @return : the layout, or None when a frame is compressed, tiled or not stored in one piece
+        """
+        size = None
+        dtype = None
+        offsets = []
+        for frame in frames:
+            image.seek(frame)
+            tags = image.tag_v2
+            if tags.get(TiffLayout.COMPRESSION_TAG, TiffLayout.NO_COMPRESSION) != TiffLayout.NO_COMPRESSION:
+                return None
+            if TiffLayout.TILE_WIDTH_TAG in tags or tags.get(TiffLayout.SAMPLES_PER_PIXEL_TAG, 1) != 1:
+                return None
+
+            frame_dtype = TiffLayout.__get_dtype(tags)
+            if frame_dtype is None or (dtype is not None and frame_dtype != dtype):
+                return None
+            if size is not None and image.size != size:
+                return None
+            size, dtype = image.size, frame_dtype
+
+            # The strips of the frame must follow each other to be seen as one array
+            strip_offsets = tags.get(TiffLayout.STRIP_OFFSETS_TAG)
+            strip_byte_counts = tags.get(TiffLayout.STRIP_BYTE_COUNTS_TAG)
+            if not strip_offsets or not strip_byte_counts:
+                return None
+            for index in range(1, len(strip_offsets)):
+                if strip_offsets[index] != strip_offsets[index - 1] + strip_byte_counts[index - 1]:
+                    return None
+            if sum(strip_byte_counts) < size[0] * size[1] * dtype.itemsize:
+                return None
+            offsets.append(strip_offsets[0])
+        if not offsets:
+            return None
+        return TiffLayout(size, dtype, offsets)
+
+    @staticmethod
+    def __get_dtype(tags) -> np.dtype :
+        """
+        Compute the numpy type of the pixels of a frame from its tags
+        @return : the type with the byte order of the file, or None if it is not supported
+        """
+        bits = tags.get(TiffLayout.BITS_PER_SAMPLE_TAG, (1,))
+        bits = bits[0] if isinstance(bits, tuple) else bits
+        sample_format = tags.get(TiffLayout.SAMPLE_FORMAT_TAG, (1,))
+        sample_format = sample_format[0] if isinstance(sample_format, tuple) else sample_format
+        kind = TiffLayout.SAMPLE_FORMAT_KINDS.get(sample_format)
+        if kind is None or bits not in (8, 16, 32, 64):
+            return None
+        byte_order = '>' if tags.prefix == b"MM" else '<'
+        return np.dtype(f"{byte_order}{kind}{bits // 8}")
+
+    def get_size(self) -> tuple :
+        """
+        Getter which allow to get the (width, height) of the frames
+        """
+        return self.__size
+
+    def get_dtype(self) -> np.dtype :
+        """
+        Getter which allow to get the type of the pixels as stored in the file
+        """
+        return self.__dtype
+
+    def get_number_frames(self) -> int :
+        """
+        Getter which allow to get the number of frames described by the layout
+        """
+        return len(self.__offsets)
+
+    def is_uniform(self) -> bool :
+        """
+        Check that the frames are stored at a constant distance from each other in the file
+        @return : True if the frames can be seen as a single strided array
+        """
+        if len(self.__offsets) < 2:
+            return True
+        step = self.__offsets[1] - self.__offsets[0]
+        return step > 0 and all(self.__offsets[index + 1] - self.__offsets[index] == step
+                                for index in range(len(self.__offsets) - 1))
+
+    def memory_map(self, image_path : str) -> np.ndarray :
+        """
+        Memory-map the frames of the file as a (frames, height, width) array.
+        Nothing is read until a pixel is accessed.
+        args:
+            - image_path: the path of the TIFF file the layout was read from
+        @return : a read-only array backed by the file
+        """
+        width, height = self.__size
+        frame_bytes = width * height * self.__dtype.itemsize
+        step = self.__offsets[1] - self.__offsets[0] if len(self.__offsets) > 1 else frame_bytes
+        mapped_bytes = step * (len(self.__offsets) - 1) + frame_bytes
+        mapped_file = np.memmap(image_path, dtype=np.uint8, mode='r', offset=self.__offsets[0], shape=(mapped_bytes,))
+        return np.ndarray(
+            shape=(len(self.__offsets), height, width),
+            dtype=self.__dtype,
+            buffer=mapped_file,
+            strides=(step, width * self.__dtype.itemsize, self.__dtype.itemsize)
+        )
@@ -1,8 +1,15 @@
+import os
+import sys
 import unittest
 import numpy as np
 from unittest.mock import MagicMock
-from Factory.Simulating.BandChoiceSimulating import BandChoiceSimulating
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Factory.Simulating.BandChoiceSimulating import BandChoiceSimulating
 from LogicLayer.ImageMS import ImageMS
+from LogicLayer.BandStatistics import BandStatistics
 
 class TestBandChoiceSimulating(unittest.TestCase):
     """
@@ -27,8 +34,10 @@ class TestBandChoiceSimulating(unittest.TestCase):
         # Create a list of mocked bands
         self.mock_bands = (self.mock_band_red, self.mock_band_green, self.mock_band_blue)
 
-        # Mock ImageMS object
+        # Mock ImageMS object, providing the statistics index of the bands
         self.mock_image_ms = MagicMock(spec=ImageMS)
+        self.mock_image_ms.get_band_statistics.side_effect = \
+            lambda band: BandStatistics(band.get_shade_of_grey.return_value)
 
         # Instantiate BandChoiceSimulating
         self.simulator = BandChoiceSimulating(self.mock_image_ms, self.mock_bands)
@@ -57,5 +66,42 @@ class TestBandChoiceSimulating(unittest.TestCase):
         self.mock_band_green.get_shade_of_grey.assert_called_once()
         self.mock_band_blue.get_shade_of_grey.assert_called_once()
 
+    def test_incremental(self):
+        """
+        Test the incremental mode only writes the channel whose band changed, in the previous result.
+        """
+        self.simulator.set_incremental(True)
+        first = self.simulator.simulate()
+
+        mock_band_other = MagicMock()
+        mock_band_other.get_shade_of_grey.return_value = np.array([[4, 3], [2, 1]])
+        self.simulator.set_bands((mock_band_other, self.mock_band_green, self.mock_band_blue))
+        first[:, :, 1] = -1  # Marks the channels which are not written again
+
+        result = self.simulator.simulate()
+        self.assertIs(result, first)
+        np.testing.assert_array_almost_equal(result[:, :, 0], np.array([[1, 2 / 3], [1 / 3, 0]]), decimal=5)
+        np.testing.assert_array_equal(result[:, :, 1], -1)
+
+    def test_incremental_reads_changed_bands_only(self):
+        """
+        Test the incremental mode only reads the data and the statistics of the band which changed.
+        """
+        self.simulator.set_incremental(True)
+        self.simulator.simulate()
+        for band in self.mock_bands:
+            band.get_shade_of_grey.reset_mock()
+        self.mock_image_ms.get_band_statistics.reset_mock()
+
+        mock_band_other = MagicMock()
+        mock_band_other.get_shade_of_grey.return_value = np.array([[4, 3], [2, 1]])
+        self.simulator.set_bands((self.mock_band_red, mock_band_other, self.mock_band_blue))
+        self.simulator.simulate()
+
+        self.mock_band_red.get_shade_of_grey.assert_not_called()
+        self.mock_band_blue.get_shade_of_grey.assert_not_called()
+        mock_band_other.get_shade_of_grey.assert_called_once()
+        self.mock_image_ms.get_band_statistics.assert_called_once_with(mock_band_other)
+
 if __name__ == '__main__':
     unittest.main()
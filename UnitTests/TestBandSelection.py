@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from Storage.FileManager import FileManager
+from UnitTests.TiffFixture import TiffFixture
+from ResourceManager import ResourceManager
+
+class TestBandSelection(unittest.TestCase):
+    """
+    Test suite for the band selection of FileManager.
+    """
+    def setUp(self):
+        """Write a multi-page TIFF with five bands and its metadata"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.image_path, self.metadata_path, self.frames = TiffFixture.write_image(
+            self.directory.name, "image.tif", [400.0, 550.0, 700.0, 850.0, 1000.0], (6, 8), np.uint8)
+
+    def tearDown(self):
+        """Remove the written files"""
+        self.directory.cleanup()
+
+    def test_select_frames(self):
+        """Test the frames are selected by wavelength, by number, or by both"""
+        metadata = [400.0, 550.0, 700.0, 850.0, 1000.0]
+        self.assertEqual(FileManager.select_frames(5, metadata, (400, 700)), [1, 2, 3])
+        self.assertEqual(FileManager.select_frames(5, metadata, band_numbers=[4, 2]), [2, 4])
+        self.assertEqual(FileManager.select_frames(5, metadata, (500, 900), [1, 2, 4]), [2, 4])
+
+    def test_invalid_selection(self):
+        """Test an empty selection or an unknown band number raises ValueError"""
+        with self.assertRaises(ValueError):
+            FileManager.select_frames(5, [400.0] * 5, (500, 600))
+        with self.assertRaises(ValueError):
+            FileManager.select_frames(5, [400.0] * 5, band_numbers=[6])
+
+    def test_load_wavelength_range(self):
+        """Test every load mode only keeps the bands of the wavelength range"""
+        for load_mode in (ResourceManager.LOAD_DECODE, ResourceManager.LOAD_MEMORY_MAP, ResourceManager.LOAD_LAZY):
+            image_ms = FileManager.Load(self.image_path, self.metadata_path, load_mode, wavelength_range=(400, 700))
+            self.assertEqual([band.get_number() for band in image_ms.get_bands()], [1, 2, 3])
+            self.assertEqual((image_ms.get_start_wavelength(), image_ms.get_end_wavelength()), (400.0, 700.0))
+            for band, frame in zip(image_ms.get_bands(), self.frames[1:4]):
+                np.testing.assert_array_equal(band.get_raw_shade_of_grey(), frame)
+
+if __name__ == '__main__':
+    unittest.main()
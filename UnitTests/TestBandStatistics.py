@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.BandStatistics import BandStatistics
+from LogicLayer.ImageMS import ImageMS
+
+class TestBandStatistics(unittest.TestCase):
+    """
+    Test suite for BandStatistics class functionalities.
+    """
+    def setUp(self):
+        """Set up a band with the shades of grey 0 to 99"""
+        self.shade_of_grey = np.arange(100, dtype=np.uint8).reshape(10, 10)
+        self.statistics = BandStatistics(self.shade_of_grey)
+
+    def test_moments(self):
+        """Test the extrema, mean and standard deviation of the band"""
+        self.assertEqual(self.statistics.get_min(), 0)
+        self.assertEqual(self.statistics.get_max(), 99)
+        self.assertAlmostEqual(self.statistics.get_mean(), np.mean(self.shade_of_grey))
+        self.assertAlmostEqual(self.statistics.get_std(), np.std(self.shade_of_grey))
+
+    def test_histogram(self):
+        """Test the histogram counts every pixel between the extrema"""
+        counts, edges = self.statistics.get_histogram()
+        self.assertEqual(len(counts), BandStatistics.BINS)
+        self.assertEqual(counts.sum(), 100)
+        self.assertEqual((edges[0], edges[-1]), (0, 99))
+
+    def test_percentile(self):
+        """Test the percentiles estimated from the histogram"""
+        self.assertEqual(self.statistics.get_percentile(0), 0)
+        self.assertEqual(self.statistics.get_percentile(100), 99)
+        self.assertAlmostEqual(self.statistics.get_percentile(50), np.percentile(self.shade_of_grey, 50), delta=1)
+
+    def test_index_of_image(self):
+        """Test the statistics of a band are computed once by the image"""
+        image_ms = ImageMS("test_image.tif", 500, 550, (10, 10),
+                           [Band(1, self.shade_of_grey, (500.0, 500.0)), Band(2, self.shade_of_grey * 2, (550.0, 550.0))])
+        band = image_ms.get_band_by_number(2)
+        statistics = image_ms.get_band_statistics(band)
+        self.assertIs(image_ms.get_band_statistics(band), statistics)
+        self.assertEqual(statistics.get_max(), 198)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from Storage.FileManager import FileManager
+from Storage.CubeCache import CubeCache
+from ResourceManager import ResourceManager
+from UnitTests.TiffFixture import TiffFixture
+
+class TestCubeCache(unittest.TestCase):
+    """
+    Test suite for CubeCache class functionalities.
+    """
+    def setUp(self):
+        """Write a compressed multi-page TIFF and its metadata"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.directory.name, "cache")
+        self.image_path, self.metadata_path, self.frames = TiffFixture.write_image(
+            self.directory.name, "image.tif", [450.0, 550.0, 650.0], (12, 16), compression="tiff_lzw")
+
+    def tearDown(self):
+        """Remove the written files"""
+        self.directory.cleanup()
+
+    def test_reopen_from_sidecar(self):
+        """Test a loaded image is reopened from its sidecar with the same content"""
+        self.assertIsNone(CubeCache.open(self.image_path, self.metadata_path, self.cache_dir))
+        loaded = FileManager.Load(self.image_path, self.metadata_path, cache=True, cache_dir=self.cache_dir)
+        CubeCache.wait_for_writes()
+
+        reopened = CubeCache.open(self.image_path, self.metadata_path, self.cache_dir)
+        self.assertIsNotNone(reopened)
+        np.testing.assert_array_equal(reopened.get_cube(), loaded.get_cube())
+        self.assertEqual(reopened.get_scale(), loaded.get_scale())
+        self.assertEqual(reopened.get_size(), loaded.get_size())
+        self.assertEqual([band.get_wavelength() for band in reopened.get_bands()],
+                         [band.get_wavelength() for band in loaded.get_bands()])
+
+    def test_sidecar_invalidated_by_source_change(self):
+        """Test a sidecar is ignored once the metadata file changed"""
+        FileManager.Load(self.image_path, self.metadata_path, cache=True, cache_dir=self.cache_dir)
+        CubeCache.wait_for_writes()
+        self.assertIsNotNone(CubeCache.open(self.image_path, self.metadata_path, self.cache_dir))
+        with open(self.metadata_path, "a") as meta:
+            meta.write("other.tif:\n")
+
+        self.assertIsNone(CubeCache.open(self.image_path, self.metadata_path, self.cache_dir))
+
+    def test_progress(self):
+        """Test the written and reopened bands are reported, and a stopped write leaves no sidecar"""
+        loaded = FileManager.Load(self.image_path, self.metadata_path)
+        def cancel(done, total):
+            raise RuntimeError("cancelled")
+        with self.assertRaises(RuntimeError):
+            CubeCache.write(loaded, self.metadata_path, self.cache_dir, cancel)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+        reports = []
+        CubeCache.write(loaded, self.metadata_path, self.cache_dir, lambda done, total: reports.append((done, total)))
+        self.assertEqual(reports, [(1, 3), (2, 3), (3, 3)])
+        reports.clear()
+        FileManager.Load(self.image_path, self.metadata_path, cache=True, cache_dir=self.cache_dir,
+                         progress=lambda done, total: reports.append((done, total)))
+        self.assertEqual(reports, [(1, 3), (2, 3), (3, 3), (3, 3)])
+
+    def test_sidecar_only_for_decoded_images(self):
+        """Test mapped and lazy images are not copied into a sidecar"""
+        raw_path = TiffFixture.write_tiff(os.path.join(self.directory.name, "raw.tif"), self.frames)
+        TiffFixture.write_metadata(self.metadata_path, {"raw.tif": [450.0, 550.0, 650.0]})
+
+        mapped = FileManager.Load(raw_path, self.metadata_path, ResourceManager.LOAD_MEMORY_MAP, cache=True,
+                                  cache_dir=self.cache_dir)
+        FileManager.Load(self.image_path, self.metadata_path, ResourceManager.LOAD_LAZY, cache=True,
+                         cache_dir=self.cache_dir)
+        CubeCache.wait_for_writes()
+        self.assertTrue(FileManager.is_memory_mapped(mapped.get_cube()))
+        self.assertFalse(os.path.exists(CubeCache.get_sidecar_path(raw_path, self.cache_dir)))
+        self.assertFalse(os.path.exists(CubeCache.get_sidecar_path(self.image_path, self.cache_dir)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.Factory.Simulating.DaltonianSimulating import DaltonianSimulating
+from LogicLayer.Factory.Simulating.HumanSimulating import HumanSimulating
+from ResourceManager import ResourceManager
+
+class FittedDaltonianSimulating(DaltonianSimulating):
+    """Spectral simulation of a deficiency whose sensitivities are replaced by their 3x3 fit"""
+    def __init__(self, image_ms, daltonian_type, matrix):
+        super().__init__(image_ms, daltonian_type)
+        self.cones = HumanSimulating(image_ms)
+        self.matrix = matrix
+
+    def calculate_sensitivities(self, wavelengths):
+        return self.cones.calculate_sensitivities(wavelengths) @ self.matrix
+
+class TestDaltonianTransform(unittest.TestCase):
+    """
+    Test suite for the LMS transform mode of DaltonianSimulating.
+    """
+    # Largest difference with the SPECTRAL mode on the test image, left by the least squares fit
+    FIT_ERRORS = {
+        "Deuteranopia": 0.13,
+        "Protanopia": 0.11,
+        "Deuteranomaly": 0.02,
+        "Protanomaly": 0.11,
+        "Tritanopia": 0.02,
+        "Tritanomaly": 0.06,
+        "Achromatopsia": 1e-9,
+    }
+
+    def setUp(self):
+        """Set up a random 8 bits image with five bands"""
+        rng = np.random.default_rng(0)
+        cube = rng.integers(0, 255, (5, 9, 13), dtype=np.uint8)
+        bands = [Band(i + 1, cube[i], (420.0 + 70 * i, 420.0 + 70 * i)) for i in range(5)]
+        self.image_ms = ImageMS("test_image.tif", 420, 700, (13, 9), bands, cube)
+
+    def test_lms_mode_applies_fitted_matrix(self):
+        """Test the LMS mode is the spectral simulation of the fitted sensitivities"""
+        for daltonian_type in ResourceManager.DALTONIAN_TYPES:
+            simulator = DaltonianSimulating(self.image_ms, daltonian_type, DaltonianSimulating.LMS)
+            matrix = simulator.get_deficiency_matrix()
+            self.assertEqual(matrix.shape, (3, 3))
+
+            expected = FittedDaltonianSimulating(self.image_ms, daltonian_type, matrix).simulate()
+            np.testing.assert_allclose(simulator.simulate(), expected, rtol=0, atol=1e-9)
+
+    def test_fit_error(self):
+        """Test the difference with the spectral mode stays within the error of the fit"""
+        for daltonian_type, error in self.FIT_ERRORS.items():
+            spectral = DaltonianSimulating(self.image_ms, daltonian_type).simulate()
+            result = DaltonianSimulating(self.image_ms, daltonian_type, DaltonianSimulating.LMS).simulate()
+            self.assertTrue(np.all(result >= 0) and np.all(result <= 1))
+            self.assertLessEqual(np.abs(result - spectral).max(), error, daltonian_type)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+
+class TestImageMS(unittest.TestCase):
+    """
+    Test suite for ImageMS class functionalities.
+    """
+    def setUp(self):
+        """Set up an image of three bands"""
+        self.band_data = [np.full((4, 5), value, dtype=np.uint8) for value in (10, 20, 30)]
+        bands = [Band(i + 1, data, (400.0 + 100 * i, 400.0 + 100 * i)) for i, data in enumerate(self.band_data)]
+        self.image_ms = ImageMS("path/to/test_image.tif", 400, 600, (5, 4), bands)
+
+    def test_cube_from_bands(self):
+        """Test the bands are gathered into a single contiguous cube"""
+        cube = self.image_ms.get_cube()
+        self.assertEqual(cube.shape, (3, 4, 5))
+        self.assertTrue(cube.flags.c_contiguous)
+        np.testing.assert_array_equal(cube[1], self.band_data[1])
+
+    def test_bands_are_views_of_cube(self):
+        """Test the band pixels are shared with the cube and read-only"""
+        cube = self.image_ms.get_cube()
+        for band in self.image_ms.get_bands():
+            shade = band.get_shade_of_grey()
+            self.assertTrue(np.shares_memory(shade, cube))
+            self.assertFalse(shade.flags.writeable)
+        self.assertFalse(cube.flags.writeable)
+
+    def test_band_navigation(self):
+        """Test switching between bands"""
+        self.assertEqual(self.image_ms.get_actualband().get_number(), 1)
+        self.image_ms.previous_band()
+        self.assertEqual(self.image_ms.get_actualband().get_number(), 3)
+        self.image_ms.next_band()
+        self.image_ms.next_band()
+        self.assertEqual(self.image_ms.get_actualband().get_number(), 2)
+        self.assertEqual(self.image_ms.get_name(), "test_image.tif")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.ImagePyramid import ImagePyramid
+
+class TestImagePyramid(unittest.TestCase):
+    """
+    Test suite for ImagePyramid class functionalities.
+    """
+    def setUp(self):
+        """Set up a random 8 bits image of 9x6 pixels with two bands"""
+        rng = np.random.default_rng(0)
+        self.cube = rng.integers(0, 255, (2, 6, 9), dtype=np.uint8)
+        bands = [Band(i + 1, self.cube[i], (500.0 + 50 * i, 500.0 + 50 * i)) for i in range(2)]
+        self.image_ms = ImageMS("test_image.tif", 500, 550, (9, 6), bands, self.cube)
+
+    def test_area_average(self):
+        """Test the blocks are averaged, the edge blocks over the pixels they contain"""
+        result = ImagePyramid.area_average(self.cube[0], 2)
+        self.assertEqual(result.shape, (3, 5))
+        self.assertAlmostEqual(result[0, 0], self.cube[0, :2, :2].mean(), places=4)
+        self.assertAlmostEqual(result[2, 4], self.cube[0, 4:, 8:].mean(), places=4)
+
+    def test_levels(self):
+        """Test each level halves the image and keeps its bands"""
+        pyramid = self.image_ms.get_pyramid()
+        self.assertIs(pyramid.get_level(0), self.image_ms)
+        level = pyramid.get_level(2)
+        self.assertIs(pyramid.get_level(2), level)
+        self.assertEqual(level.get_size(), (3, 2))
+        self.assertEqual(level.get_number_bands(), 2)
+        self.assertEqual(level.get_band_by_number(2).get_wavelength(), (550.0, 550.0))
+        pixels = level.get_band_by_number(1).get_raw_shade_of_grey()
+        self.assertEqual(pixels.shape, (2, 3))
+        self.assertEqual(pixels.dtype, np.uint8)
+        self.assertEqual(pixels[0, 0], np.rint(self.cube[0, :4, :4].mean()))
+        self.assertEqual(pixels[1, 2], np.rint(self.cube[0, 4:, 8:].mean()))
+
+    def test_bands_built_on_demand(self):
+        """Test only the read bands of the requested level are built, within the budget"""
+        pyramid = ImagePyramid(self.image_ms, budget_bytes=3 * 5)
+        level = pyramid.get_level(1)
+        self.assertEqual(pyramid.get_built_bands(), [])
+
+        level.get_band_by_number(2).get_raw_shade_of_grey()
+        self.assertEqual(pyramid.get_built_bands(), [(1, 1)])
+        pyramid.get_level(2).get_band_by_number(1).get_raw_shade_of_grey()
+        self.assertEqual(pyramid.get_built_bands(), [(2, 0)])
+        self.assertLessEqual(pyramid.get_nbytes(), 3 * 5)
+        np.testing.assert_array_equal(level.get_band_by_number(2).get_raw_shade_of_grey(),
+                                      np.rint(ImagePyramid.area_average(self.cube[1], 2)).astype(np.uint8))
+
+    def test_level_for_size(self):
+        """Test the chosen level is the smallest one still covering the display area"""
+        self.assertEqual(ImagePyramid.get_level_index((4000, 3000), (350, 350)), 3)
+        self.assertEqual(ImagePyramid.get_level_index((300, 200), (350, 350)), 0)
+        self.assertEqual(self.image_ms.get_pyramid().get_level_for_size((4, 4)).get_size(), (5, 3))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.LazyBand import LazyBand
+from Storage.FrameReader import FrameReader
+from LogicLayer.ImageMS import ImageMS
+from Storage.FileManager import FileManager
+from ResourceManager import ResourceManager
+from UnitTests.TiffFixture import TiffFixture
+
+class TestLazyBand(unittest.TestCase):
+    """
+    Test suite for LazyBand and FrameReader functionalities.
+    """
+    def setUp(self):
+        """Write a multi-page TIFF of five frames"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.frames = [np.full((8, 10), 1000 * index, dtype=np.uint16) for index in range(5)]
+        self.path = TiffFixture.write_tiff(os.path.join(self.directory.name, "image.tif"), self.frames)
+
+    def tearDown(self):
+        """Remove the written file"""
+        self.directory.cleanup()
+
+    def test_band_decodes_on_demand(self):
+        """Test a lazy band decodes its frame only when its pixels are requested"""
+        reader = FrameReader(self.path, 2)
+        band = LazyBand(3, (500.0, 500.0), reader, 0.5)
+        self.assertEqual(reader.get_cached_frames(), [])
+
+        np.testing.assert_array_equal(band.get_raw_shade_of_grey(), self.frames[3])
+        np.testing.assert_array_equal(band.get_shade_of_grey(), self.frames[3] * 0.5)
+        self.assertEqual(reader.get_cached_frames(), [3])
+        reader.close()
+
+    def test_cache_is_bounded(self):
+        """Test the least recently used frame is released when the cache is full"""
+        reader = FrameReader(self.path, 2)
+        reader.read(1)
+        reader.read(2)
+        reader.read(1)
+        reader.read(4)
+        self.assertEqual(reader.get_cached_frames(), [1, 4])
+        self.assertFalse(reader.read(4).flags.writeable)
+        reader.close()
+
+    def test_image_close_releases_reader(self):
+        """Test closing an image closes the file handle of its lazy bands, which reopen it on demand"""
+        reader = FrameReader(self.path, 2)
+        bands = [LazyBand(number, (400.0 + number, 400.0 + number), reader) for number in range(1, 5)]
+        image = ImageMS(self.path, 401, 404, (10, 8), bands, lazy=True)
+        bands[1].get_raw_shade_of_grey()
+        self.assertTrue(reader.is_open())
+
+        image.close()
+        self.assertFalse(reader.is_open())
+        self.assertEqual(reader.get_cached_frames(), [])
+        np.testing.assert_array_equal(bands[1].get_raw_shade_of_grey(), self.frames[2])
+        reader.close()
+
+    def test_lazy_load_scale_of_band_frames(self):
+        """Test a lazy image takes its scale from the band frames, not from a first frame of another mode"""
+        for name, dtype in (("uint16.tif", np.uint16), ("float.tif", np.float32)):
+            frames = TiffFixture.random_frames(1, (8, 10), np.uint8) + TiffFixture.random_frames(3, (8, 10), dtype)
+            path = TiffFixture.write_tiff(os.path.join(self.directory.name, name), frames)
+            metadata_path = TiffFixture.write_metadata(os.path.join(self.directory.name, "metadata.txt"),
+                                                       {name: [450.0, 550.0, 650.0]})
+
+            lazy = FileManager.Load(path, metadata_path, ResourceManager.LOAD_LAZY)
+            decoded = FileManager.Load(path, metadata_path, ResourceManager.LOAD_DECODE)
+            self.assertEqual(lazy.get_scale(), decoded.get_scale())
+            for lazy_band, decoded_band in zip(lazy.get_bands(), decoded.get_bands()):
+                np.testing.assert_array_equal(lazy_band.get_shade_of_grey(), decoded_band.get_shade_of_grey())
+            lazy.close()
+
+if __name__ == '__main__':
+    unittest.main()
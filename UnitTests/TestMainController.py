@@ -0,0 +1,154 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from PIL import Image
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from HMI.Controllers.MainController import MainController
+from LogicLayer.Band import Band
+from Exceptions.OperationCancelledException import OperationCancelledException
+from ResourceManager import ResourceManager
+from UnitTests.TiffFixture import TiffFixture
+
+class TestMainController(unittest.TestCase):
+    """
+    Test suite for the simulations run by MainController.
+    """
+    def setUp(self):
+        """Write an uncompressed multi-page TIFF of six bands and its metadata"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.image_path, self.metadata_path, _ = TiffFixture.write_image(
+            self.directory.name, "image.tif", [420.0, 470.0, 520.0, 570.0, 620.0, 670.0], (45, 60))
+
+    def tearDown(self):
+        """Remove the written files"""
+        self.directory.cleanup()
+
+    def create_controller(self):
+        """Create a controller with the image loaded"""
+        controller = MainController()
+        controller.load_image_files(self.image_path, self.metadata_path)
+        return controller
+
+    def get_simulations(self, controller):
+        """Get the (simulation_type, params) of the checked simulations"""
+        return [
+            (ResourceManager.TRUE_COLOR, None),
+            (ResourceManager.DALTONIAN, ResourceManager.DEUTERANOPIA),
+            (ResourceManager.RGB_BANDS, controller.get_bands_for_rgb((2, 4, 6))),
+        ]
+
+    def test_preview_saved_at_full_resolution(self):
+        """Test the full resolution image of a preview is the simulation run without preview"""
+        controller = self.create_controller()
+        reference = self.create_controller()
+        for (simulation_type, params), (_, reference_params) in zip(self.get_simulations(controller),
+                                                                     self.get_simulations(reference)):
+            success, error = controller.simulate(simulation_type, params, preview_size=(20, 20))
+            self.assertTrue(success, error)
+            self.assertEqual(controller._simulated_image.shape, (23, 30, 3))
+
+            success, error = reference.simulate(simulation_type, reference_params)
+            self.assertTrue(success, error)
+            np.testing.assert_array_equal(controller._get_full_resolution_image(), reference._simulated_image)
+
+    def test_save_preview(self):
+        """Test saving a preview writes the full resolution simulation, and a cancelled save writes nothing"""
+        controller = self.create_controller()
+        reference = self.create_controller()
+        controller.simulate(ResourceManager.DALTONIAN, ResourceManager.PROTANOPIA, preview_size=(20, 20))
+        reference.simulate(ResourceManager.DALTONIAN, ResourceManager.PROTANOPIA)
+
+        cancelled_path = os.path.join(self.directory.name, "cancelled.png")
+        def cancel(done, total):
+            raise OperationCancelledException("cancelled")
+        with self.assertRaises(OperationCancelledException):
+            controller.save_simulation_to(cancelled_path, cancel)
+        self.assertFalse(os.path.exists(cancelled_path))
+
+        save_path = os.path.join(self.directory.name, "saved.png")
+        reports = []
+        success, error = controller.save_simulation_to(save_path, lambda done, total: reports.append((done, total)))
+        self.assertTrue(success, error)
+        self.assertNotEqual(reports, [])
+        with Image.open(save_path) as saved:
+            np.testing.assert_array_equal(np.asarray(saved), reference._convert_to_uint8(reference._simulated_image))
+        self.assertEqual(controller._simulated_image.shape, (23, 30, 3))
+
+    def test_refinement_stages(self):
+        """Test the stages of the 60x45 image, each pyramid level listed once and the last one at full resolution"""
+        controller = self.create_controller()
+        # The display is larger than the image: the coarse preview is already the full resolution
+        self.assertEqual(controller.get_refinement_stages((240, 180)), [None])
+        self.assertEqual(controller.get_refinement_stages((120, 90)), [(30, 22), None])
+        self.assertEqual(controller.get_refinement_stages((60, 45)), [(15, 11), None])
+        # The display is the first level of the pyramid
+        self.assertEqual(controller.get_refinement_stages((30, 23)), [(7, 5), (30, 23), None])
+        # The coarse preview is one pixel, once when the display is one
+        self.assertEqual(controller.get_refinement_stages((2, 2)), [(1, 1), (2, 2), None])
+        self.assertEqual(controller.get_refinement_stages((1, 1)), [(1, 1), None])
+        self.assertEqual(MainController().get_refinement_stages((30, 23)), [])
+
+    def test_refinements_reuse_rgb_channels(self):
+        """Test every refinement stage keeps its RGB simulator, so a second pass only reads the changed band"""
+        controller = self.create_controller()
+        stages = controller.get_refinement_stages((30, 23))
+        for stage in stages:
+            success, error = controller.simulate(ResourceManager.RGB_BANDS, controller.get_bands_for_rgb((1, 2, 3)),
+                                                 stage)
+            self.assertTrue(success, error)
+
+        read = []
+        get_shade_of_grey = Band.get_shade_of_grey
+        def spy(band):
+            read.append(band.get_number())
+            return get_shade_of_grey(band)
+        with patch.object(Band, "get_shade_of_grey", spy):
+            for stage in stages:
+                success, error = controller.simulate(ResourceManager.RGB_BANDS,
+                                                     controller.get_bands_for_rgb((1, 2, 4)), stage)
+                self.assertTrue(success, error)
+        self.assertNotEqual(read, [])
+        self.assertEqual(set(read), {4})
+
+        reference = self.create_controller()
+        reference.simulate(ResourceManager.RGB_BANDS, reference.get_bands_for_rgb((1, 2, 4)))
+        np.testing.assert_array_equal(controller._simulated_image, reference._simulated_image)
+
+    def test_cancelled_simulation(self):
+        """Test a simulation cancelled during the projection keeps the previous simulated image and caches nothing"""
+        controller = self.create_controller()
+        controller.simulate(ResourceManager.TRUE_COLOR, None, preview_size=(20, 20))
+        previous = controller._simulated_image
+        def cancel(done, total):
+            raise OperationCancelledException("cancelled")
+        with self.assertRaises(OperationCancelledException):
+            controller.simulate(ResourceManager.DALTONIAN, ResourceManager.DEUTERANOPIA, progress=cancel)
+        self.assertIs(controller._simulated_image, previous)
+        self.assertEqual(controller._get_pipeline().get_cached_keys(), [])
+
+        reports = []
+        success, error = controller.simulate(ResourceManager.DALTONIAN, ResourceManager.DEUTERANOPIA,
+                                             progress=lambda done, total: reports.append((done, total)))
+        self.assertTrue(success, error)
+        self.assertEqual(reports[-1][0], reports[-1][1])
+
+    def test_levels_share_pipeline(self):
+        """Test the previews and the full resolution simulations cache their responses in one pipeline"""
+        controller = self.create_controller()
+        controller.simulate(ResourceManager.TRUE_COLOR, None, preview_size=(20, 20))
+        pipeline = controller._get_pipeline()
+        controller.simulate(ResourceManager.TRUE_COLOR, None)
+        self.assertIs(controller._get_pipeline(), pipeline)
+        level = controller._simulated_level.get_pyramid().get_level_for_size((20, 20))
+        self.assertNotEqual(pipeline.get_cached_keys(level), [])
+        self.assertNotEqual(pipeline.get_cached_keys(), [])
+        self.assertLessEqual(pipeline.get_nbytes(), ResourceManager.PIPELINE_CACHE_BYTES)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import unittest
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from Storage.MetadataIndex import MetadataIndex
+from Exceptions.MetaDataNotFoundException import MetaDataNotFoundException
+
+class TestMetadataIndex(unittest.TestCase):
+    """
+    Test suite for MetadataIndex class functionalities.
+    """
+    def setUp(self):
+        """Write a metadata file describing two images"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "metadata.txt")
+        with open(self.path, "w") as meta:
+            meta.write("first.tif:\n\tCenter wavelengths:\n\t\t400.0 410.0\n\t\t420.0\n\tFWHM:\n\t\t5.0 5.0 5.0\n")
+            meta.write("second.tif:\n\tCenter wavelengths:\n\t\t700.0 710.0\n")
+
+    def tearDown(self):
+        """Remove the written file"""
+        self.directory.cleanup()
+
+    def test_sections_are_separated(self):
+        """Test each image only gets the wavelengths of its own section"""
+        index = MetadataIndex.get(self.path)
+        self.assertEqual(index.get_wavelengths("path/to/first.tif"), [400.0, 410.0, 420.0])
+        self.assertEqual(index.get_wavelengths("second.tif"), [700.0, 710.0])
+
+    def test_section_names(self):
+        """Test a section is keyed by its whole file name, with spaces, any extension or a path"""
+        with open(self.path, "a") as meta:
+            meta.write("img one.tif:\n\tCenter wavelengths:\n\t\t450.0 460.0\n")
+            meta.write("C:\\scans/capture.raw:\n\tCenter wavelengths:\n\t\t800.0\n")
+        index = MetadataIndex.parse(self.path)
+        self.assertEqual(index.get_wavelengths("data/img one.tif"), [450.0, 460.0])
+        self.assertEqual(index.get_wavelengths("capture.raw"), [800.0])
+        self.assertEqual(index.get_wavelengths("second.tif"), [700.0, 710.0])
+
+    def test_missing_image(self):
+        """Test an image absent from the file raises MetaDataNotFoundException"""
+        with self.assertRaises(MetaDataNotFoundException):
+            MetadataIndex.get(self.path).get_wavelengths("third.tif")
+
+    def test_bulk_lookup(self):
+        """Test the wavelengths of several images are returned at once"""
+        found = MetadataIndex.get(self.path).get_many_wavelengths(["first.tif", "second.tif", "third.tif"])
+        self.assertEqual(sorted(found.keys()), ["first.tif", "second.tif"])
+
+    def test_cache_follows_modifications(self):
+        """Test the index is reused while the file is unchanged and rebuilt when it changes"""
+        index = MetadataIndex.get(self.path)
+        self.assertIs(MetadataIndex.get(self.path), index)
+
+        with open(self.path, "a") as meta:
+            meta.write("third.tif:\n\tCenter wavelengths:\n\t\t500.0\n")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(MetadataIndex.get(self.path).get_wavelengths("third.tif"), [500.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Factory.Simulating.Normalization import Normalization
+
+class TestNormalization(unittest.TestCase):
+    """
+    Test suite for the Normalization stage.
+    """
+    def setUp(self):
+        """Set up an image with a varying, a constant and a null channel"""
+        self.image = np.zeros((4, 5, 3))
+        self.image[:, :, 0] = np.arange(20).reshape(4, 5) + 10
+        self.image[:, :, 1] = 7
+
+    def test_min_max(self):
+        """Test a varying channel is stretched to [0,1] and the others are only clipped"""
+        result = Normalization(Normalization.MIN_MAX).apply(self.image.copy())
+        np.testing.assert_allclose(result[:, :, 0], np.arange(20).reshape(4, 5) / 19)
+        np.testing.assert_array_equal(result[:, :, 1], 1)
+        np.testing.assert_array_equal(result[:, :, 2], 0)
+
+    def test_max(self):
+        """Test each channel is divided by its maximum"""
+        result = Normalization(Normalization.MAX).apply(self.image.copy())
+        np.testing.assert_allclose(result[:, :, 0], (np.arange(20).reshape(4, 5) + 10) / 29)
+        np.testing.assert_array_equal(result[:, :, 1], 1)
+        np.testing.assert_array_equal(result[:, :, 2], 0)
+
+    def test_in_place_with_given_statistics(self):
+        """Test statistics computed on an image can normalize another one in place"""
+        normalization = Normalization(Normalization.MIN_MAX)
+        statistics = normalization.compute_statistics(self.image)
+        part = self.image[:2].copy()
+
+        result = normalization.apply(part, statistics)
+
+        self.assertIs(result, part)
+        np.testing.assert_allclose(result[:, :, 0], np.arange(10).reshape(2, 5) / 19)
+
+    def test_gamma(self):
+        """Test the gamma correction is applied after the scaling"""
+        image = np.zeros((1, 2, 3))
+        image[0, :, 0] = [4.0, 1.0]
+        result = Normalization(Normalization.MAX, gamma=2).apply(image)
+        np.testing.assert_allclose(result[0, :, 0], [1, 0.5])
+
+if __name__ == '__main__':
+    unittest.main()
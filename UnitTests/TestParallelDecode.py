@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from Storage.FileManager import FileManager
+from UnitTests.TiffFixture import TiffFixture
+
+class TestParallelDecode(unittest.TestCase):
+    """
+    Test suite for the decoding of the frames by several threads in FileManager.
+    """
+    def setUp(self):
+        """Write an uncompressed and a compressed multi-page TIFF of eight bands"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.frames = TiffFixture.random_frames(9, (24, 18), seed=1)
+        self.paths = [TiffFixture.write_tiff(os.path.join(self.directory.name, name), self.frames, compression)
+                      for name, compression in (("raw.tif", "raw"), ("lzw.tif", "tiff_lzw"))]
+        self.metadata = [400.0 + 20 * index for index in range(8)]
+
+    def tearDown(self):
+        """Remove the written files"""
+        self.directory.cleanup()
+
+    def test_workers_give_the_same_cube(self):
+        """Test one and three decoding threads fill the same cube, with every band in its place"""
+        expected = np.stack(self.frames[1:])
+        for path in self.paths:
+            single = FileManager.open_and_get_image_and_bands_data(path, self.metadata, workers=1)
+            parallel = FileManager.open_and_get_image_and_bands_data(path, self.metadata, workers=3)
+            np.testing.assert_array_equal(single.get_cube(), expected)
+            np.testing.assert_array_equal(parallel.get_cube(), single.get_cube())
+            self.assertEqual(parallel.get_cube().dtype, np.uint16)
+            self.assertEqual([band.get_wavelength()[0] for band in parallel.get_bands()], self.metadata)
+
+    def test_workers_with_a_selection(self):
+        """Test the threads decode the same region of the same selected bands"""
+        expected = np.stack(self.frames[1:])[1:7, 3:20:2, 2:15:2]
+        for path in self.paths:
+            cubes = [FileManager.open_and_get_image_and_bands_data(path, self.metadata, workers, (3, 20, 2, 15), 2,
+                                                                  (420.0, 520.0)).get_cube()
+                     for workers in (1, 3)]
+            np.testing.assert_array_equal(cubes[0], expected)
+            np.testing.assert_array_equal(cubes[1], expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.Factory.Simulating.ResultCache import ResultCache
+
+class TestResultCache(unittest.TestCase):
+    """
+    Test suite for ResultCache class functionalities.
+    """
+    def setUp(self):
+        """Set up a small image and a 4x4 simulated image of 384 bytes"""
+        bands = [Band(1, np.zeros((4, 4)), (500.0, 500.0))]
+        self.image_ms = ImageMS("test_image.tif", 500, 500, (4, 4), bands)
+        self.result = np.random.default_rng(0).random((4, 4, 3))
+
+    def test_hit_and_miss(self):
+        """Test a stored result is returned read-only and lookups are counted"""
+        cache = ResultCache()
+        key = ResultCache.make_key(self.image_ms, "RGB Bands", (1, 2, 3))
+        self.assertIsNone(cache.get(key))
+
+        cache.store(key, self.image_ms, self.result)
+        cached = cache.get(key)
+        self.assertIs(cached, self.result)
+        self.assertFalse(cached.flags.writeable)
+        self.assertIsNone(cache.get(ResultCache.make_key(self.image_ms, "RGB Bands", (3, 2, 1))))
+        statistics = cache.get_statistics()
+        self.assertEqual((statistics['hits'], statistics['misses'], statistics['entries']), (1, 2, 1))
+
+    def test_least_recently_used_released(self):
+        """Test the least recently used result is released over the budget"""
+        cache = ResultCache(budget_bytes=2 * self.result.nbytes)
+        keys = [ResultCache.make_key(self.image_ms, "Human Vision", (index,)) for index in range(3)]
+        cache.store(keys[0], self.image_ms, self.result.copy())
+        cache.store(keys[1], self.image_ms, self.result.copy())
+        cache.get(keys[0])
+        cache.store(keys[2], self.image_ms, self.result.copy())
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertLessEqual(cache.get_nbytes(), 2 * self.result.nbytes)
+
+    def test_views_released_with_result(self):
+        """Test a view is cached with its result and released with it"""
+        cache = ResultCache()
+        key = ResultCache.make_key(self.image_ms, "Bee Vision", None)
+        cache.store_view(key, "pixmap", "view", 10)
+        self.assertIsNone(cache.get_view(key, "pixmap"))
+
+        cache.store(key, self.image_ms, self.result)
+        cache.store_view(key, "pixmap", "view", 10)
+        self.assertEqual(cache.get_view(key, "pixmap"), "view")
+        self.assertEqual(cache.get_nbytes(), self.result.nbytes + 10)
+        cache.clear()
+        self.assertIsNone(cache.get_view(key, "pixmap"))
+
+if __name__ == '__main__':
+    unittest.main()
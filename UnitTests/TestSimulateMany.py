@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.Factory.Simulating.SimulatingMethod import SimulateMethod
+from LogicLayer.Factory.Simulating.HumanSimulating import HumanSimulating
+from LogicLayer.Factory.Simulating.BeeSimulating import BeeSimulating
+from LogicLayer.Factory.Simulating.DaltonianSimulating import DaltonianSimulating
+from LogicLayer.Factory.Simulating.BandChoiceSimulating import BandChoiceSimulating
+
+class TestSimulateMany(unittest.TestCase):
+    """
+    Test suite for the joint simulation of several simulators.
+    """
+    def setUp(self):
+        """Set up a random 8 bits image with five bands"""
+        rng = np.random.default_rng(0)
+        cube = rng.integers(0, 255, (5, 9, 13), dtype=np.uint8)
+        bands = [Band(i + 1, cube[i], (350.0 + 60 * i, 350.0 + 60 * i)) for i in range(5)]
+        self.image_ms = ImageMS("test_image.tif", 350, 590, (13, 9), bands, cube)
+
+    def create_simulators(self):
+        """Create one simulator of each kind on the image"""
+        return [
+            HumanSimulating(self.image_ms),
+            BeeSimulating(self.image_ms),
+            DaltonianSimulating(self.image_ms, "Deuteranopia"),
+            BandChoiceSimulating(self.image_ms, tuple(self.image_ms.get_bands()[:3])),
+        ]
+
+    def test_same_results_as_separate_runs(self):
+        """Test every simulator gets the result of its own simulation, in order"""
+        expected = [simulator.simulate() for simulator in self.create_simulators()]
+        results = SimulateMethod.simulate_many(self.create_simulators())
+
+        self.assertEqual(len(results), len(expected))
+        for result, image in zip(results, expected):
+            self.assertEqual(result.dtype, image.dtype)
+            np.testing.assert_array_equal(result, image)
+
+    def test_cube_read_once(self):
+        """Test the projecting simulators share a single projection of the cube"""
+        calls = []
+        project_matrix = SimulateMethod._project_matrix
+        def counting_project_matrix(*args):
+            calls.append(args[1].shape)
+            return project_matrix(*args)
+
+        SimulateMethod._project_matrix = staticmethod(counting_project_matrix)
+        try:
+            SimulateMethod.simulate_many(self.create_simulators())
+        finally:
+            SimulateMethod._project_matrix = staticmethod(project_matrix)
+
+        self.assertEqual(calls, [(5, 9)])
+
+    def test_different_images_rejected(self):
+        """Test simulators of different images raise ValueError"""
+        other = ImageMS("other_image.tif", 350, 590, (13, 9), self.image_ms.get_bands(), self.image_ms.get_cube())
+        with self.assertRaises(ValueError):
+            SimulateMethod.simulate_many([HumanSimulating(self.image_ms), HumanSimulating(other)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.Factory.Simulating.SimulationBuffer import SimulationBuffer
+from LogicLayer.Factory.Simulating.HumanSimulating import HumanSimulating
+
+class TestSimulationBuffer(unittest.TestCase):
+    """
+    Test suite for SimulationBuffer class functionalities.
+    """
+    def setUp(self):
+        """Set up a small random image with four bands"""
+        rng = np.random.default_rng(0)
+        bands = [Band(i + 1, rng.random((5, 7)) * 255, (450.0 + 50 * i, 450.0 + 50 * i)) for i in range(4)]
+        self.image_ms = ImageMS("test_image.tif", 450, 600, (7, 5), bands)
+
+    def test_array_reused(self):
+        """Test an array is only allocated again when its shape changes"""
+        buffer = SimulationBuffer()
+        array = buffer.get((5, 7, 3))
+        self.assertIs(buffer.get((5, 7, 3)), array)
+        self.assertEqual(array.dtype, np.float32)
+        self.assertIsNot(buffer.get((6, 7, 3)), array)
+
+    def test_simulation_in_buffer(self):
+        """Test a simulator with a buffer writes a float32 result into it, close to the float64 result"""
+        expected = HumanSimulating(self.image_ms).simulate()
+        buffer = SimulationBuffer(np.float32)
+        simulator = HumanSimulating(self.image_ms)
+        simulator.set_output_buffer(buffer)
+
+        result = simulator.simulate()
+
+        self.assertIs(result, buffer.get((5, 7, 3)))
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, atol=1e-5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from PyQt6.QtWidgets import QApplication, QLabel
+
+from HMI.Controllers.MainController import MainController
+from HMI.Views.SimulationPanel import SimulationPanel
+from ResourceManager import ResourceManager
+from UnitTests.TiffFixture import TiffFixture
+
+class ImageView:
+    """Image view of the main window, reduced to the label of the simulated image"""
+    def __init__(self, size):
+        self.simulated_image = QLabel()
+        self.simulated_image.resize(*size)
+
+class MainWindow:
+    """Main window keeping the started workers instead of running them in a thread pool"""
+    def __init__(self, size):
+        self.image_view = ImageView(size)
+        self.workers = []
+        self.history_updates = 0
+
+    def start_worker(self, worker, message, blocking=True):
+        self.workers.append((worker, blocking))
+
+    def _update_history(self):
+        self.history_updates += 1
+
+class TestSimulationPanel(unittest.TestCase):
+    """
+    Test suite for the progressive refinement of the simulations in SimulationPanel.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """Create the application of the widgets, without display"""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Write an uncompressed multi-page TIFF of six bands and load it in a panel"""
+        self.directory = tempfile.TemporaryDirectory()
+        image_path, metadata_path, _ = TiffFixture.write_image(
+            self.directory.name, "image.tif", [420.0, 470.0, 520.0, 570.0, 620.0, 670.0], (45, 60))
+
+        self.controller = MainController()
+        self.controller.load_image_files(image_path, metadata_path)
+        self.main_window = MainWindow((30, 23))
+        self.panel = SimulationPanel(self.controller, self.main_window)
+        self.panel.simulation_type.setCurrentText(ResourceManager.TRUE_COLOR)
+
+    def tearDown(self):
+        """Remove the written files"""
+        self.directory.cleanup()
+
+    def test_stages_run_in_workers(self):
+        """Test every stage, the full resolution included, is computed by a worker started after the previous one"""
+        self.panel._on_simulate()
+        stages = self.controller.get_refinement_stages((30, 23))
+        for index, stage in enumerate(stages):
+            self.assertEqual(len(self.main_window.workers), index + 1)
+            worker, blocking = self.main_window.workers[index]
+            self.assertEqual(blocking, index == 0)
+            worker.run()
+            if stage is None:
+                self.assertEqual(self.controller._simulated_image.shape, (45, 60, 3))
+            else:
+                self.assertEqual(self.controller._simulated_level.get_size()[0], self.controller._simulated_image.shape[1])
+        self.assertEqual(len(self.main_window.workers), len(stages))
+        self.assertEqual(self.main_window.history_updates, 1)
+
+    def test_stale_stage_dropped(self):
+        """Test a stage finishing after a newer simulation neither is displayed nor starts the next stage"""
+        self.panel._on_simulate()
+        stale, _ = self.main_window.workers[0]
+        self.panel._on_simulate()
+        self.assertTrue(stale.is_cancelled())
+        self.assertEqual(len(self.main_window.workers), 2)
+
+        # The result of the stale worker reached the event loop before its cancellation
+        stale.signals.finished.emit((True, None))
+        self.assertEqual(len(self.main_window.workers), 2)
+        self.assertEqual(self.main_window.history_updates, 0)
+
+        current, _ = self.main_window.workers[1]
+        current.run()
+        self.assertEqual(len(self.main_window.workers), 3)
+        self.assertEqual(self.main_window.history_updates, 1)
+
+if __name__ == '__main__':
+    unittest.main()
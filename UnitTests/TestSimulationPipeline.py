@@ -0,0 +1,101 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.Factory.Simulating.SimulationPipeline import SimulationPipeline
+from LogicLayer.Factory.Simulating.SimulatingMethod import SimulateMethod
+from LogicLayer.Factory.Simulating.HumanSimulating import HumanSimulating
+from LogicLayer.Factory.Simulating.DaltonianSimulating import DaltonianSimulating
+
+class TestSimulationPipeline(unittest.TestCase):
+    """
+    Test suite for SimulationPipeline class functionalities.
+    """
+    def setUp(self):
+        """Set up a random 8 bits image with five bands"""
+        rng = np.random.default_rng(0)
+        cube = rng.integers(0, 255, (5, 8, 10), dtype=np.uint8)
+        bands = [Band(i + 1, cube[i], (420.0 + 50 * i, 420.0 + 50 * i)) for i in range(5)]
+        self.image_ms = ImageMS("test_image.tif", 420, 620, (10, 8), bands, cube)
+        self.pipeline = SimulationPipeline(self.image_ms)
+
+    def test_same_result_as_simulate(self):
+        """Test the stages give the result of the simulator"""
+        for simulator in (HumanSimulating(self.image_ms), DaltonianSimulating(self.image_ms, "Protanopia")):
+            np.testing.assert_array_equal(self.pipeline.run(simulator), simulator.simulate())
+
+    def test_companions_projected_together(self):
+        """Test the responses of the companions are cached by the same pass and reused"""
+        human = HumanSimulating(self.image_ms)
+        daltonians = tuple(DaltonianSimulating(self.image_ms, daltonian_type)
+                           for daltonian_type in ("Deuteranopia", "Tritanopia"))
+        self.pipeline.run(human, daltonians)
+        self.assertEqual(len(self.pipeline.get_cached_keys()), 3)
+
+        responses = self.pipeline.get_responses(daltonians[1])
+        self.assertFalse(responses.flags.writeable)
+        self.assertEqual(len(self.pipeline.get_cached_keys()), 3)
+        np.testing.assert_array_equal(self.pipeline.run(daltonians[1]), daltonians[1].simulate())
+
+    def test_budget(self):
+        """Test the least recently used responses are released over the budget"""
+        pipeline = SimulationPipeline(self.image_ms, budget_bytes=8 * 10 * 3 * 8)
+        human = HumanSimulating(self.image_ms)
+        pipeline.run(human, (DaltonianSimulating(self.image_ms, "Deuteranopia"),))
+        self.assertEqual(pipeline.get_cached_keys(), [human.get_response_key()])
+
+    def test_companions_within_budget(self):
+        """Test only the companions whose responses fit in the budget are projected"""
+        calls = []
+        project_matrix = SimulateMethod._project_matrix
+        def counting_project_matrix(*args):
+            calls.append(args[1].shape[1])
+            return project_matrix(*args)
+
+        budget = 2 * 8 * 10 * 3 * 8
+        pipeline = SimulationPipeline(self.image_ms, budget_bytes=budget)
+        human = HumanSimulating(self.image_ms)
+        companions = tuple(DaltonianSimulating(self.image_ms, daltonian_type) for daltonian_type in
+                           ("Deuteranopia", "Protanopia", "Tritanopia", "Achromatopsia"))
+        SimulateMethod._project_matrix = staticmethod(counting_project_matrix)
+        try:
+            pipeline.run(human, companions)
+        finally:
+            SimulateMethod._project_matrix = staticmethod(project_matrix)
+
+        self.assertEqual(calls, [6])
+        self.assertLessEqual(pipeline.get_nbytes(), budget)
+        self.assertEqual(pipeline.get_cached_keys(), [companions[0].get_response_key(), human.get_response_key()])
+
+    def test_levels_share_budget(self):
+        """Test the responses of the pyramid levels of the image are cached within the budget of the pipeline"""
+        budget = 8 * 10 * 3 * 8
+        pipeline = SimulationPipeline(self.image_ms, budget_bytes=budget)
+        level = self.image_ms.get_pyramid().get_level(1)
+        human = HumanSimulating(self.image_ms)
+        level_human = HumanSimulating(level)
+
+        pipeline.run(human)
+        self.assertEqual(pipeline.get_cached_keys(), [human.get_response_key()])
+        np.testing.assert_array_equal(pipeline.run(level_human), level_human.simulate())
+        # The responses of the image are released for those of the level, they do not fit together
+        self.assertEqual(pipeline.get_cached_keys(level), [level_human.get_response_key()])
+        self.assertEqual(pipeline.get_cached_keys(), [])
+        self.assertLessEqual(pipeline.get_nbytes(), budget)
+
+    def test_lms_mode_shares_human_responses(self):
+        """Test every deficiency type of the LMS mode runs on the cached human responses"""
+        self.pipeline.run(HumanSimulating(self.image_ms))
+        for daltonian_type in ("Deuteranopia", "Tritanopia", "Achromatopsia"):
+            simulator = DaltonianSimulating(self.image_ms, daltonian_type, DaltonianSimulating.LMS)
+            np.testing.assert_array_equal(self.pipeline.run(simulator), simulator.simulate())
+        self.assertEqual(len(self.pipeline.get_cached_keys()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
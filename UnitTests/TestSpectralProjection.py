@@ -0,0 +1,109 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.Factory.Simulating.SpectralProjection import SpectralProjection
+from LogicLayer.Factory.Simulating.TileExecutor import TileExecutor
+
+class TestSpectralProjection(unittest.TestCase):
+    """
+    Test suite for the SpectralProjection engine.
+    """
+    def setUp(self):
+        """Set up a small random image with five bands"""
+        rng = np.random.default_rng(0)
+        self.band_data = [rng.random((4, 6)) * 255 for _ in range(5)]
+        bands = [Band(i + 1, data, (400.0 + 50 * i, 400.0 + 50 * i)) for i, data in enumerate(self.band_data)]
+        self.image_ms = ImageMS("test_image.tif", 400, 600, (6, 4), bands)
+
+    def test_build_sensitivity_matrix(self):
+        """Test the matrix has one row per band and follows the channel order"""
+        sensitivity = lambda wavelength: (wavelength, 2 * wavelength, 3 * wavelength)
+        matrix = SpectralProjection.build_sensitivity_matrix(self.image_ms, sensitivity, (2, 1, 0))
+
+        self.assertEqual(matrix.shape, (5, 3))
+        np.testing.assert_array_equal(matrix[0], [1200.0, 800.0, 400.0])
+
+    def test_project_matches_band_loop(self):
+        """Test the projection gives the same result as a per band accumulation"""
+        matrix = np.random.default_rng(1).random((5, 3))
+        expected = np.zeros((4, 6, 3))
+        for data, weights in zip(self.band_data, matrix):
+            for channel in range(3):
+                expected[:, :, channel] += data * weights[channel]
+
+        result = SpectralProjection.project(SpectralProjection.get_cube(self.image_ms), matrix)
+
+        self.assertEqual(result.shape, (4, 6, 3))
+        np.testing.assert_allclose(result, expected)
+
+    def test_project_dtype(self):
+        """Test the projection honours the requested floating point type"""
+        result = SpectralProjection.project(SpectralProjection.get_cube(self.image_ms), np.ones((5, 3)), np.float32)
+        self.assertEqual(result.dtype, np.float32)
+
+    def test_project_native_cube_by_blocks(self):
+        """Test an integer cube converted block by block gives the same result as a float cube"""
+        cube = np.random.default_rng(2).integers(0, 65535, (5, 9, 7), dtype=np.uint16)
+        matrix = np.random.default_rng(3).random((5, 3))
+        expected = SpectralProjection.project(cube.astype(np.float64), matrix)
+
+        block_bytes = SpectralProjection.BLOCK_BYTES
+        SpectralProjection.BLOCK_BYTES = 1
+        try:
+            result = SpectralProjection.project(cube, matrix)
+        finally:
+            SpectralProjection.BLOCK_BYTES = block_bytes
+
+        np.testing.assert_allclose(result, expected)
+
+    def test_progress(self):
+        """Test every block or band is reported, and an exception of the callback stops every tile"""
+        cube = np.random.default_rng(5).integers(0, 65535, (5, 9, 7), dtype=np.uint16)
+        matrix = np.random.default_rng(6).random((5, 3))
+        block_bytes = SpectralProjection.BLOCK_BYTES
+        SpectralProjection.BLOCK_BYTES = 1
+        try:
+            reports = []
+            SpectralProjection.project(cube, matrix, executor=TileExecutor(3),
+                                       progress=lambda done, total: reports.append((done, total)))
+            self.assertEqual(sorted(reports), [(done, 9) for done in range(1, 10)])
+
+            reports.clear()
+            def cancel(done, total):
+                reports.append(done)
+                raise RuntimeError("cancelled")
+            with self.assertRaises(RuntimeError):
+                SpectralProjection.project(cube, matrix, executor=TileExecutor(3), progress=cancel)
+            # Each tile stops after its first block
+            self.assertEqual(len(reports), 3)
+        finally:
+            SpectralProjection.BLOCK_BYTES = block_bytes
+
+        reports = []
+        SpectralProjection.project_bands(self.image_ms.get_bands(), matrix,
+                                         progress=lambda done, total: reports.append((done, total)))
+        self.assertEqual(reports, [(done, 5) for done in range(1, 6)])
+
+    def test_project_into_output(self):
+        """Test the projection is written into the given array, for cubes and streamed bands"""
+        matrix = np.random.default_rng(4).random((5, 3))
+        expected = SpectralProjection.project(SpectralProjection.get_cube(self.image_ms), matrix)
+        out = np.empty((4, 6, 3), dtype=np.float32)
+
+        result = SpectralProjection.project(SpectralProjection.get_cube(self.image_ms), matrix, np.float32, out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(result, expected, rtol=1e-5)
+
+        result = SpectralProjection.project_bands(self.image_ms.get_bands(), matrix, np.float32, out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(result, expected, rtol=1e-5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from Storage.SpectralResponse import SpectralResponse
+
+class TestSpectralResponse(unittest.TestCase):
+    """
+    Test suite for SpectralResponse class functionalities.
+    """
+    def setUp(self):
+        """Write a small dataset with a missing value"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "responses.csv")
+        with open(self.path, "w") as data:
+            data.write("400.0, 0.0, 1.0, 2.0\n500.0, 1.0, 3.0, 4.0\n600.0, 2.0, 5.0,\n")
+
+    def tearDown(self):
+        """Remove the written file"""
+        self.directory.cleanup()
+
+    def test_evaluate_vector(self):
+        """Test every curve is interpolated at every wavelength, 0 outside of the samples and for missing values"""
+        values = SpectralResponse.read(self.path).evaluate(np.array([450.0, 600.0, 300.0]))
+        np.testing.assert_allclose(values, [[0.5, 2.0, 3.0], [2.0, 5.0, 0.0], [0.0, 0.0, 0.0]])
+
+    def test_scalar_call(self):
+        """Test a single wavelength gives a tuple of the curves"""
+        self.assertEqual(SpectralResponse.read(self.path)(500.0), (1.0, 3.0, 4.0))
+
+    def test_built_table(self):
+        """Test the build step writes the table next to the dataset, which is then read with the same values"""
+        parsed = SpectralResponse.read(self.path)
+        table_path = SpectralResponse.build_table(self.path)
+        self.assertEqual(table_path, SpectralResponse.get_table_path(self.path))
+        os.remove(self.path)
+
+        loaded = SpectralResponse.read(self.path)
+        np.testing.assert_array_equal(loaded.get_responses(), parsed.get_responses())
+
+    def test_shipped_table_authoritative(self):
+        """Test a shipped table is read even when the dataset is more recent, and is never rewritten"""
+        table_path = SpectralResponse.build_table(self.path)
+        with open(table_path, "rb") as table:
+            shipped = table.read()
+        with open(self.path, "w") as data:
+            data.write("400.0, 9.0, 9.0, 9.0\n600.0, 9.0, 9.0, 9.0\n")
+        os.utime(table_path, (0, 0))
+
+        cache_dir = os.path.join(self.directory.name, "cache")
+        self.assertEqual(SpectralResponse.read(self.path, cache_dir)(500.0), (1.0, 3.0, 4.0))
+        with open(table_path, "rb") as table:
+            self.assertEqual(table.read(), shipped)
+        self.assertFalse(os.path.exists(cache_dir))
+
+    def test_cached_table(self):
+        """Test a dataset without table is cached out of its directory, and parsed again when it changes"""
+        cache_dir = os.path.join(self.directory.name, "cache")
+        SpectralResponse.read(self.path, cache_dir)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["cache", "responses.csv"])
+        cached_path = SpectralResponse.get_cached_table_path(self.path, cache_dir)
+        self.assertTrue(os.path.exists(cached_path))
+
+        with open(self.path, "w") as data:
+            data.write("400.0, 9.0, 9.0, 9.0\n600.0, 9.0, 9.0, 9.0\n")
+        os.utime(cached_path, (0, 0))
+        self.assertEqual(SpectralResponse.read(self.path, cache_dir)(500.0), (9.0, 9.0, 9.0))
+
+    def test_dataset_read_once(self):
+        """Test the same dataset is shared by every caller"""
+        cache_dir = os.path.join(self.directory.name, "cache")
+        self.assertIs(SpectralResponse.get(self.path, cache_dir), SpectralResponse.get(self.path, cache_dir))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from Storage.TiffLayout import TiffLayout
+from UnitTests.TiffFixture import TiffFixture
+
+class TestTiffLayout(unittest.TestCase):
+    """
+    Test suite for TiffLayout class functionalities.
+    """
+    def setUp(self):
+        """Write an uncompressed and a compressed multi-page TIFF"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.frames = TiffFixture.random_frames(4, (20, 30))
+        self.raw_path = TiffFixture.write_tiff(os.path.join(self.directory.name, "raw.tif"), self.frames)
+        self.compressed_path = TiffFixture.write_tiff(os.path.join(self.directory.name, "compressed.tif"),
+                                                      self.frames, "tiff_lzw")
+
+    def tearDown(self):
+        """Remove the written files"""
+        self.directory.cleanup()
+
+    def test_memory_map(self):
+        """Test the mapped frames match the decoded frames"""
+        with Image.open(self.raw_path) as image:
+            layout = TiffLayout.read(image, range(1, image.n_frames))
+        self.assertIsNotNone(layout)
+        self.assertTrue(layout.is_uniform())
+        self.assertEqual(layout.get_size(), (30, 20))
+        self.assertEqual(layout.get_number_frames(), 3)
+
+        cube = layout.memory_map(self.raw_path)
+        self.assertEqual(cube.shape, (3, 20, 30))
+        for index in range(3):
+            np.testing.assert_array_equal(cube[index], self.frames[index + 1])
+
+    def test_compressed_file(self):
+        """Test a compressed file has no layout"""
+        with Image.open(self.compressed_path) as image:
+            self.assertIsNone(TiffLayout.read(image, range(1, image.n_frames)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from LogicLayer.Band import Band
+from LogicLayer.ImageMS import ImageMS
+from LogicLayer.Factory.Simulating.TileExecutor import TileExecutor
+from LogicLayer.Factory.Simulating.HumanSimulating import HumanSimulating
+from LogicLayer.Factory.Simulating.DaltonianSimulating import DaltonianSimulating
+
+class TestTileExecutor(unittest.TestCase):
+    """
+    Test suite for TileExecutor class functionalities.
+    """
+    def setUp(self):
+        """Set up a random 16 bits image with six bands"""
+        rng = np.random.default_rng(0)
+        cube = rng.integers(0, 65535, (6, 37, 11), dtype=np.uint16)
+        bands = [Band(i + 1, cube[i], (420.0 + 40 * i, 420.0 + 40 * i), 1 / 256) for i in range(6)]
+        self.image_ms = ImageMS("test_image.tif", 420, 620, (11, 37), bands, cube, 1 / 256)
+
+    def test_split(self):
+        """Test the tiles cover every row once, start on the given multiple and are at most one per worker"""
+        tiles = TileExecutor(4).split(37, 5)
+        self.assertLessEqual(len(tiles), 4)
+        self.assertEqual(tiles[0][0], 0)
+        self.assertEqual(tiles[-1][1], 37)
+        for (_, stop), (start, _) in zip(tiles, tiles[1:]):
+            self.assertEqual(stop, start)
+            self.assertEqual(start % 5, 0)
+
+    def test_run_keeps_order(self):
+        """Test the results are returned in the order of the tiles"""
+        tiles = TileExecutor(3).split(10)
+        self.assertEqual(TileExecutor(3).run(lambda start, stop: start, tiles), [start for start, _ in tiles])
+
+    def test_failing_tile_waits_for_the_others(self):
+        """Test the exception of a tile is raised once every other tile is done"""
+        done = []
+        def function(start, stop):
+            if start == 0:
+                raise RuntimeError("cancelled")
+            time.sleep(0.05)
+            done.append(start)
+
+        tiles = TileExecutor(3).split(9)
+        with self.assertRaises(RuntimeError):
+            TileExecutor(3).run(function, tiles)
+        self.assertEqual(sorted(done), [start for start, _ in tiles[1:]])
+
+    def test_tiled_simulation_is_identical(self):
+        """Test a tiled simulation gives exactly the result of the calling thread"""
+        for simulator in (HumanSimulating(self.image_ms), DaltonianSimulating(self.image_ms, "Protanopia")):
+            expected = simulator.simulate()
+            for workers in (2, 3, 8):
+                simulator.set_executor(TileExecutor(workers))
+                np.testing.assert_array_equal(simulator.simulate(), expected)
+            simulator.set_executor(None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from Storage.FileManager import FileManager
+from ResourceManager import ResourceManager
+from UnitTests.TiffFixture import TiffFixture
+
+class TestWindowedLoad(unittest.TestCase):
+    """
+    Test suite for the windowed loading of FileManager.
+    """
+    def setUp(self):
+        """Write an uncompressed and a compressed multi-page TIFF and their metadata"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, compression in (("raw.tif", "raw"), ("lzw.tif", "tiff_lzw")):
+            path, self.metadata_path, self.frames = TiffFixture.write_image(
+                self.directory.name, name, [450.0, 550.0, 650.0], (20, 30), compression=compression)
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Remove the written files"""
+        self.directory.cleanup()
+
+    def test_window_in_every_mode(self):
+        """Test every load mode keeps the same strided region of each band"""
+        expected = np.stack(self.frames[1:])[:, 2:17:2, 5:26:2]
+        for path in self.paths:
+            for load_mode in (ResourceManager.LOAD_DECODE, ResourceManager.LOAD_MEMORY_MAP, ResourceManager.LOAD_LAZY):
+                image_ms = FileManager.Load(path, self.metadata_path, load_mode, window=(2, 17, 5, 26), stride=2)
+                self.assertEqual(image_ms.get_size(), (expected.shape[2], expected.shape[1]))
+                np.testing.assert_array_equal(
+                    np.stack([band.get_raw_shade_of_grey() for band in image_ms.get_bands()]), expected)
+
+    def test_window_is_clipped(self):
+        """Test bounds past the image and negative bounds are clipped to it"""
+        image_ms = FileManager.Load(self.paths[0], self.metadata_path, window=(15, 100, -10, 100))
+        self.assertEqual(image_ms.get_size(), (30, 5))
+        np.testing.assert_array_equal(image_ms.get_cube(), np.stack(self.frames[1:])[:, 15:, :])
+        with self.assertRaises(ValueError):
+            FileManager.Load(self.paths[0], self.metadata_path, window=(0, 20, -10, -5))
+
+    def test_empty_window(self):
+        """Test an empty window or a null stride raises ValueError"""
+        with self.assertRaises(ValueError):
+            FileManager.Load(self.paths[0], self.metadata_path, window=(25, 30, 0, 10))
+        with self.assertRaises(ValueError):
+            FileManager.Load(self.paths[0], self.metadata_path, stride=0)
+
+    def test_progress(self):
+        """Test every decoded band is reported, and an exception of the callback stops the load"""
+        reports = []
+        FileManager.Load(self.paths[1], self.metadata_path, ResourceManager.LOAD_DECODE, workers=2,
+                         progress=lambda done, total: reports.append((done, total)))
+        self.assertEqual(sorted(reports)[:3], [(1, 3), (2, 3), (3, 3)])
+        self.assertEqual(reports[-1], (3, 3))
+
+        def cancel(done, total):
+            raise RuntimeError("cancelled")
+        with self.assertRaises(RuntimeError):
+            FileManager.Load(self.paths[1], self.metadata_path, ResourceManager.LOAD_DECODE, progress=cancel)
+
+    def test_progress_when_mapped(self):
+        """Test every mapped band is reported, or every decoded band when the file cannot be mapped"""
+        for path in self.paths:
+            reports = []
+            FileManager.Load(path, self.metadata_path, ResourceManager.LOAD_MEMORY_MAP, workers=1,
+                             progress=lambda done, total: reports.append((done, total)))
+            self.assertEqual(reports, [(1, 3), (2, 3), (3, 3), (3, 3)])
+
+            def cancel(done, total):
+                raise RuntimeError("cancelled")
+            with self.assertRaises(RuntimeError):
+                FileManager.Load(path, self.metadata_path, ResourceManager.LOAD_MEMORY_MAP, progress=cancel)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtWidgets import QApplication
+
+from HMI.Workers.Worker import Worker
+from Exceptions.ErrorMessages import ErrorMessages
+
+class TestWorker(unittest.TestCase):
+    """
+    Test suite for the signals of Worker run by a QThreadPool, without display.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """Create the application delivering the signals of the workers"""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Create a thread pool running one worker at a time"""
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(1)
+
+    def run_worker(self, worker):
+        """
+        Run a worker in the pool and deliver its signals
+        Returns:
+            list: the (signal name, arguments) emitted by the worker, in order
+        """
+        emitted = []
+        worker.signals.progress.connect(lambda done, total: emitted.append(("progress", (done, total))))
+        worker.signals.finished.connect(lambda result: emitted.append(("finished", result)))
+        worker.signals.error.connect(lambda message: emitted.append(("error", message)))
+        worker.signals.cancelled.connect(lambda: emitted.append(("cancelled", None)))
+        self.pool.start(worker)
+        self.assertTrue(self.pool.waitForDone(5000))
+        # Signals emitted from the pool thread are queued to the event loop of this thread
+        self.app.processEvents()
+        return emitted
+
+    def test_finished(self):
+        """Test the progress reports and the result of an operation are emitted in order"""
+        def operation(progress):
+            progress(1, 2)
+            progress(2, 2)
+            return "result"
+        self.assertEqual(self.run_worker(Worker(operation)),
+                         [("progress", (1, 2)), ("progress", (2, 2)), ("finished", "result")])
+
+    def test_cancel_before_run(self):
+        """Test a worker cancelled before it starts never calls its operation"""
+        called = []
+        worker = Worker(lambda progress: called.append(True))
+        worker.cancel()
+        self.assertEqual(self.run_worker(worker), [("cancelled", None)])
+        self.assertEqual(called, [])
+
+    def test_cancel_from_progress_report(self):
+        """Test the report following a cancellation raises, stopping the operation"""
+        reached = []
+        def operation(progress):
+            progress(1, 3)
+            worker.cancel()
+            progress(2, 3)
+            reached.append(True)
+            return "result"
+        worker = Worker(operation)
+        self.assertEqual(self.run_worker(worker), [("progress", (1, 3)), ("cancelled", None)])
+        self.assertEqual(reached, [])
+
+    def test_error_and_cancelled(self):
+        """Test an exception is emitted as an error, unless the worker was cancelled while it ran"""
+        def fail(progress):
+            raise ValueError(ErrorMessages.INVALID_WINDOW)
+        self.assertEqual(self.run_worker(Worker(fail)), [("error", ErrorMessages.INVALID_WINDOW)])
+
+        def cancel_and_fail(progress):
+            worker.cancel()
+            raise ValueError(ErrorMessages.INVALID_WINDOW)
+        worker = Worker(cancel_and_fail)
+        self.assertEqual(self.run_worker(worker), [("cancelled", None)])
+
+    def test_result_after_cancel(self):
+        """Test a result returned after a cancellation from another thread is emitted as cancelled"""
+        started = threading.Event()
+        cancelled = threading.Event()
+        def operation(progress):
+            started.set()
+            # The operation does not report progress anymore once cancelled
+            cancelled.wait(5)
+            return "result"
+        worker = Worker(operation)
+        canceller = threading.Thread(target=lambda: (started.wait(5), worker.cancel(), cancelled.set()))
+        canceller.start()
+        emitted = self.run_worker(worker)
+        canceller.join()
+        self.assertTrue(worker.is_cancelled())
+        self.assertEqual(emitted, [("cancelled", None)])
+
+if __name__ == '__main__':
+    unittest.main()
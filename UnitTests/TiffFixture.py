@@ -0,0 +1,90 @@
+import os
+import numpy as np
+from PIL import Image
+
+class TiffFixture:
+    """
+    Multi-page TIFF files and metadata written by the tests of the loading and simulation modules.
+
+    As in the acquired images, the first frame of a file is not a band: band n is stored in frame n.
+    """
+    METADATA_NAME : str = "metadata.txt"
+
+    @staticmethod
+    def random_frames(count : int, shape : tuple, dtype : type = np.uint16, seed : int = 0) -> list:
+        """
+        Draw random frames.
+
+        Args:
+            count (int): Number of frames
+            shape (tuple): (height, width) of each frame
+            dtype (type): Type of the pixels, integers span the range of the type, floats [0, 1)
+            seed (int): Seed of the generator
+
+        Returns:
+            list: The frames
+        """
+        rng = np.random.default_rng(seed)
+        if np.issubdtype(dtype, np.integer):
+            return [rng.integers(0, np.iinfo(dtype).max, shape, dtype=dtype) for _ in range(count)]
+        return [rng.random(shape).astype(dtype) for _ in range(count)]
+
+    @staticmethod
+    def write_tiff(path : str, frames : list, compression : str = "raw") -> str:
+        """
+        Write frames into a multi-page TIFF, each frame keeps the mode of its type.
+
+        Args:
+            path (str): Path of the file
+            frames (list): The frames, the first one is not a band
+            compression (str): "raw", or a compression of PIL such as "tiff_lzw"
+
+        Returns:
+            str: The path of the file
+        """
+        images = [Image.fromarray(frame) for frame in frames]
+        images[0].save(path, save_all=True, append_images=images[1:], compression=compression)
+        return path
+
+    @staticmethod
+    def write_metadata(path : str, wavelengths : dict) -> str:
+        """
+        Append the center wavelengths of images to a metadata file.
+
+        Args:
+            path (str): Path of the metadata file
+            wavelengths (dict): The wavelengths of the bands, by image file name
+
+        Returns:
+            str: The path of the metadata file
+        """
+        with open(path, "a") as meta:
+            for name, image_wavelengths in wavelengths.items():
+                values = " ".join(f"{wavelength:.1f}" for wavelength in image_wavelengths)
+                meta.write(f"{name}:\n\tCenter wavelengths:\n\t\t{values}\n")
+        return path
+
+    @staticmethod
+    def write_image(directory : str, name : str, wavelengths : list, shape : tuple, dtype : type = np.uint16,
+                    compression : str = "raw", seed : int = 0) -> tuple:
+        """
+        Write a random image of one band per wavelength, and its wavelengths into the metadata
+        file of the directory.
+
+        Args:
+            directory (str): Directory of the files
+            name (str): File name of the image
+            wavelengths (list): Center wavelength of each band
+            shape (tuple): (height, width) of the bands
+            dtype (type): Type of the pixels
+            compression (str): Compression of the file
+            seed (int): Seed of the pixels
+
+        Returns:
+            tuple: The path of the image, the path of the metadata file and every frame, the skipped one first
+        """
+        frames = TiffFixture.random_frames(len(wavelengths) + 1, shape, dtype, seed)
+        image_path = TiffFixture.write_tiff(os.path.join(directory, name), frames, compression)
+        metadata_path = TiffFixture.write_metadata(os.path.join(directory, TiffFixture.METADATA_NAME),
+                                                   {name: wavelengths})
+        return image_path, metadata_path, frames